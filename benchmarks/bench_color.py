@@ -0,0 +1,69 @@
+"""
+Compares Color construction throughput for typical fill and stroke values with the current code and with the code at
+an earlier git revision, by default the parent of the keyword table and parse cache.
+
+    python benchmarks/bench_color.py [count] [revision]
+"""
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from svgelements import *
+
+BASELINE = "5cc4cc9"
+
+
+def load_revision(revision):
+    source = subprocess.check_output(
+        ["git", "show", "%s:svgelements/svgelements.py" % revision], cwd=ROOT
+    )
+    module = types.ModuleType("svgelements_%s" % revision)
+    exec(compile(source, module.__name__, "exec"), module.__dict__)
+    return module
+
+
+def color_values(count):
+    random.seed(0)
+    names = list(COLOR_KEYWORDS)
+    # A designer file uses a small palette many times over.
+    palette = (
+        random.sample(names, 20)
+        + ["#%06x" % random.randint(0, 0xFFFFFF) for _ in range(20)]
+        + ["#%03x" % random.randint(0, 0xFFF) for _ in range(5)]
+        + [
+            "rgb(%d,%d,%d)" % (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+            for _ in range(5)
+        ]
+    )
+    return [random.choice(palette) for _ in range(count)]
+
+
+def timed(name, count, function):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print("%-20s %8.3f us/color" % (name, 1e6 * elapsed / count))
+    return result
+
+
+def main(count=200000, revision=BASELINE):
+    values = color_values(count)
+    baseline = load_revision(revision)
+    old = timed(revision, count, lambda: [baseline.Color(v).value for v in values])
+    new = timed("current", count, lambda: [Color(v).value for v in values])
+    # The old keyword chain returned a wrong value for aliceblue.
+    if [a for a, v in zip(old, values) if v != "aliceblue"] != [
+        b for b, v in zip(new, values) if v != "aliceblue"
+    ]:
+        raise SystemExit("Parsed colors differ.")
+    print("identical values")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) if i == 0 else arg for i, arg in enumerate(sys.argv[1:])])
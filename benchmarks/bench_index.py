@@ -0,0 +1,73 @@
+"""
+Compares region and point queries over a parsed document through SVG.build_index() with scanning the bounding boxes
+of all elements, and checks that both find the same elements.
+
+    python benchmarks/bench_index.py [count] [queries]
+"""
+import io
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from svgelements import *
+
+
+def random_svg(count):
+    random.seed(0)
+    parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="10000" height="10000">']
+    for i in range(count):
+        x = random.uniform(0, 10000)
+        y = random.uniform(0, 10000)
+        kind = i % 3
+        if kind == 0:
+            parts.append(
+                '<rect x="%.2f" y="%.2f" width="%.2f" height="%.2f"/>'
+                % (x, y, random.uniform(1, 30), random.uniform(1, 30))
+            )
+        elif kind == 1:
+            parts.append(
+                '<circle cx="%.2f" cy="%.2f" r="%.2f"/>' % (x, y, random.uniform(1, 20))
+            )
+        else:
+            parts.append('<path d="M%.2f,%.2f l10,5 q5,5 -3,12z"/>' % (x, y))
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def timed(name, function):
+    start = time.perf_counter()
+    result = function()
+    print("%-10s %8.3f s" % (name, time.perf_counter() - start))
+    return result
+
+
+def main(count=50000, queries=1000):
+    svg = SVG.parse(io.StringIO(random_svg(count)))
+    index = timed("build", svg.build_index)
+    boxes = [(e, e.bbox()) for e in index]
+    regions = []
+    for _ in range(queries):
+        x = random.uniform(0, 10000)
+        y = random.uniform(0, 10000)
+        regions.append((x, y, x + 100, y + 100))
+
+    def scan():
+        return [
+            [e for e, b in boxes if b[0] <= x1 and b[2] >= x0 and b[1] <= y1 and b[3] >= y0]
+            for x0, y0, x1, y1 in regions
+        ]
+
+    old = timed("scan", scan)
+    new = timed("index", lambda: [index.query_rect(*region) for region in regions])
+    timed("nearest", lambda: [index.nearest(x0, y0, 5) for x0, y0, x1, y1 in regions])
+    if [set(map(id, a)) for a in old] != [set(map(id, b)) for b in new]:
+        raise SystemExit("Query results differ.")
+    print("identical query results")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
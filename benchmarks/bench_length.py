@@ -0,0 +1,57 @@
+"""
+Compares the cubic bezier length methods: the recursive subdivision of PathSegment.segment_length(),
+scipy's quad, the adaptive Gauss-Legendre bezier_length() and the numpy batched bezier_lengths().
+
+    python benchmarks/bench_length.py [count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from svgelements import *
+
+
+def timed(name, count, function):
+    start = time.perf_counter()
+    lengths = function()
+    elapsed = time.perf_counter() - start
+    print("%-28s %8.2f us/segment" % (name, 1e6 * elapsed / count))
+    return lengths
+
+
+def main(count=2000):
+    random.seed(0)
+
+    def point():
+        return random.uniform(-100, 100), random.uniform(-100, 100)
+
+    curves = [CubicBezier(point(), point(), point(), point()) for _ in range(count)]
+    few = curves[:3]  # The recursive method takes seconds per segment.
+    recursive = timed(
+        "segment_length (recursive)", len(few), lambda: [c._line_length() for c in few]
+    )
+    gauss = timed("bezier_length", count, lambda: [bezier_length(c) for c in curves])
+    if numeric_backend("numpy") is not None:
+        batch = timed("bezier_lengths (numpy)", count, lambda: bezier_lengths(curves))
+        print(
+            "bezier_lengths max difference: %g"
+            % max(abs(a[0] - b) for a, b in zip(gauss, batch[0]))
+        )
+    if numeric_backend("scipy.integrate") is not None:
+        scipy = timed("scipy quad", count, lambda: [c._length_scipy() for c in curves])
+        print(
+            "scipy quad max difference: %g"
+            % max(abs(a[0] - b) for a, b in zip(gauss, scipy))
+        )
+    print(
+        "recursive max difference: %g"
+        % max(abs(a[0] - b) for a, b in zip(gauss, recursive))
+    )
+    print("largest reported error bound: %g" % max(bound for _, bound in gauss))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
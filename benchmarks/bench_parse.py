@@ -0,0 +1,85 @@
+"""
+Compares parsing large path data with the current parser and with the parser at an earlier git revision, by default
+the parent of the single scan tokenizer, and checks that both produce the same path.
+
+    python benchmarks/bench_parse.py [count] [revision]
+"""
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from svgelements import *
+
+BASELINE = "0050c78^"
+
+
+def load_revision(revision):
+    source = subprocess.check_output(
+        ["git", "show", "%s:svgelements/svgelements.py" % revision], cwd=ROOT
+    )
+    module = types.ModuleType("svgelements_%s" % revision)
+    exec(compile(source, module.__name__, "exec"), module.__dict__)
+    return module
+
+
+def random_pathd(count):
+    random.seed(0)
+
+    def n():
+        return "%.3f" % random.uniform(-100, 100)
+
+    commands = ["M%s,%s" % (n(), n())]
+    for _ in range(count):
+        cmd = random.choice("LlHhVvCcSsQqTtAa")
+        if cmd in "Hh" or cmd in "Vv":
+            commands.append("%s%s" % (cmd, n()))
+        elif cmd in "Aa":
+            commands.append(
+                "%s%s %s %s %d %d %s,%s"
+                % (
+                    cmd,
+                    n()[1:],
+                    n()[1:],
+                    n(),
+                    random.randint(0, 1),
+                    random.randint(0, 1),
+                    n(),
+                    n(),
+                )
+            )
+        else:
+            pairs = {"L": 1, "T": 1, "S": 2, "Q": 2, "C": 3}[cmd.upper()]
+            commands.append(
+                cmd + " ".join("%s,%s" % (n(), n()) for _ in range(pairs))
+            )
+        if random.random() < 0.01:
+            commands.append("z")
+    return " ".join(commands)
+
+
+def timed(name, function):
+    start = time.perf_counter()
+    result = function()
+    print("%-10s %8.3f s" % (name, time.perf_counter() - start))
+    return result
+
+
+def main(count=50000, revision=BASELINE):
+    pathd = random_pathd(count)
+    baseline = load_revision(revision)
+    old = timed(revision, lambda: baseline.Path(pathd))
+    new = timed("current", lambda: Path(pathd))
+    print("segments: %d" % len(new))
+    if old.d() != new.d():
+        raise SystemExit("Parsed paths differ.")
+    print("identical d() output")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) if i == 0 else arg for i, arg in enumerate(sys.argv[1:])])
@@ -3,11 +3,18 @@
 import re
 
 try:
-    from collections.abc import MutableSequence  # noqa
+    from collections.abc import Mapping, MutableSequence  # noqa
 except ImportError:
-    from collections import MutableSequence  # noqa
+    from collections import Mapping, MutableSequence  # noqa
 
+from collections import ChainMap
+
+from bisect import bisect_left
+from heapq import heappop, heappush
+from functools import lru_cache
 from copy import copy
+from importlib import import_module
+from operator import attrgetter
 from math import (
     acos,
     atan,
@@ -50,6 +57,41 @@ ERROR = 1e-12
 
 max_depth = 0
 
+_numeric_backends = dict()
+
+
+def numeric_backend(name):
+    """
+    Returns the optional module used for numeric work, "numpy", "scipy.integrate" or "scipy.special", or None
+    if it is not available. The import is attempted once and the result is remembered.
+    """
+    try:
+        return _numeric_backends[name]
+    except KeyError:
+        pass
+    try:
+        module = import_module(name)
+    except ImportError:
+        module = None
+    _numeric_backends[name] = module
+    return module
+
+
+def set_numeric_backend(name, module=None):
+    """
+    Overrides the module returned by numeric_backend(name) everywhere it is used. None forces the pure python code
+    paths, except for PathArray which has none and raises ImportError.
+    """
+    _numeric_backends[name] = module
+
+
+def reset_numeric_backends():
+    """
+    Drops all overrides and remembered imports, the backends are resolved again on next use.
+    """
+    _numeric_backends.clear()
+
+
 # SVG STATIC VALUES
 DEFAULT_PPI = 96.0
 SVG_NAME_TAG = "svg"
@@ -89,6 +131,7 @@ SVG_TAG_CLIPPATH = "clipPath"
 SVG_TAG_PATTERN = "pattern"
 
 SVG_STRUCT_ATTRIB = "attributes"
+SVG_STRUCT_MATRIX = "_matrix"
 SVG_ATTR_ID = "id"
 SVG_ATTR_DATA = "d"
 SVG_ATTR_DISPLAY = "display"
@@ -195,6 +238,7 @@ PATTERN_TRANSFORM_UNITS = (
 )
 
 REGEX_IRI = re.compile(r"url\(#?(.*)\)")
+REGEX_IRI_ID = re.compile(r"url\(#?([^)]*)\)")
 REGEX_DATA_URL = re.compile(r"^data:([^,]*),(.*)")
 REGEX_FLOAT = re.compile(PATTERN_FLOAT)
 REGEX_COORD_PAIR = re.compile(
@@ -221,322 +265,187 @@ REGEX_COLOR_HSL = re.compile(
 )
 REGEX_LENGTH = re.compile(r"(%s)([A-Za-z%%]*)" % PATTERN_FLOAT)
 REGEX_CSS_STYLE = re.compile(r"([^{]+)\s*\{\s*([^}]+)\s*\}")
+REGEX_CSS_SIMPLE_SELECTOR = re.compile(r"([\w-]*)(?:([#.])([\w-]+))?$")
+REGEX_CSS_SELECTOR_TOKEN = re.compile(
+    r"(\s*>\s*|\s+)"  # combinator
+    r"|([\w-]+|\*)"  # type
+    r"|#([\w-]+)"  # id
+    r"|\.([\w-]+)"  # class
+    r"|\[\s*([\w:-]+)\s*(?:([~|^$*]?=)\s*(?:\"([^\"]*)\"|'([^']*)'|([^\]\s]*))\s*)?\]"  # attribute
+)
 REGEX_CSS_FONT = re.compile(
     r"(?:(normal|italic|oblique)\s|(normal|small-caps)\s|(normal|bold|bolder|lighter|\d{3})\s|(normal|ultra-condensed|extra-condensed|condensed|semi-condensed|semi-expanded|expanded|extra-expanded|ultra-expanded)\s)*\s*(xx-small|x-small|small|medium|large|x-large|xx-large|larger|smaller|\d+(?:em|pt|pc|px|%))(?:/(xx-small|x-small|small|medium|large|x-large|xx-large|larger|smaller|\d+(?:em|pt|pc|px|%)))?\s*(.*),?\s+(serif|sans-serif|cursive|fantasy|monospace);?"
 )
 
-svg_parse = [("COMMAND", r"[MmZzLlHhVvCcSsQqTtAa]"), ("SKIP", PATTERN_COMMAWSP)]
-svg_re = re.compile("|".join("(?P<%s>%s)" % pair for pair in svg_parse))
-num_parse = [("FLOAT", PATTERN_FLOAT), ("CLOSE", r"[Zz]"), ("SKIP", PATTERN_COMMAWSP)]
-num_re = re.compile("|".join("(?P<%s>%s)" % pair for pair in num_parse))
-flag_parse = [("FLAG", r"[01]"), ("SKIP", PATTERN_COMMAWSP)]
-flag_re = re.compile("|".join("(?P<%s>%s)" % pair for pair in flag_parse))
+REGEX_PATH_COMMAND = re.compile(
+    r"(?:%s)?([MmZzLlHhVvCcSsQqTtAa])((?:(?:%s)?%s)*(?:%s)?)"
+    % (PATTERN_COMMAWSP, PATTERN_COMMAWSP, PATTERN_FLOAT, PATTERN_COMMAWSP)
+)
 
 
 class SVGLexicalParser:
     def __init__(self):
         self.parser = None
         self.pathd = None
-        self.pos = 0
-        self.limit = 0
         self.inline_close = None
 
-    def _command(self):
-        while self.pos < self.limit:
-            match = svg_re.match(self.pathd, self.pos)
-            if match is None:
-                return None  # Did not match at command sequence.
-            self.pos = match.end()
-            kind = match.lastgroup
-            if kind == "SKIP":
-                continue
-            return match.group()
-        return None
-
-    def _more(self):
-        while self.pos < self.limit:
-            match = num_re.match(self.pathd, self.pos)
-            if match is None:
-                return False
-            kind = match.lastgroup
-            if kind == "CLOSE":
-                self.inline_close = match.group()
-                return False
-            if kind == "SKIP":
-                # move skipped elements forward.
-                self.pos = match.end()
-                continue
-            return True
-        return None
+    @staticmethod
+    def tokenize(pathd):
+        """
+        Scans the path data a single time and returns a flat list of (command, values) tuples.
 
-    def _number(self):
-        while self.pos < self.limit:
-            match = num_re.match(self.pathd, self.pos)
+        Each command is matched together with its full run of numbers, so the numbers are found
+        without any per-token matching. Arc values have their flags as bools at positions 3 and 4
+        of each group of 7, splitting compact flags like "0 1125,25" the same way the spec does.
+        Scanning stops at the first command that is followed by something which is not a number,
+        the same as parsing stops there.
+        """
+        commands = []
+        pos = 0
+        limit = len(pathd)
+        while pos < limit:
+            match = REGEX_PATH_COMMAND.match(pathd, pos)
             if match is None:
-                break  # No more matches.
-            kind = match.lastgroup
-            if kind == "CLOSE":
-                # Inline Close
-                self.inline_close = match.group()
-                return None
-            self.pos = match.end()
-            if kind == "SKIP":
-                continue
-            return float(match.group())
-        return None
+                break  # Did not match at command sequence.
+            pos = match.end()
+            cmd, arguments = match.groups()
+            if cmd == "a" or cmd == "A":
+                values = SVGLexicalParser._arc_values(REGEX_FLOAT.findall(arguments))
+            else:
+                values = [float(v) for v in REGEX_FLOAT.findall(arguments)]
+            commands.append((cmd, values))
+        return commands
 
-    def _flag(self):
-        while self.pos < self.limit:
-            match = flag_re.match(self.pathd, self.pos)
-            if match is None:
-                break  # No more matches.
-            self.pos = match.end()
-            kind = match.lastgroup
-            if kind == "SKIP":
-                continue
-            return bool(int(match.group()))
-        return None
+    @staticmethod
+    def _arc_values(tokens):
+        values = []
+        for token in tokens:
+            while token:
+                if len(values) % 7 in (3, 4):
+                    # Flags need no separators, so a number token may hold flags and a number.
+                    if token[0] != "0" and token[0] != "1":
+                        raise ValueError
+                    values.append(token[0] == "1")
+                    token = token[1:]
+                else:
+                    values.append(float(token))
+                    token = None
+        return values
 
-    def _coord(self):
-        x = self._number()
-        if x is None:
-            return None
-        y = self._number()
-        if y is None:
+    def _coord(self, values, pos, relative):
+        if pos >= len(values):
+            if self.inline_close is None:
+                raise ValueError
+            return self.inline_close
+        if pos + 1 >= len(values):
             raise ValueError
+        x = values[pos]
+        y = values[pos + 1]
+        if relative:
+            current_pos = self.parser.current_point
+            if current_pos is not None:
+                return x + current_pos.x, y + current_pos.y
         return x, y
 
-    def _rcoord(self):
-        position = self._coord()
-        if position is None:
-            return None
-        current_pos = self.parser.current_point
-        if current_pos is None:
-            return position
-        return position[0] + current_pos.x, position[1] + current_pos.y
-
     def parse(self, parser, pathd):
         self.parser = parser
         self.parser.start()
         self.pathd = pathd
-        self.pos = 0
-        self.limit = len(pathd)
-        while True:
-            cmd = self._command()
-            if cmd is None:
-                return
-            elif cmd == "z" or cmd == "Z":
-                if self._more():
-                    raise ValueError
-                self.parser.closed(relative=cmd.islower())
-                self.inline_close = None
-                continue
-            elif cmd == "m":
-                if not self._more():
+        commands = self.tokenize(pathd)
+        for index, (cmd, values) in enumerate(commands):
+            self.inline_close = None
+            if index + 1 < len(commands):
+                next_cmd = commands[index + 1][0]
+                if next_cmd == "z" or next_cmd == "Z":
+                    self.inline_close = next_cmd
+            count = len(values)
+            relative = cmd.islower()
+            if cmd == "z" or cmd == "Z":
+                if count:
                     raise ValueError
-                coord = self._rcoord()
-                self.parser.move(coord, relative=True)
-                while self._more():
-                    coord = self._rcoord()
-                    self.parser.line(coord, relative=True)
-            elif cmd == "M":
-                if not self._more():
+                self.parser.closed(relative=relative)
+            elif cmd == "m" or cmd == "M":
+                if not count:
                     raise ValueError
-                coord = self._coord()
-                self.parser.move(coord, relative=False)
-                while self._more():
-                    coord = self._coord()
-                    self.parser.line(coord, relative=False)
-            elif cmd == "l":
-                while True:
-                    coord = self._rcoord()
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.line(coord, relative=True)
-                    if not self._more():
-                        break
-            elif cmd == "L":
-                while True:
-                    coord = self._coord()
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.line(coord, relative=False)
-                    if not self._more():
-                        break
-            elif cmd == "t":
-                while True:
-                    coord = self._rcoord()
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.smooth_quad(coord, relative=True)
-                    if not self._more():
-                        break
-            elif cmd == "T":
+                self.parser.move(self._coord(values, 0, relative), relative=relative)
+                for pos in range(2, count, 2):
+                    self.parser.line(self._coord(values, pos, relative), relative=relative)
+            elif cmd == "l" or cmd == "L":
+                pos = 0
                 while True:
-                    coord = self._coord()
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.smooth_quad(coord, relative=False)
-                    if not self._more():
+                    self.parser.line(self._coord(values, pos, relative), relative=relative)
+                    pos += 2
+                    if pos >= count:
                         break
-            elif cmd == "h":
+            elif cmd == "t" or cmd == "T":
+                pos = 0
                 while True:
-                    value = self._number()
-                    self.parser.horizontal(value, relative=True)
-                    if not self._more():
+                    self.parser.smooth_quad(
+                        self._coord(values, pos, relative), relative=relative
+                    )
+                    pos += 2
+                    if pos >= count:
                         break
-            elif cmd == "H":
+            elif cmd == "h" or cmd == "H":
+                pos = 0
                 while True:
-                    value = self._number()
-                    self.parser.horizontal(value, relative=False)
-                    if not self._more():
+                    value = values[pos] if pos < count else None
+                    self.parser.horizontal(value, relative=relative)
+                    pos += 1
+                    if pos >= count:
                         break
             elif cmd == "v":
+                pos = 0
                 while True:
-                    value = self._number()
-                    self.parser.vertical(value, relative=True)
-                    if not self._more():
+                    value = values[pos] if pos < count else None
+                    self.parser.vertical(value, relative=relative)
+                    pos += 1
+                    if pos >= count:
                         break
             elif cmd == "V":
-                while self._more():
-                    value = self._number()
-                    self.parser.vertical(value, relative=False)
-            elif cmd == "c":
+                for value in values:
+                    self.parser.vertical(value, relative=relative)
+            elif cmd == "c" or cmd == "C":
+                pos = 0
                 while True:
                     coord1, coord2, coord3 = (
-                        self._rcoord(),
-                        self._rcoord(),
-                        self._rcoord(),
+                        self._coord(values, pos, relative),
+                        self._coord(values, pos + 2, relative),
+                        self._coord(values, pos + 4, relative),
                     )
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    if coord3 is None:
-                        coord3 = self.inline_close
-                        if coord3 is None:
-                            raise ValueError
-                    self.parser.cubic(coord1, coord2, coord3, relative=True)
-                    if not self._more():
-                        break
-            elif cmd == "C":
-                while True:
-                    coord1, coord2, coord3 = self._coord(), self._coord(), self._coord()
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    if coord3 is None:
-                        coord3 = self.inline_close
-                        if coord3 is None:
-                            raise ValueError
-                    self.parser.cubic(coord1, coord2, coord3, relative=False)
-                    if not self._more():
-                        break
-            elif cmd == "q":
-                while True:
-                    coord1, coord2 = self._rcoord(), self._rcoord()
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    self.parser.quad(coord1, coord2, relative=True)
-                    if not self._more():
+                    self.parser.cubic(coord1, coord2, coord3, relative=relative)
+                    pos += 6
+                    if pos >= count:
                         break
-            elif cmd == "Q":
+            elif cmd == "q" or cmd == "Q":
+                pos = 0
                 while True:
-                    coord1, coord2 = self._coord(), self._coord()
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    self.parser.quad(coord1, coord2, relative=False)
-                    if not self._more():
-                        break
-            elif cmd == "s":
-                while True:
-                    coord1, coord2 = self._rcoord(), self._rcoord()
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    self.parser.smooth_cubic(coord1, coord2, relative=True)
-                    if not self._more():
+                    coord1, coord2 = (
+                        self._coord(values, pos, relative),
+                        self._coord(values, pos + 2, relative),
+                    )
+                    self.parser.quad(coord1, coord2, relative=relative)
+                    pos += 4
+                    if pos >= count:
                         break
-            elif cmd == "S":
+            elif cmd == "s" or cmd == "S":
+                pos = 0
                 while True:
-                    coord1, coord2 = self._coord(), self._coord()
-                    if coord1 is None:
-                        coord1 = self.inline_close
-                        if coord1 is None:
-                            raise ValueError
-                    if coord2 is None:
-                        coord2 = self.inline_close
-                        if coord2 is None:
-                            raise ValueError
-                    self.parser.smooth_cubic(coord1, coord2, relative=False)
-                    if not self._more():
-                        break
-            elif cmd == "a":
-                while self._more():
-                    rx, ry, rotation, arc, sweep, coord = (
-                        self._number(),
-                        self._number(),
-                        self._number(),
-                        self._flag(),
-                        self._flag(),
-                        self._rcoord(),
+                    coord1, coord2 = (
+                        self._coord(values, pos, relative),
+                        self._coord(values, pos + 2, relative),
                     )
-                    if sweep is None:
+                    self.parser.smooth_cubic(coord1, coord2, relative=relative)
+                    pos += 4
+                    if pos >= count:
+                        break
+            elif cmd == "a" or cmd == "A":
+                for pos in range(0, count, 7):
+                    if count - pos < 5:
                         raise ValueError
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.arc(rx, ry, rotation, arc, sweep, coord, relative=True)
-            elif cmd == "A":
-                while self._more():
-                    rx, ry, rotation, arc, sweep, coord = (
-                        self._number(),
-                        self._number(),
-                        self._number(),
-                        self._flag(),
-                        self._flag(),
-                        self._coord(),
-                    )
-                    if coord is None:
-                        coord = self.inline_close
-                        if coord is None:
-                            raise ValueError
-                    self.parser.arc(rx, ry, rotation, arc, sweep, coord, relative=False)
+                    rx, ry, rotation, arc, sweep = values[pos : pos + 5]
+                    coord = self._coord(values, pos + 5, relative)
+                    self.parser.arc(rx, ry, rotation, arc, sweep, coord, relative=relative)
         self.parser.end()
 
 
@@ -564,11 +473,8 @@ class Length(object):
                 self.amount = None
                 self.units = None
                 return
-            s = str(value)
-            for m in REGEX_LENGTH.findall(s):
-                self.amount = float(m[0])
-                self.units = m[1]
-                return
+            self.amount, self.units = Length.parse(str(value))
+            return
         elif len(args) == 2:
             self.amount = args[0]
             self.units = args[1]
@@ -989,6 +895,51 @@ class Length(object):
         except ValueError:
             return self
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def parse(length_string):
+        """
+        Parses a length string into an (amount, units) tuple, strings without a length give (0.0, "").
+
+        Results are kept in a least recently used cache, as documents repeat a few values many times.
+        """
+        match = REGEX_LENGTH.search(length_string)
+        if match is None:
+            return 0.0, ""
+        return float(match.group(1)), match.group(2)
+
+    @staticmethod
+    def parse_many(
+        values,
+        ppi=None,
+        relative_length=None,
+        font_size=None,
+        font_height=None,
+        viewbox=None,
+    ):
+        """
+        Resolves many length values at once, giving the list of Length(v).value() for the given arguments.
+
+        Each distinct string is resolved once. Values that cannot be solved are given as Length, as value() does.
+        """
+        resolved = dict()
+        results = list()
+        for v in values:
+            if isinstance(v, str) and v in resolved:
+                results.append(resolved[v])
+                continue
+            result = Length(v).value(
+                ppi=ppi,
+                relative_length=relative_length,
+                font_size=font_size,
+                font_height=font_height,
+                viewbox=viewbox,
+            )
+            if isinstance(v, str) and not isinstance(result, Length):
+                resolved[v] = result
+            results.append(result)
+        return results
+
     @staticmethod
     def str(s):
         if s is None:
@@ -1010,6 +961,159 @@ class Length(object):
         return s
 
 
+# SVG 1.1 color keywords, https://www.w3.org/TR/SVG11/types.html#ColorKeywords, as rgba int values.
+COLOR_KEYWORDS = {
+    "transparent": 0x00000000,
+    "aliceblue": 0xF0F8FFFF,
+    "antiquewhite": 0xFAEBD7FF,
+    "aqua": 0x00FFFFFF,
+    "aquamarine": 0x7FFFD4FF,
+    "azure": 0xF0FFFFFF,
+    "beige": 0xF5F5DCFF,
+    "bisque": 0xFFE4C4FF,
+    "black": 0x000000FF,
+    "blanchedalmond": 0xFFEBCDFF,
+    "blue": 0x0000FFFF,
+    "blueviolet": 0x8A2BE2FF,
+    "brown": 0xA52A2AFF,
+    "burlywood": 0xDEB887FF,
+    "cadetblue": 0x5F9EA0FF,
+    "chartreuse": 0x7FFF00FF,
+    "chocolate": 0xD2691EFF,
+    "coral": 0xFF7F50FF,
+    "cornflowerblue": 0x6495EDFF,
+    "cornsilk": 0xFFF8DCFF,
+    "crimson": 0xDC143CFF,
+    "cyan": 0x00FFFFFF,
+    "darkblue": 0x00008BFF,
+    "darkcyan": 0x008B8BFF,
+    "darkgoldenrod": 0xB8860BFF,
+    "darkgray": 0xA9A9A9FF,
+    "darkgreen": 0x006400FF,
+    "darkgrey": 0xA9A9A9FF,
+    "darkkhaki": 0xBDB76BFF,
+    "darkmagenta": 0x8B008BFF,
+    "darkolivegreen": 0x556B2FFF,
+    "darkorange": 0xFF8C00FF,
+    "darkorchid": 0x9932CCFF,
+    "darkred": 0x8B0000FF,
+    "darksalmon": 0xE9967AFF,
+    "darkseagreen": 0x8FBC8FFF,
+    "darkslateblue": 0x483D8BFF,
+    "darkslategray": 0x2F4F4FFF,
+    "darkslategrey": 0x2F4F4FFF,
+    "darkturquoise": 0x00CED1FF,
+    "darkviolet": 0x9400D3FF,
+    "deeppink": 0xFF1493FF,
+    "deepskyblue": 0x00BFFFFF,
+    "dimgray": 0x696969FF,
+    "dimgrey": 0x696969FF,
+    "dodgerblue": 0x1E90FFFF,
+    "firebrick": 0xB22222FF,
+    "floralwhite": 0xFFFAF0FF,
+    "forestgreen": 0x228B22FF,
+    "fuchsia": 0xFF00FFFF,
+    "gainsboro": 0xDCDCDCFF,
+    "ghostwhite": 0xF8F8FFFF,
+    "gold": 0xFFD700FF,
+    "goldenrod": 0xDAA520FF,
+    "gray": 0x808080FF,
+    "grey": 0x808080FF,
+    "green": 0x008000FF,
+    "greenyellow": 0xADFF2FFF,
+    "honeydew": 0xF0FFF0FF,
+    "hotpink": 0xFF69B4FF,
+    "indianred": 0xCD5C5CFF,
+    "indigo": 0x4B0082FF,
+    "ivory": 0xFFFFF0FF,
+    "khaki": 0xF0E68CFF,
+    "lavender": 0xE6E6FAFF,
+    "lavenderblush": 0xFFF0F5FF,
+    "lawngreen": 0x7CFC00FF,
+    "lemonchiffon": 0xFFFACDFF,
+    "lightblue": 0xADD8E6FF,
+    "lightcoral": 0xF08080FF,
+    "lightcyan": 0xE0FFFFFF,
+    "lightgoldenrodyellow": 0xFAFAD2FF,
+    "lightgray": 0xD3D3D3FF,
+    "lightgreen": 0x90EE90FF,
+    "lightgrey": 0xD3D3D3FF,
+    "lightpink": 0xFFB6C1FF,
+    "lightsalmon": 0xFFA07AFF,
+    "lightseagreen": 0x20B2AAFF,
+    "lightskyblue": 0x87CEFAFF,
+    "lightslategray": 0x778899FF,
+    "lightslategrey": 0x778899FF,
+    "lightsteelblue": 0xB0C4DEFF,
+    "lightyellow": 0xFFFFE0FF,
+    "lime": 0x00FF00FF,
+    "limegreen": 0x32CD32FF,
+    "linen": 0xFAF0E6FF,
+    "magenta": 0xFF00FFFF,
+    "maroon": 0x800000FF,
+    "mediumaquamarine": 0x66CDAAFF,
+    "mediumblue": 0x0000CDFF,
+    "mediumorchid": 0xBA55D3FF,
+    "mediumpurple": 0x9370DBFF,
+    "mediumseagreen": 0x3CB371FF,
+    "mediumslateblue": 0x7B68EEFF,
+    "mediumspringgreen": 0x00FA9AFF,
+    "mediumturquoise": 0x48D1CCFF,
+    "mediumvioletred": 0xC71585FF,
+    "midnightblue": 0x191970FF,
+    "mintcream": 0xF5FFFAFF,
+    "mistyrose": 0xFFE4E1FF,
+    "moccasin": 0xFFE4B5FF,
+    "navajowhite": 0xFFDEADFF,
+    "navy": 0x000080FF,
+    "oldlace": 0xFDF5E6FF,
+    "olive": 0x808000FF,
+    "olivedrab": 0x6B8E23FF,
+    "orange": 0xFFA500FF,
+    "orangered": 0xFF4500FF,
+    "orchid": 0xDA70D6FF,
+    "palegoldenrod": 0xEEE8AAFF,
+    "palegreen": 0x98FB98FF,
+    "paleturquoise": 0xAFEEEEFF,
+    "palevioletred": 0xDB7093FF,
+    "papayawhip": 0xFFEFD5FF,
+    "peachpuff": 0xFFDAB9FF,
+    "peru": 0xCD853FFF,
+    "pink": 0xFFC0CBFF,
+    "plum": 0xDDA0DDFF,
+    "powderblue": 0xB0E0E6FF,
+    "purple": 0x800080FF,
+    "red": 0xFF0000FF,
+    "rosybrown": 0xBC8F8FFF,
+    "royalblue": 0x4169E1FF,
+    "saddlebrown": 0x8B4513FF,
+    "salmon": 0xFA8072FF,
+    "sandybrown": 0xF4A460FF,
+    "seagreen": 0x2E8B57FF,
+    "seashell": 0xFFF5EEFF,
+    "sienna": 0xA0522DFF,
+    "silver": 0xC0C0C0FF,
+    "skyblue": 0x87CEEBFF,
+    "slateblue": 0x6A5ACDFF,
+    "slategray": 0x708090FF,
+    "slategrey": 0x708090FF,
+    "snow": 0xFFFAFAFF,
+    "springgreen": 0x00FF7FFF,
+    "steelblue": 0x4682B4FF,
+    "tan": 0xD2B48CFF,
+    "teal": 0x008080FF,
+    "thistle": 0xD8BFD8FF,
+    "tomato": 0xFF6347FF,
+    "turquoise": 0x40E0D0FF,
+    "violet": 0xEE82EEFF,
+    "wheat": 0xF5DEB3FF,
+    "white": 0xFFFFFFFF,
+    "whitesmoke": 0xF5F5F5FF,
+    "yellow": 0xFFFF00FF,
+    "yellowgreen": 0x9ACD32FF,
+}
+
+
 class Color(object):
     """
     SVG Color Parsing
@@ -1050,6 +1154,8 @@ class Color(object):
             b = args[2]
             opacity = args[3] / 255.0
             self.value = Color.rgb_to_int(r, g, b, opacity)
+        if not kwargs:
+            return
         if "red" in kwargs:
             self.red = kwargs["red"]
         if "green" in kwargs:
@@ -1171,8 +1277,14 @@ class Color(object):
         return value
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def parse(color_string):
-        """Parse SVG color, will return a set value."""
+        """
+        Parse SVG color, will return a set value.
+
+        Results are kept in a least recently used cache, so repeated fill and stroke values are found with a single
+        lookup.
+        """
         if color_string is None or color_string == SVG_VALUE_NONE:
             return None
         match = REGEX_COLOR_HEX.match(color_string)
@@ -1196,304 +1308,10 @@ class Color(object):
             return Color.rgb_to_int(0, 0, 0)
         else:
             v = v.replace(" ", "").lower()
-        if v == "transparent":
-            return Color.rgb_to_int(0, 0, 0, 0.0)
-        if v == "aliceblue":
-            return Color.rgb_to_int(250, 248, 255)
-        if v == "aliceblue":
-            return Color.rgb_to_int(240, 248, 255)
-        if v == "antiquewhite":
-            return Color.rgb_to_int(250, 235, 215)
-        if v == "aqua":
-            return Color.rgb_to_int(0, 255, 255)
-        if v == "aquamarine":
-            return Color.rgb_to_int(127, 255, 212)
-        if v == "azure":
-            return Color.rgb_to_int(240, 255, 255)
-        if v == "beige":
-            return Color.rgb_to_int(245, 245, 220)
-        if v == "bisque":
-            return Color.rgb_to_int(255, 228, 196)
-        if v == "black":
-            return Color.rgb_to_int(0, 0, 0)
-        if v == "blanchedalmond":
-            return Color.rgb_to_int(255, 235, 205)
-        if v == "blue":
-            return Color.rgb_to_int(0, 0, 255)
-        if v == "blueviolet":
-            return Color.rgb_to_int(138, 43, 226)
-        if v == "brown":
-            return Color.rgb_to_int(165, 42, 42)
-        if v == "burlywood":
-            return Color.rgb_to_int(222, 184, 135)
-        if v == "cadetblue":
-            return Color.rgb_to_int(95, 158, 160)
-        if v == "chartreuse":
-            return Color.rgb_to_int(127, 255, 0)
-        if v == "chocolate":
-            return Color.rgb_to_int(210, 105, 30)
-        if v == "coral":
-            return Color.rgb_to_int(255, 127, 80)
-        if v == "cornflowerblue":
-            return Color.rgb_to_int(100, 149, 237)
-        if v == "cornsilk":
-            return Color.rgb_to_int(255, 248, 220)
-        if v == "crimson":
-            return Color.rgb_to_int(220, 20, 60)
-        if v == "cyan":
-            return Color.rgb_to_int(0, 255, 255)
-        if v == "darkblue":
-            return Color.rgb_to_int(0, 0, 139)
-        if v == "darkcyan":
-            return Color.rgb_to_int(0, 139, 139)
-        if v == "darkgoldenrod":
-            return Color.rgb_to_int(184, 134, 11)
-        if v == "darkgray":
-            return Color.rgb_to_int(169, 169, 169)
-        if v == "darkgreen":
-            return Color.rgb_to_int(0, 100, 0)
-        if v == "darkgrey":
-            return Color.rgb_to_int(169, 169, 169)
-        if v == "darkkhaki":
-            return Color.rgb_to_int(189, 183, 107)
-        if v == "darkmagenta":
-            return Color.rgb_to_int(139, 0, 139)
-        if v == "darkolivegreen":
-            return Color.rgb_to_int(85, 107, 47)
-        if v == "darkorange":
-            return Color.rgb_to_int(255, 140, 0)
-        if v == "darkorchid":
-            return Color.rgb_to_int(153, 50, 204)
-        if v == "darkred":
-            return Color.rgb_to_int(139, 0, 0)
-        if v == "darksalmon":
-            return Color.rgb_to_int(233, 150, 122)
-        if v == "darkseagreen":
-            return Color.rgb_to_int(143, 188, 143)
-        if v == "darkslateblue":
-            return Color.rgb_to_int(72, 61, 139)
-        if v == "darkslategray":
-            return Color.rgb_to_int(47, 79, 79)
-        if v == "darkslategrey":
-            return Color.rgb_to_int(47, 79, 79)
-        if v == "darkturquoise":
-            return Color.rgb_to_int(0, 206, 209)
-        if v == "darkviolet":
-            return Color.rgb_to_int(148, 0, 211)
-        if v == "deeppink":
-            return Color.rgb_to_int(255, 20, 147)
-        if v == "deepskyblue":
-            return Color.rgb_to_int(0, 191, 255)
-        if v == "dimgray":
-            return Color.rgb_to_int(105, 105, 105)
-        if v == "dimgrey":
-            return Color.rgb_to_int(105, 105, 105)
-        if v == "dodgerblue":
-            return Color.rgb_to_int(30, 144, 255)
-        if v == "firebrick":
-            return Color.rgb_to_int(178, 34, 34)
-        if v == "floralwhite":
-            return Color.rgb_to_int(255, 250, 240)
-        if v == "forestgreen":
-            return Color.rgb_to_int(34, 139, 34)
-        if v == "fuchsia":
-            return Color.rgb_to_int(255, 0, 255)
-        if v == "gainsboro":
-            return Color.rgb_to_int(220, 220, 220)
-        if v == "ghostwhite":
-            return Color.rgb_to_int(248, 248, 255)
-        if v == "gold":
-            return Color.rgb_to_int(255, 215, 0)
-        if v == "goldenrod":
-            return Color.rgb_to_int(218, 165, 32)
-        if v == "gray":
-            return Color.rgb_to_int(128, 128, 128)
-        if v == "grey":
-            return Color.rgb_to_int(128, 128, 128)
-        if v == "green":
-            return Color.rgb_to_int(0, 128, 0)
-        if v == "greenyellow":
-            return Color.rgb_to_int(173, 255, 47)
-        if v == "honeydew":
-            return Color.rgb_to_int(240, 255, 240)
-        if v == "hotpink":
-            return Color.rgb_to_int(255, 105, 180)
-        if v == "indianred":
-            return Color.rgb_to_int(205, 92, 92)
-        if v == "indigo":
-            return Color.rgb_to_int(75, 0, 130)
-        if v == "ivory":
-            return Color.rgb_to_int(255, 255, 240)
-        if v == "khaki":
-            return Color.rgb_to_int(240, 230, 140)
-        if v == "lavender":
-            return Color.rgb_to_int(230, 230, 250)
-        if v == "lavenderblush":
-            return Color.rgb_to_int(255, 240, 245)
-        if v == "lawngreen":
-            return Color.rgb_to_int(124, 252, 0)
-        if v == "lemonchiffon":
-            return Color.rgb_to_int(255, 250, 205)
-        if v == "lightblue":
-            return Color.rgb_to_int(173, 216, 230)
-        if v == "lightcoral":
-            return Color.rgb_to_int(240, 128, 128)
-        if v == "lightcyan":
-            return Color.rgb_to_int(224, 255, 255)
-        if v == "lightgoldenrodyellow":
-            return Color.rgb_to_int(250, 250, 210)
-        if v == "lightgray":
-            return Color.rgb_to_int(211, 211, 211)
-        if v == "lightgreen":
-            return Color.rgb_to_int(144, 238, 144)
-        if v == "lightgrey":
-            return Color.rgb_to_int(211, 211, 211)
-        if v == "lightpink":
-            return Color.rgb_to_int(255, 182, 193)
-        if v == "lightsalmon":
-            return Color.rgb_to_int(255, 160, 122)
-        if v == "lightseagreen":
-            return Color.rgb_to_int(32, 178, 170)
-        if v == "lightskyblue":
-            return Color.rgb_to_int(135, 206, 250)
-        if v == "lightslategray":
-            return Color.rgb_to_int(119, 136, 153)
-        if v == "lightslategrey":
-            return Color.rgb_to_int(119, 136, 153)
-        if v == "lightsteelblue":
-            return Color.rgb_to_int(176, 196, 222)
-        if v == "lightyellow":
-            return Color.rgb_to_int(255, 255, 224)
-        if v == "lime":
-            return Color.rgb_to_int(0, 255, 0)
-        if v == "limegreen":
-            return Color.rgb_to_int(50, 205, 50)
-        if v == "linen":
-            return Color.rgb_to_int(250, 240, 230)
-        if v == "magenta":
-            return Color.rgb_to_int(255, 0, 255)
-        if v == "maroon":
-            return Color.rgb_to_int(128, 0, 0)
-        if v == "mediumaquamarine":
-            return Color.rgb_to_int(102, 205, 170)
-        if v == "mediumblue":
-            return Color.rgb_to_int(0, 0, 205)
-        if v == "mediumorchid":
-            return Color.rgb_to_int(186, 85, 211)
-        if v == "mediumpurple":
-            return Color.rgb_to_int(147, 112, 219)
-        if v == "mediumseagreen":
-            return Color.rgb_to_int(60, 179, 113)
-        if v == "mediumslateblue":
-            return Color.rgb_to_int(123, 104, 238)
-        if v == "mediumspringgreen":
-            return Color.rgb_to_int(0, 250, 154)
-        if v == "mediumturquoise":
-            return Color.rgb_to_int(72, 209, 204)
-        if v == "mediumvioletred":
-            return Color.rgb_to_int(199, 21, 133)
-        if v == "midnightblue":
-            return Color.rgb_to_int(25, 25, 112)
-        if v == "mintcream":
-            return Color.rgb_to_int(245, 255, 250)
-        if v == "mistyrose":
-            return Color.rgb_to_int(255, 228, 225)
-        if v == "moccasin":
-            return Color.rgb_to_int(255, 228, 181)
-        if v == "navajowhite":
-            return Color.rgb_to_int(255, 222, 173)
-        if v == "navy":
-            return Color.rgb_to_int(0, 0, 128)
-        if v == "oldlace":
-            return Color.rgb_to_int(253, 245, 230)
-        if v == "olive":
-            return Color.rgb_to_int(128, 128, 0)
-        if v == "olivedrab":
-            return Color.rgb_to_int(107, 142, 35)
-        if v == "orange":
-            return Color.rgb_to_int(255, 165, 0)
-        if v == "orangered":
-            return Color.rgb_to_int(255, 69, 0)
-        if v == "orchid":
-            return Color.rgb_to_int(218, 112, 214)
-        if v == "palegoldenrod":
-            return Color.rgb_to_int(238, 232, 170)
-        if v == "palegreen":
-            return Color.rgb_to_int(152, 251, 152)
-        if v == "paleturquoise":
-            return Color.rgb_to_int(175, 238, 238)
-        if v == "palevioletred":
-            return Color.rgb_to_int(219, 112, 147)
-        if v == "papayawhip":
-            return Color.rgb_to_int(255, 239, 213)
-        if v == "peachpuff":
-            return Color.rgb_to_int(255, 218, 185)
-        if v == "peru":
-            return Color.rgb_to_int(205, 133, 63)
-        if v == "pink":
-            return Color.rgb_to_int(255, 192, 203)
-        if v == "plum":
-            return Color.rgb_to_int(221, 160, 221)
-        if v == "powderblue":
-            return Color.rgb_to_int(176, 224, 230)
-        if v == "purple":
-            return Color.rgb_to_int(128, 0, 128)
-        if v == "red":
-            return Color.rgb_to_int(255, 0, 0)
-        if v == "rosybrown":
-            return Color.rgb_to_int(188, 143, 143)
-        if v == "royalblue":
-            return Color.rgb_to_int(65, 105, 225)
-        if v == "saddlebrown":
-            return Color.rgb_to_int(139, 69, 19)
-        if v == "salmon":
-            return Color.rgb_to_int(250, 128, 114)
-        if v == "sandybrown":
-            return Color.rgb_to_int(244, 164, 96)
-        if v == "seagreen":
-            return Color.rgb_to_int(46, 139, 87)
-        if v == "seashell":
-            return Color.rgb_to_int(255, 245, 238)
-        if v == "sienna":
-            return Color.rgb_to_int(160, 82, 45)
-        if v == "silver":
-            return Color.rgb_to_int(192, 192, 192)
-        if v == "skyblue":
-            return Color.rgb_to_int(135, 206, 235)
-        if v == "slateblue":
-            return Color.rgb_to_int(106, 90, 205)
-        if v == "slategray":
-            return Color.rgb_to_int(112, 128, 144)
-        if v == "slategrey":
-            return Color.rgb_to_int(112, 128, 144)
-        if v == "snow":
-            return Color.rgb_to_int(255, 250, 250)
-        if v == "springgreen":
-            return Color.rgb_to_int(0, 255, 127)
-        if v == "steelblue":
-            return Color.rgb_to_int(70, 130, 180)
-        if v == "tan":
-            return Color.rgb_to_int(210, 180, 140)
-        if v == "teal":
-            return Color.rgb_to_int(0, 128, 128)
-        if v == "thistle":
-            return Color.rgb_to_int(216, 191, 216)
-        if v == "tomato":
-            return Color.rgb_to_int(255, 99, 71)
-        if v == "turquoise":
-            return Color.rgb_to_int(64, 224, 208)
-        if v == "violet":
-            return Color.rgb_to_int(238, 130, 238)
-        if v == "wheat":
-            return Color.rgb_to_int(245, 222, 179)
-        if v == "white":
-            return Color.rgb_to_int(255, 255, 255)
-        if v == "whitesmoke":
-            return Color.rgb_to_int(245, 245, 245)
-        if v == "yellow":
-            return Color.rgb_to_int(255, 255, 0)
-        if v == "yellowgreen":
-            return Color.rgb_to_int(154, 205, 50)
+        try:
+            return COLOR_KEYWORDS[v]
+        except KeyError:
+            pass
         try:
             return int(v)
         except ValueError:
@@ -2613,7 +2431,32 @@ class Matrix:
             return
         if not isinstance(transform_str, str):
             raise TypeError("Must provide a string to parse")
+        if (
+            not isinstance(self.e, Length)
+            and not isinstance(self.f, Length)
+            and self.is_identity()
+        ):
+            # Parsing into a new matrix is the common case, these are parsed once per string.
+            a, b, c, d, e, f = Matrix._parse_components(transform_str)
+            self.a = a
+            self.b = b
+            self.c = c
+            self.d = d
+            self.e = copy(e) if isinstance(e, Length) else e
+            self.f = copy(f) if isinstance(f, Length) else f
+            return self
+        return self._parse(transform_str)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_components(transform_str):
+        """
+        Components of the transform string parsed into an identity matrix. The cached Length values must be copied.
+        """
+        m = Matrix()._parse(transform_str)
+        return m.a, m.b, m.c, m.d, m.e, m.f
 
+    def _parse(self, transform_str):
         for sub_element in REGEX_TRANSFORM_TEMPLATE.findall(transform_str.lower()):
             name = sub_element[0]
             params = tuple(REGEX_TRANSFORM_PARAMETER.findall(sub_element[1]))
@@ -3064,7 +2907,7 @@ class Viewbox:
         self.preserve_aspect_ratio = None
         if args and len(args) <= 2:
             viewbox = args[0]
-            if isinstance(viewbox, dict):
+            if isinstance(viewbox, Mapping):
                 self.property_by_values(viewbox)
             elif isinstance(viewbox, Viewbox):
                 self.property_by_object(viewbox)
@@ -3270,6 +3113,42 @@ class Viewbox:
                 )
 
 
+class Values(ChainMap):
+    """
+    Layered element values. Each layer holds the values set at that level and lookups fall back to the later,
+    inherited, layers. Writes only go to the first layer.
+
+    The lookups are the ones element construction uses the most, written without the generic ChainMap overhead.
+
+    Values is not a dict. to_dict() and copy.copy() give one plain dict of the values, as element.values was before,
+    for code that needs a dict such as json.dumps().
+    """
+
+    def to_dict(self):
+        """
+        Returns the values flattened into a new dict. The composed transform matrix kept for the parser is left out,
+        it is the parsed "transform" value.
+        """
+        values = dict(self)
+        values.pop(SVG_STRUCT_MATRIX, None)
+        return values
+
+    def __copy__(self):
+        return self.to_dict()
+
+    def __contains__(self, key):
+        for mapping in self.maps:
+            if key in mapping:
+                return True
+        return False
+
+    def get(self, key, default=None):
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key]
+        return default
+
+
 class SVGElement(object):
     """
     Any element within the SVG namespace.
@@ -3278,6 +3157,8 @@ class SVGElement(object):
     Else, the values consist of the kwargs used. The priority is such that kwargs
     will overwrite any previously set value.
 
+    A ChainMap seed is not copied, the element layers its own values over the seed's maps.
+
     If additional args exist these will be passed to property_by_args
 
     """
@@ -3287,7 +3168,10 @@ class SVGElement(object):
         self.values = None
         if len(args) >= 1:
             s = args[0]
-            if isinstance(s, dict):
+            if isinstance(s, ChainMap):
+                args = args[1:]
+                self.values = s.new_child(kwargs)
+            elif isinstance(s, dict):
                 args = args[1:]
                 self.values = dict(s)
                 self.values.update(kwargs)
@@ -3328,20 +3212,52 @@ class SVGElement(object):
 
 
 class Transformable:
-    """Any element that is transformable and has a transform property."""
+    """
+    Any element that is transformable and has a transform property.
+
+    Elements within a group link back to the group that last took them in. Setting the transform, or calling
+    invalidate() after the element is changed in place, drops the cached bounds of the groups containing it. Group
+    bounds also check the transform and geometry of each child when asked for, so they stay correct for elements in
+    several groups. The flat element arrays of Group.flatten() only follow the last group an element was added to.
+    """
+
+    _parent = None
 
     def __init__(self, *args, **kwargs):
         self._length = None
         self._lengths = None
+        self._lengths_cumulative = None
         self.transform = None
         self.apply = None
 
+    def _set_transform(self, transform):
+        self._transform = transform
+        parent = self._parent
+        if parent is not None:
+            parent.invalidate()
+
+    transform = property(attrgetter("_transform"), _set_transform)
+
+    def invalidate(self):
+        """
+        Drops the cached bounds of the groups containing this element. Groups check the transform and geometry of
+        their children when bounded, so this only frees their bounds early.
+        """
+        parent = self._parent
+        if parent is not None:
+            parent.invalidate()
+
     def property_by_object(self, s):
         self.transform = Matrix(s.transform)
         self.apply = s.apply
 
     def property_by_values(self, values):
-        self.transform = Matrix(values.get(SVG_ATTR_TRANSFORM, ""))
+        matrix = values.get(SVG_STRUCT_MATRIX)
+        if matrix is not None:
+            # The parser gives the composed matrix of the transform string, which is not parsed again.
+            self.transform = Matrix(matrix)
+        else:
+            self.transform = Matrix(values.get(SVG_ATTR_TRANSFORM, ""))
         self.apply = bool(values.get("apply", True))
 
     def __mul__(self, other):
@@ -3380,7 +3296,9 @@ class Transformable:
         scale with the transform.
         """
         self._lengths = None
+        self._lengths_cumulative = None
         self._length = None
+        self.invalidate()
 
     def render(self, **kwargs):
         """
@@ -3610,11 +3528,12 @@ class Shape(SVGElement, GraphicObject, Transformable):
         :return:
         """
         if segments is None:
-            segments = self.segments(False)
+            segments = self._shared_segments(False)
         if self._length is not None:
             return
         lengths = [each.length(error=error, min_depth=min_depth) for each in segments]
         self._length = sum(lengths)
+        self._lengths_cumulative = None
         if self._length == 0:
             self._lengths = lengths
         else:
@@ -3623,43 +3542,41 @@ class Shape(SVGElement, GraphicObject, Transformable):
     def npoint(self, positions, error=ERROR):
         """
         Find a points between 0 and 1 within the shape. Numpy acceleration allows points to be an array of floats.
+
+        Positions are assigned to their segments with a binary search of the cumulative lengths, lines and bezier
+        curves are then computed together for each kind of segment.
         """
-        try:
-            import numpy as np
-        except ImportError:
+        np = numeric_backend("numpy")
+        if np is None:
             return [self.point(pos) for pos in positions]
 
-        segments = self.segments(False)
+        segments = self._shared_segments(False)
         if len(segments) == 0:
             return None
         # Shortcuts
         if self._length is None:
             self._calc_lengths(error=error, segments=segments)
+        positions = np.asarray(positions, dtype=float)
         xy = np.empty((len(positions), 2), dtype=float)
         if self._length == 0:
-            i = int(round(positions * (len(segments) - 1)))
-            point = segments[i].point(0.0)
-            xy[:] = point
+            index = np.rint(np.clip(positions, 0, 1) * (len(segments) - 1)).astype(int)
+            for i in np.unique(index):
+                xy[index == i] = segments[i].point(0.0)
             return xy
-
-        # Find which segment the point we search for is located on:
-        segment_start = 0
-        for index, segment in enumerate(segments):
-            segment_end = segment_start + self._lengths[index]
-            position_subset = (segment_start <= positions) & (positions < segment_end)
-            v0 = positions[position_subset]
-            if not len(v0):
-                continue  # Nothing matched.
-            d = segment_end - segment_start
-            if d == 0:  # This segment is 0 length.
-                segment_pos = 0.0
-            else:
-                segment_pos = (v0 - segment_start) / d
-            c = segment.npoint(segment_pos)
-            xy[position_subset] = c[:]
-            segment_start = segment_end
-
-        # the loop above will miss position == 1
+        if self._lengths_cumulative is None:
+            self._lengths_cumulative = np.cumsum(self._lengths)
+        ends = self._lengths_cumulative
+        lengths = np.asarray(self._lengths)
+
+        # Find which segment each position is located on:
+        index = np.searchsorted(ends, positions, side="right")
+        np.minimum(index, len(segments) - 1, out=index)
+        span = lengths[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(span > 0, (positions - (ends[index] - span)) / span, 0.0)
+        xy = _segments_npoint(segments, index, t)
+
+        # positions at the very end are on the end of the last segment.
         xy[positions == 1] = np.array(list(segments[-1].end))
         return xy
 
@@ -3671,7 +3588,7 @@ class Shape(SVGElement, GraphicObject, Transformable):
         :param error: Length error permitted.
         :return: Point at the given location.
         """
-        segments = self.segments(False)
+        segments = self._shared_segments(False)
         if len(segments) == 0:
             return None
         # Shortcuts
@@ -3714,6 +3631,12 @@ class Shape(SVGElement, GraphicObject, Transformable):
         """
         raise NotImplementedError
 
+    def _shared_segments(self, transformed=True):
+        """
+        Returns the PathSegments of the shape without copying any that the shape keeps. These must not be altered.
+        """
+        return self.segments(transformed)
+
     def d(self, relative=False, transformed=True):
         """
         Returns the path_d string of the shape.
@@ -3722,7 +3645,7 @@ class Shape(SVGElement, GraphicObject, Transformable):
         :param transformed: Return path_d, with applied transform.
         :return: path_d string
         """
-        return Path(self.segments(transformed=transformed)).d(relative=relative)
+        return Path.svg_d(self._shared_segments(transformed), relative=relative)
 
     def bbox(self, transformed=True, with_stroke=False):
         """
@@ -3734,7 +3657,7 @@ class Shape(SVGElement, GraphicObject, Transformable):
         """
         bbs = [
             seg.bbox()
-            for seg in self.segments(transformed=transformed)
+            for seg in self._shared_segments(transformed)
             if not isinstance(Close, Move)
         ]
 
@@ -3743,18 +3666,7 @@ class Shape(SVGElement, GraphicObject, Transformable):
         except ValueError:
             return None  # No bounding box items existed. So no bounding box.
 
-        if (
-            with_stroke
-            and self.stroke_width is not None
-            and not (self.stroke is None or self.stroke.value is None)
-        ):
-            if transformed:
-                delta = float(self.implicit_stroke_width) / 2.0
-            else:
-                delta = float(self.stroke_width) / 2.0
-        else:
-            delta = 0.0
-
+        delta = self._stroke_delta(transformed, with_stroke)
         return (
             min(xmins) - delta,
             min(ymins) - delta,
@@ -3762,6 +3674,20 @@ class Shape(SVGElement, GraphicObject, Transformable):
             max(ymaxs) + delta,
         )
 
+    def _stroke_delta(self, transformed=True, with_stroke=False):
+        """
+        Half the stroke width if the stroke is to be included in the bounds, otherwise zero.
+        """
+        if (
+            with_stroke
+            and self.stroke_width is not None
+            and not (self.stroke is None or self.stroke.value is None)
+        ):
+            if transformed:
+                return float(self.implicit_stroke_width) / 2.0
+            return float(self.stroke_width) / 2.0
+        return 0.0
+
     def _init_shape(self, *args):
         """
         Generic SVG parsing of args. In those cases where the shape accepts finite elements we can process the last
@@ -3833,91 +3759,802 @@ class Shape(SVGElement, GraphicObject, Transformable):
         return self.__class__.__name__
 
 
-class PathSegment:
+def _geometry_property(name):
     """
-    Path Segments are the base class for all the segment within a Path.
-    These are defined in SVG 1.1 8.3 and SVG 2.0 9.3
-    https://www.w3.org/TR/SVG11/paths.html#PathData
-    https://www.w3.org/TR/SVG2/paths.html#PathElement
+    Property for a geometry attribute of a _CachedShape, stored as _name. Assigning it invalidates the cached geometry.
+    """
+    private = "_" + name
 
-    These segments define a 1:1 relationship with the path_d or path data attribute, denoted in
-    SVG by the 'd' attribute. These are moveto, closepath, lineto, and the curves which are cubic
-    bezier curves, quadratic bezier curves, and elliptical arc. These are classed as Move, Close,
-    Line, CubicBezier, QuadraticBezier, and Arc. And in path_d are denoted as M, Z, L, C, Q, A.
+    def setter(self, value):
+        self.__dict__[private] = value
+        self.invalidate()
 
-    There are lowercase versions of these commands. And for C, and Q there are S and T which are
-    smooth versions. For lines there are also V and H commands which denote vertical and horizontal
-    versions of the line command.
+    return property(attrgetter(private), setter)
 
-    The major difference between paths in 1.1 and 2.0 is the use of Z to truncate a command to close.
-    "M0,0C 0,100 100,0 z is valid in 2.0 since the last z replaces the 0,0. These are read by
-    svg.elements but they are not written.
+
+class _CachedShape(Shape):
     """
+    Shape whose segments and bounding box are cached. The cache is keyed on a version, bumped whenever one of the
+    geometry attributes is assigned, and on the transform for the transformed geometry. Subclasses build their
+    segments in _make_segments().
 
-    def __init__(self, **kwargs):
-        try:
-            self.relative = bool(kwargs["relative"])
-        except (KeyError, ValueError):
-            self.relative = False
-        try:
-            self.smooth = bool(kwargs["smooth"])
-        except (KeyError, ValueError):
-            self.smooth = True
-        self.start = None
-        self.end = None
+    segments() returns copies of the cached segments, so altering them leaves the shape as it was. Call invalidate()
+    after modifying the geometry in place, such as moving one of the points.
+    """
 
-    def __repr__(self):
-        values = []
-        s = self.start
-        if s is not None:
-            values.append("start=%s" % repr(s))
-        e = self.end
-        if e is not None:
-            values.append("end=%s" % repr(e))
-        return "%s(%s)" % (self.__class__.__name__, ", ".join(values))
+    _version = 0
 
-    def __mul__(self, other):
-        if isinstance(other, (Matrix, str)):
-            n = copy(self)
-            n *= other
-            return n
-        return NotImplemented
+    def __init__(self, *args, **kwargs):
+        self._geometry = {}
+        Shape.__init__(self, *args, **kwargs)
 
-    __rmul__ = __mul__
+    def invalidate(self):
+        """
+        Marks the cached geometry and lengths of the shape, and the bounds of the groups containing it, as out of
+        date.
+        """
+        self._version += 1
+        if self.__dict__.get("_lengths") is not None:
+            self._length = None
+            self._lengths = None
+            self._lengths_cumulative = None
+        Transformable.invalidate(self)
 
-    def __iadd__(self, other):
-        if isinstance(other, PathSegment):
-            path = Path(self, other)
-            return path
-        elif isinstance(other, str):
-            path = Path(self) + other
-            return path
-        return NotImplemented
+    def _geometry_key(self, transformed):
+        if transformed:
+            m = self.transform
+            return (
+                self._version,
+                self._strict,
+                self.apply,
+                m.a,
+                m.b,
+                m.c,
+                m.d,
+                m.e,
+                m.f,
+            )
+        return self._version, self._strict, self.apply
 
-    __add__ = __iadd__
+    def _make_segments(self, transformed=True):
+        raise NotImplementedError
 
-    def __str__(self):
+    def _shared_segments(self, transformed=True):
         """
-        This defines an individual path segment string. Since this isn't part of a Path it appends a pseudo-Move
-        command to correctly provide the starting position.
-        :return: string representation of the object.
+        Returns the cached tuple of PathSegments which correctly produce this shape. These must not be altered.
         """
-        d = self.d()
-        if self.start is not None:
-            if self.relative:
-                return "m %s %s" % (self.start, d)
-            else:
-                return "M %s %s" % (self.start, d)
-        return d
+        key = self._geometry_key(transformed)
+        cached = self._geometry.get(("segments", transformed))
+        if cached is None or cached[0] != key:
+            cached = key, tuple(self._make_segments(transformed))
+            self._geometry[("segments", transformed)] = cached
+        return cached[1]
 
-    def __iter__(self):
-        self.n = -1
-        return self
+    def segments(self, transformed=True):
+        """
+        Returns PathSegments which correctly produce this shape, copied from the cached segments.
+        """
+        return [copy(segment) for segment in self._shared_segments(transformed)]
 
-    def __next__(self):
-        self.n += 1
-        try:
-            val = self[self.n]
+    def bbox(self, transformed=True, with_stroke=False):
+        """
+        Get the bounding box for the given shape. The bounds without the stroke are cached.
+
+        :param transformed: whether this is the transformed bounds or default.
+        :param with_stroke: should the stroke-width be included in the bounds.
+        :return: bounding box of the given element
+        """
+        key = self._geometry_key(transformed)
+        cached = self._geometry.get(("bbox", transformed))
+        if cached is None or cached[0] != key:
+            cached = key, Shape.bbox(self, transformed=transformed)
+            self._geometry[("bbox", transformed)] = cached
+        bbox = cached[1]
+        delta = self._stroke_delta(transformed, with_stroke)
+        if bbox is None or delta == 0.0:
+            return bbox
+        return bbox[0] - delta, bbox[1] - delta, bbox[2] + delta, bbox[3] + delta
+
+
+def _gauss_legendre_rule(order):
+    """
+    Returns the nodes and weights of the Gauss-Legendre rule of the given order, mapped onto [0, 1].
+    """
+    nodes = list()
+    weights = list()
+    for i in range(1, order + 1):
+        x = cos(tau * (i - 0.25) / (2 * order + 1))
+        for _ in range(100):
+            p0, p1 = 1.0, x
+            for k in range(2, order + 1):
+                p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+            dp = order * (x * p1 - p0) / (x * x - 1)
+            dx = p1 / dp
+            x -= dx
+            if abs(dx) < 1e-15:
+                break
+        p0, p1 = 1.0, x
+        for k in range(2, order + 1):
+            p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+        dp = order * (x * p1 - p0) / (x * x - 1)
+        nodes.append((1.0 - x) / 2.0)
+        weights.append(1.0 / ((1.0 - x * x) * dp * dp))
+    return nodes, weights
+
+
+GAUSS_LEGENDRE_ORDER = 16
+_GAUSS_LEGENDRE_NODES, _GAUSS_LEGENDRE_WEIGHTS = _gauss_legendre_rule(
+    GAUSS_LEGENDRE_ORDER
+)
+
+
+def _bezier_speed_coefficients(points):
+    """
+    Returns complex c0, c1, c2 such that c0 + c1 * t + c2 * t * t is the derivative of the quadratic or cubic
+    bezier curve with the given control points.
+    """
+    if len(points) == 3:
+        p0, p1, p2 = points
+        return 2 * (p1 - p0), 2 * (p0 - 2 * p1 + p2), 0j
+    p0, p1, p2, p3 = points
+    return (
+        3 * (p1 - p0),
+        6 * (p0 - 2 * p1 + p2),
+        3 * (3 * (p1 - p2) + p3 - p0),
+    )
+
+
+def bezier_length(curve, start=0.0, end=1.0, error=ERROR, max_depth=50):
+    """
+    Length of a QuadraticBezier or CubicBezier between the t values start and end.
+
+    The speed of the curve is integrated with adaptive Gauss-Legendre quadrature, intervals are split until the
+    estimated error is within the requested error. Returns the length and the estimated bound on its error.
+    """
+    if isinstance(curve, CubicBezier):
+        points = (curve.start, curve.control1, curve.control2, curve.end)
+    else:
+        points = (curve.start, curve.control, curve.end)
+    c0, c1, c2 = _bezier_speed_coefficients([complex(p.x, p.y) for p in points])
+    rule = list(zip(_GAUSS_LEGENDRE_NODES, _GAUSS_LEGENDRE_WEIGHTS))
+
+    def integrate(a, b):
+        width = b - a
+        total = 0.0
+        for node, weight in rule:
+            t = a + width * node
+            total += weight * abs(c0 + t * (c1 + t * c2))
+        return total * width
+
+    length = 0.0
+    bound = 0.0
+    stack = [(start, end, integrate(start, end), error, 0)]
+    while stack:
+        a, b, whole, tolerance, depth = stack.pop()
+        mid = (a + b) / 2.0
+        left = integrate(a, mid)
+        right = integrate(mid, b)
+        halves = left + right
+        difference = abs(halves - whole)
+        if difference <= tolerance or difference <= 1e-14 * halves or depth >= max_depth:
+            length += halves
+            bound += difference
+            continue
+        tolerance /= 2.0
+        depth += 1
+        stack.append((mid, b, right, tolerance, depth))
+        stack.append((a, mid, left, tolerance, depth))
+    return length, bound
+
+
+def bezier_lengths(curves, error=ERROR, max_panels=64):
+    """
+    Lengths of many QuadraticBezier or CubicBezier curves at once, with numpy.
+
+    curves is a sequence of the curves, or an array of shape (N, 3, 2) or (N, 4, 2) of their control points.
+    Every curve is integrated with Gauss-Legendre quadrature over an increasing number of equal panels until
+    the estimated error is within error. Curves that are not resolved by max_panels, such as curves with a cusp,
+    are given to the adaptive bezier_length(). Returns arrays of the lengths and of the estimated error bounds.
+
+    Without numpy every curve is given to bezier_length() and the results are lists.
+    """
+    np = numeric_backend("numpy")
+    if np is None:
+        found = list()
+        for curve in curves:
+            if not isinstance(curve, PathSegment):
+                points = [tuple(p) for p in curve]
+                if len(points) == 3:
+                    curve = QuadraticBezier(*points)
+                else:
+                    curve = CubicBezier(*points)
+            found.append(bezier_length(curve, error=error))
+        return [f[0] for f in found], [f[1] for f in found]
+    if not len(curves):
+        return np.zeros(0), np.zeros(0)
+    if isinstance(curves[0], PathSegment):
+        control = np.empty((len(curves), 4), dtype=complex)
+        for i, curve in enumerate(curves):
+            if isinstance(curve, CubicBezier):
+                points = (curve.start, curve.control1, curve.control2, curve.end)
+            else:
+                # Degree elevation, the same curve as a cubic.
+                s, c, e = curve.start, curve.control, curve.end
+                points = (s, s + (c - s) * (2.0 / 3.0), e + (c - e) * (2.0 / 3.0), e)
+            control[i] = [complex(p.x, p.y) for p in points]
+    else:
+        control = np.asarray(curves, dtype=float)
+        control = control[..., 0] + 1j * control[..., 1]
+    count = len(control)
+    c0, c1, c2 = _bezier_speed_coefficients(
+        [control[:, i] for i in range(control.shape[1])]
+    )
+    c0 = c0 * np.ones(count)
+    c1 = c1 * np.ones(count)
+    c2 = c2 * np.ones(count)
+    nodes = np.array(_GAUSS_LEGENDRE_NODES)
+    weights = np.array(_GAUSS_LEGENDRE_WEIGHTS)
+
+    def integrate(active, panels):
+        t = ((np.arange(panels)[:, None] + nodes) / panels).ravel()
+        speed = np.abs(
+            c0[active, None] + t * (c1[active, None] + t * c2[active, None])
+        )
+        return speed @ np.tile(weights, panels) / panels
+
+    lengths = np.zeros(count)
+    bounds = np.zeros(count)
+    active = np.arange(count)
+    previous = integrate(active, 1)
+    panels = 2
+    while len(active):
+        current = integrate(active, panels)
+        difference = np.abs(current - previous)
+        done = (difference <= error) | (difference <= 1e-14 * current)
+        lengths[active[done]] = current[done]
+        bounds[active[done]] = difference[done]
+        active = active[~done]
+        previous = current[~done]
+        panels *= 2
+        if panels > max_panels:
+            break
+    for i in active:
+        points = [(p.real, p.imag) for p in control[i]]
+        if len(points) == 3:
+            curve = QuadraticBezier(*points)
+        else:
+            curve = CubicBezier(*points)
+        lengths[i], bounds[i] = bezier_length(curve, error=error)
+    return lengths, bounds
+
+
+def _carlson_rf(x, y, z):
+    """
+    Carlson's symmetric elliptic integral of the first kind, R_F(x, y, z). At most one argument may be zero.
+    """
+    while True:
+        sx = sqrt(x)
+        sy = sqrt(y)
+        sz = sqrt(z)
+        lam = sx * (sy + sz) + sy * sz
+        x = (x + lam) * 0.25
+        y = (y + lam) * 0.25
+        z = (z + lam) * 0.25
+        mu = (x + y + z) / 3.0
+        dx = (mu - x) / mu
+        dy = (mu - y) / mu
+        dz = (mu - z) / mu
+        if not max(abs(dx), abs(dy), abs(dz)) >= 0.0025:  # Also stops on nan.
+            break
+    e2 = dx * dy - dz * dz
+    e3 = dx * dy * dz
+    return (1.0 + (e2 / 24.0 - 0.1 - 3.0 * e3 / 44.0) * e2 + e3 / 14.0) / sqrt(mu)
+
+
+def _carlson_rd(x, y, z):
+    """
+    Carlson's symmetric elliptic integral of the second kind, R_D(x, y, z). x and y may not both be zero.
+    """
+    total = 0.0
+    factor = 1.0
+    while True:
+        sx = sqrt(x)
+        sy = sqrt(y)
+        sz = sqrt(z)
+        lam = sx * (sy + sz) + sy * sz
+        total += factor / (sz * (z + lam))
+        factor *= 0.25
+        x = (x + lam) * 0.25
+        y = (y + lam) * 0.25
+        z = (z + lam) * 0.25
+        mu = (x + y + 3.0 * z) * 0.2
+        dx = (mu - x) / mu
+        dy = (mu - y) / mu
+        dz = (mu - z) / mu
+        if not max(abs(dx), abs(dy), abs(dz)) >= 0.0015:  # Also stops on nan.
+            break
+    ea = dx * dy
+    eb = dz * dz
+    ec = ea - eb
+    ed = ea - 6.0 * eb
+    ee = ed + ec + ec
+    return 3.0 * total + factor * (
+        1.0
+        + ed * (-3.0 / 14.0 + 3.0 / 56.0 * ed - 9.0 / 52.0 * dz * ee)
+        + dz * (ee / 6.0 + dz * (-9.0 / 22.0 * ec + dz * 3.0 / 26.0 * ea))
+    ) / (mu * sqrt(mu))
+
+
+def elliptic_e(phi, m):
+    """
+    Incomplete elliptic integral of the second kind E(phi|m) for m <= 1, the same as scipy's ellipeinc.
+
+    Computed with Carlson's symmetric forms, the amplitude is reduced into [-pi/2, pi/2] plus whole periods of
+    the complete integral.
+    """
+    half_turn = tau / 2.0
+    periods = round(phi / half_turn)
+    phi -= periods * half_turn
+    s = sin(phi)
+    c = cos(phi)
+    ss = s * s
+    value = s * _carlson_rf(c * c, 1.0 - m * ss, 1.0)
+    if m != 0:
+        value -= m / 3.0 * s * ss * _carlson_rd(c * c, 1.0 - m * ss, 1.0)
+    if periods:
+        if m == 1:
+            complete = 1.0
+        else:
+            complete = _carlson_rf(0.0, 1.0 - m, 1.0)
+            complete -= m / 3.0 * _carlson_rd(0.0, 1.0 - m, 1.0)
+        value += 2 * periods * complete
+    return value
+
+
+def elliptic_arc_length(rx, ry, start_t, sweep):
+    """
+    Length of the part of an ellipse with radii rx and ry from the parameter start_t over sweep.
+
+    The larger radius leads the integral so the parameter of the elliptic integral stays within [0, 1).
+    """
+    if rx > ry:
+        start_t -= tau / 4.0
+        a, b = rx, ry
+    else:
+        a, b = ry, rx
+    if a == 0:
+        return 0.0
+    m = 1.0 - (b / a) * (b / a)
+    return a * abs(elliptic_e(start_t + sweep, m) - elliptic_e(start_t, m))
+
+
+def elliptic_arc_lengths(arcs):
+    """
+    Lengths of many elliptical arcs at once, with numpy.
+
+    arcs is a sequence of Arc segments or an array of shape (N, 4) of the rx, ry, start t and sweep of each arc.
+    Without numpy every arc is given to elliptic_arc_length() and the result is a list.
+    """
+    np = numeric_backend("numpy")
+    if len(arcs) and isinstance(arcs[0], PathSegment):
+        arcs = [(arc.rx, arc.ry, arc.get_start_t(), arc.sweep) for arc in arcs]
+    if np is None:
+        return [elliptic_arc_length(*arc) for arc in arcs]
+    arcs = np.asarray(arcs, dtype=float).reshape((-1, 4))
+    rx, ry, start_t, sweep = arcs.T
+    wide = rx > ry
+    a = np.where(wide, rx, ry)
+    b = np.where(wide, ry, rx)
+    start_t = np.where(wide, start_t - tau / 4.0, start_t)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(a > 0, b / a, 1.0)
+    m = 1.0 - ratio * ratio
+
+    def rf(x, y, z):
+        while True:
+            sx, sy, sz = np.sqrt(x), np.sqrt(y), np.sqrt(z)
+            lam = sx * (sy + sz) + sy * sz
+            x, y, z = (x + lam) * 0.25, (y + lam) * 0.25, (z + lam) * 0.25
+            mu = (x + y + z) / 3.0
+            dx, dy, dz = (mu - x) / mu, (mu - y) / mu, (mu - z) / mu
+            if not np.any(np.maximum(np.maximum(abs(dx), abs(dy)), abs(dz)) >= 0.0025):
+                break
+        e2 = dx * dy - dz * dz
+        e3 = dx * dy * dz
+        return (1.0 + (e2 / 24.0 - 0.1 - 3.0 * e3 / 44.0) * e2 + e3 / 14.0) / np.sqrt(mu)
+
+    def rd(x, y, z):
+        total = 0.0
+        factor = 1.0
+        while True:
+            sx, sy, sz = np.sqrt(x), np.sqrt(y), np.sqrt(z)
+            lam = sx * (sy + sz) + sy * sz
+            total = total + factor / (sz * (z + lam))
+            factor *= 0.25
+            x, y, z = (x + lam) * 0.25, (y + lam) * 0.25, (z + lam) * 0.25
+            mu = (x + y + 3.0 * z) * 0.2
+            dx, dy, dz = (mu - x) / mu, (mu - y) / mu, (mu - z) / mu
+            if not np.any(np.maximum(np.maximum(abs(dx), abs(dy)), abs(dz)) >= 0.0015):
+                break
+        ea = dx * dy
+        eb = dz * dz
+        ec = ea - eb
+        ed = ea - 6.0 * eb
+        ee = ed + ec + ec
+        return 3.0 * total + factor * (
+            1.0
+            + ed * (-3.0 / 14.0 + 3.0 / 56.0 * ed - 9.0 / 52.0 * dz * ee)
+            + dz * (ee / 6.0 + dz * (-9.0 / 22.0 * ec + dz * 3.0 / 26.0 * ea))
+        ) / (mu * np.sqrt(mu))
+
+    # Complete integral, with the limit E(1) = 1 where R_F and R_D diverge.
+    flat = m >= 1.0
+    n = np.where(flat, 0.5, 1.0 - m)
+    complete = np.where(flat, 1.0, rf(0.0, n, 1.0) - m / 3.0 * rd(0.0, n, 1.0))
+
+    def e(phi):
+        periods = np.round(phi / (tau / 2.0))
+        phi = phi - periods * (tau / 2.0)
+        s = np.sin(phi)
+        c2 = np.cos(phi) ** 2
+        d2 = 1.0 - m * s * s
+        value = s * (rf(c2, d2, 1.0) - m / 3.0 * s * s * rd(c2, d2, 1.0))
+        return value + 2 * periods * complete
+
+    lengths = a * np.abs(e(start_t + sweep) - e(start_t))
+    lengths[a == 0] = 0.0
+    return lengths
+
+
+def arc_beziers(arcs, counts, degree=3):
+    """
+    Control points of the bezier curves approximating many arcs at once, with numpy.
+
+    Each arc is split into its count of equal slices of the ellipse parameter, exactly as Arc.as_cubic_curves() and
+    Arc.as_quad_curves() do. Returns an array of shape (sum(counts), degree + 1, 2), ordered arc by arc.
+    """
+    np = numeric_backend("numpy")
+    counts = np.asarray(counts, dtype=int)
+    params = np.array(
+        [
+            (
+                arc.center[0],
+                arc.center[1],
+                arc.rx,
+                arc.ry,
+                arc.get_rotation(),
+                arc.get_start_t(),
+                arc.sweep,
+                arc.start[0],
+                arc.start[1],
+                arc.end[0],
+                arc.end[1],
+            )
+            for arc in arcs
+        ],
+        dtype=float,
+    ).reshape((-1, 11))
+    keep = counts > 0
+    params = params[keep]
+    counts = counts[keep]
+    cx, cy, rx, ry, theta, start_t, sweep, sx, sy, ex, ey = np.repeat(
+        params, counts, axis=0
+    ).T
+    ends = np.cumsum(counts)
+    first = ends - counts
+    index = np.arange(len(cx)) - np.repeat(first, counts)
+    dt = sweep / np.repeat(counts, counts)
+    t0 = start_t + index * dt
+    t1 = t0 + dt
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+
+    def ellipse(t):
+        cos_t = rx * np.cos(t)
+        sin_t = ry * np.sin(t)
+        return (
+            cx + cos_t * cos_theta - sin_t * sin_theta,
+            cy + cos_t * sin_theta + sin_t * cos_theta,
+        )
+
+    def derivative(t):
+        cos_t = ry * np.cos(t)
+        sin_t = rx * np.sin(t)
+        return (
+            -sin_t * cos_theta - cos_t * sin_theta,
+            -sin_t * sin_theta + cos_t * cos_theta,
+        )
+
+    x0, y0 = ellipse(t0)
+    x1, y1 = ellipse(t1)
+    x0[first] = sx[first]
+    y0[first] = sy[first]
+    x1[ends - 1] = ex[ends - 1]
+    y1[ends - 1] = ey[ends - 1]
+    points = np.empty((len(cx), degree + 1, 2))
+    points[:, 0, 0] = x0
+    points[:, 0, 1] = y0
+    points[:, degree, 0] = x1
+    points[:, degree, 1] = y1
+    if degree == 2:
+        alpha = (4.0 - np.cos(dt)) / 3.0
+        mx, my = ellipse((t0 + t1) / 2.0)
+        points[:, 1, 0] = cx + alpha * (mx - cx)
+        points[:, 1, 1] = cy + alpha * (my - cy)
+    else:
+        alpha = np.sin(dt) * (np.sqrt(4 + 3 * np.tan(dt / 2.0) ** 2) - 1) / 3.0
+        dx0, dy0 = derivative(t0)
+        dx1, dy1 = derivative(t1)
+        points[:, 1, 0] = x0 + alpha * dx0
+        points[:, 1, 1] = y0 + alpha * dy0
+        points[:, 2, 0] = x1 - alpha * dx1
+        points[:, 2, 1] = y1 - alpha * dy1
+    return points
+
+
+def arc_bezier_deviations(arcs, counts, points, samples=16):
+    """
+    Upper bound of the distance between each arc and the bezier curves from arc_beziers(), with numpy.
+
+    The curves are sampled and mapped back onto the unit circle of the arc's ellipse, the radial error found there is
+    scaled by the larger radius.
+    """
+    np = numeric_backend("numpy")
+    counts = np.asarray(counts, dtype=int)
+    deviations = np.zeros(len(counts))
+    if not len(points):
+        return deviations
+    degree = points.shape[1] - 1
+    s = (np.arange(samples) + 0.5) / samples
+    binomial = (1, 2, 1) if degree == 2 else (1, 3, 3, 1)
+    weights = np.array(
+        [
+            [binomial[k] * (1 - v) ** (degree - k) * v**k for k in range(degree + 1)]
+            for v in s
+        ]
+    )
+    params = np.array(
+        [(arc.center[0], arc.center[1], arc.rx, arc.ry, arc.get_rotation()) for arc in arcs],
+        dtype=float,
+    ).reshape((-1, 5))[counts > 0]
+    cx, cy, rx, ry, theta = np.repeat(params, counts[counts > 0], axis=0).T
+    x = np.einsum("sk,mk->ms", weights, points[:, :, 0]) - cx[:, None]
+    y = np.einsum("sk,mk->ms", weights, points[:, :, 1]) - cy[:, None]
+    cos_theta = np.cos(theta)[:, None]
+    sin_theta = np.sin(theta)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = (x * cos_theta + y * sin_theta) / rx[:, None]
+        v = (y * cos_theta - x * sin_theta) / ry[:, None]
+        error = np.abs(np.hypot(u, v) - 1.0).max(axis=1) * np.maximum(rx, ry)
+    error[(rx == 0) | (ry == 0)] = 0.0
+    deviations[counts > 0] = np.maximum.reduceat(
+        error, np.cumsum(counts[counts > 0]) - counts[counts > 0]
+    )
+    return deviations
+
+
+def svg_arc_parameters(sx, sy, rx, ry, rotation, large_arc_flag, sweep_flag, ex, ey):
+    """
+    Center parameterization of an svg arc, on plain floats.
+    http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes
+
+    The arc goes from (sx, sy) to (ex, ey), the rotation is in degrees. Returns the center, prx, pry and the sweep in
+    radians as (cx, cy, prx_x, prx_y, pry_x, pry_y, sweep). Arcs with equal ends or a zero radius give all points at
+    the start and a sweep of 0.
+    """
+    if (abs(sx - ex) <= ERROR and abs(sy - ey) <= ERROR) or rx == 0 or ry == 0:
+        return sx, sy, sx, sy, sx, sy, 0.0
+    cosr = cos(radians(rotation))
+    sinr = sin(radians(rotation))
+    dx = (sx - ex) / 2
+    dy = (sy - ey) / 2
+    x1prim = cosr * dx + sinr * dy
+    x1prim_sq = x1prim * x1prim
+    y1prim = -sinr * dx + cosr * dy
+    y1prim_sq = y1prim * y1prim
+
+    rx_sq = rx * rx
+    ry_sq = ry * ry
+
+    # Correct out of range radii
+    radius_check = (x1prim_sq / rx_sq) + (y1prim_sq / ry_sq)
+    if radius_check > 1:
+        rx *= sqrt(radius_check)
+        ry *= sqrt(radius_check)
+        rx_sq = rx * rx
+        ry_sq = ry * ry
+
+    t1 = rx_sq * y1prim_sq
+    t2 = ry_sq * x1prim_sq
+    c = sqrt(abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
+
+    if bool(large_arc_flag) == bool(sweep_flag):
+        c = -c
+    cxprim = c * rx * y1prim / ry
+    cyprim = -c * ry * x1prim / rx
+
+    cx = (cosr * cxprim - sinr * cyprim) + ((sx + ex) / 2)
+    cy = (sinr * cxprim + cosr * cyprim) + ((sy + ey) / 2)
+
+    ux = (x1prim - cxprim) / rx
+    uy = (y1prim - cyprim) / ry
+    vx = (-x1prim - cxprim) / rx
+    vy = (-y1prim - cyprim) / ry
+    n = sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
+    d = (ux * vx + uy * vy) / n
+    # In certain cases the above calculation can through inaccuracies
+    # become just slightly out of range, f ex -1.0000000000000002.
+    if d > 1.0:
+        d = 1.0
+    elif d < -1.0:
+        d = -1.0
+    delta = degrees(acos(d))
+    if (ux * vy - uy * vx) < 0:
+        delta = -delta
+    delta = delta % 360
+    if not sweep_flag:
+        delta -= 360
+    return (
+        cx,
+        cy,
+        cx + rx * cosr,
+        cy + rx * sinr,
+        cx - ry * sinr,
+        cy + ry * cosr,
+        tau * delta / 360.0,
+    )
+
+
+def svg_arc_parameters_batch(arcs):
+    """
+    Center parameterization of many svg arcs at once, with numpy.
+
+    arcs is a sequence of (sx, sy, rx, ry, rotation, large_arc_flag, sweep_flag, ex, ey). Returns an array of shape
+    (N, 7) with the rows svg_arc_parameters() gives. Without numpy the result is a list of those tuples.
+    """
+    np = numeric_backend("numpy")
+    if np is None:
+        return [svg_arc_parameters(*arc) for arc in arcs]
+    arcs = np.asarray(arcs, dtype=float).reshape((-1, 9))
+    sx, sy, rx, ry, rotation, large_arc_flag, sweep_flag, ex, ey = arcs.T
+    degenerate = (
+        (np.abs(sx - ex) <= ERROR) & (np.abs(sy - ey) <= ERROR) | (rx == 0) | (ry == 0)
+    )
+    theta = np.radians(rotation)
+    cosr = np.cos(theta)
+    sinr = np.sin(theta)
+    dx = (sx - ex) / 2
+    dy = (sy - ey) / 2
+    x1prim = cosr * dx + sinr * dy
+    x1prim_sq = x1prim * x1prim
+    y1prim = -sinr * dx + cosr * dy
+    y1prim_sq = y1prim * y1prim
+    with np.errstate(divide="ignore", invalid="ignore"):
+        radius_check = (x1prim_sq / (rx * rx)) + (y1prim_sq / (ry * ry))
+        scale = np.where(radius_check > 1, np.sqrt(radius_check), 1.0)
+        rx = rx * scale
+        ry = ry * scale
+        rx_sq = rx * rx
+        ry_sq = ry * ry
+        t1 = rx_sq * y1prim_sq
+        t2 = ry_sq * x1prim_sq
+        c = np.sqrt(np.abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
+        c = np.where(large_arc_flag == sweep_flag, -c, c)
+        cxprim = c * rx * y1prim / ry
+        cyprim = -c * ry * x1prim / rx
+        ux = (x1prim - cxprim) / rx
+        uy = (y1prim - cyprim) / ry
+        vx = (-x1prim - cxprim) / rx
+        vy = (-y1prim - cyprim) / ry
+        d = (ux * vx + uy * vy) / np.sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
+        delta = np.degrees(np.arccos(np.clip(d, -1.0, 1.0)))
+        delta = np.where(ux * vy - uy * vx < 0, -delta, delta) % 360
+        delta = np.where(sweep_flag != 0, delta, delta - 360)
+        cx = (cosr * cxprim - sinr * cyprim) + ((sx + ex) / 2)
+        cy = (sinr * cxprim + cosr * cyprim) + ((sy + ey) / 2)
+        result = np.stack(
+            (
+                cx,
+                cy,
+                cx + rx * cosr,
+                cy + rx * sinr,
+                cx - ry * sinr,
+                cy + ry * cosr,
+                tau * delta / 360.0,
+            ),
+            axis=1,
+        )
+    result[degenerate] = np.stack(
+        (sx, sy, sx, sy, sx, sy, np.zeros(len(sx))), axis=1
+    )[degenerate]
+    return result
+
+
+class PathSegment:
+    """
+    Path Segments are the base class for all the segment within a Path.
+    These are defined in SVG 1.1 8.3 and SVG 2.0 9.3
+    https://www.w3.org/TR/SVG11/paths.html#PathData
+    https://www.w3.org/TR/SVG2/paths.html#PathElement
+
+    These segments define a 1:1 relationship with the path_d or path data attribute, denoted in
+    SVG by the 'd' attribute. These are moveto, closepath, lineto, and the curves which are cubic
+    bezier curves, quadratic bezier curves, and elliptical arc. These are classed as Move, Close,
+    Line, CubicBezier, QuadraticBezier, and Arc. And in path_d are denoted as M, Z, L, C, Q, A.
+
+    There are lowercase versions of these commands. And for C, and Q there are S and T which are
+    smooth versions. For lines there are also V and H commands which denote vertical and horizontal
+    versions of the line command.
+
+    The major difference between paths in 1.1 and 2.0 is the use of Z to truncate a command to close.
+    "M0,0C 0,100 100,0 z is valid in 2.0 since the last z replaces the 0,0. These are read by
+    svg.elements but they are not written.
+    """
+
+    def __init__(self, **kwargs):
+        try:
+            self.relative = bool(kwargs["relative"])
+        except (KeyError, ValueError):
+            self.relative = False
+        try:
+            self.smooth = bool(kwargs["smooth"])
+        except (KeyError, ValueError):
+            self.smooth = True
+        self.start = None
+        self.end = None
+
+    def __repr__(self):
+        values = []
+        s = self.start
+        if s is not None:
+            values.append("start=%s" % repr(s))
+        e = self.end
+        if e is not None:
+            values.append("end=%s" % repr(e))
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(values))
+
+    def __mul__(self, other):
+        if isinstance(other, (Matrix, str)):
+            n = copy(self)
+            n *= other
+            return n
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __iadd__(self, other):
+        if isinstance(other, PathSegment):
+            path = Path(self, other)
+            return path
+        elif isinstance(other, str):
+            path = Path(self) + other
+            return path
+        return NotImplemented
+
+    __add__ = __iadd__
+
+    def __str__(self):
+        """
+        This defines an individual path segment string. Since this isn't part of a Path it appends a pseudo-Move
+        command to correctly provide the starting position.
+        :return: string representation of the object.
+        """
+        d = self.d()
+        if self.start is not None:
+            if self.relative:
+                return "m %s %s" % (self.start, d)
+            else:
+                return "M %s %s" % (self.start, d)
+        return d
+
+    def __iter__(self):
+        self.n = -1
+        return self
+
+    def __next__(self):
+        self.n += 1
+        try:
+            val = self[self.n]
             if val is None:
                 self.n += 1
                 val = self[self.n]
@@ -4168,15 +4805,13 @@ class Linear(PathSegment):
             raise IndexError
 
     def npoint(self, positions):
-        try:
-            import numpy as np
-
-            xy = np.empty(shape=(len(positions), 2), dtype=float)
-            xy[:, 0] = np.interp(positions, [0, 1], [self.start.x, self.end.x])
-            xy[:, 1] = np.interp(positions, [0, 1], [self.start.y, self.end.y])
-            return xy
-        except ImportError:
+        np = numeric_backend("numpy")
+        if np is None:
             return [Point.towards(self.start, self.end, pos) for pos in positions]
+        xy = np.empty(shape=(len(positions), 2), dtype=float)
+        xy[:, 0] = np.interp(positions, [0, 1], [self.start.x, self.end.x])
+        xy[:, 1] = np.interp(positions, [0, 1], [self.start.y, self.end.y])
+        return xy
 
     def length(self, error=None, min_depth=None):
         if self.start is not None and self.end is not None:
@@ -4319,14 +4954,12 @@ class QuadraticBezier(Curve):
                 n_pos_2 * y0 + 2 * n_pos_pos * y1 + pos_2 * y2,
             )
 
-        try:
-            import numpy as np
-
-            xy = np.empty(shape=(len(positions), 2))
-            xy[:, 0], xy[:, 1] = _compute_point(np.array(positions))
-            return xy
-        except ImportError:
+        np = numeric_backend("numpy")
+        if np is None:
             return [Point(*_compute_point(position)) for position in positions]
+        xy = np.empty(shape=(len(positions), 2))
+        xy[:, 0], xy[:, 1] = _compute_point(np.array(positions))
+        return xy
 
     def bbox(self):
         """
@@ -4339,7 +4972,12 @@ class QuadraticBezier(Curve):
         else:
             t = 0.5
         if 0 < t < 1:
-            x_values = [self.start.x, self.end.x, self.point(t).x]
+            n = 1 - t
+            x_values = [
+                self.start.x,
+                self.end.x,
+                n * n * self.start.x + 2 * (n * t) * self.control.x + t * t * self.end.x,
+            ]
         else:
             x_values = [self.start.x, self.end.x]
         n = self.start.y - self.control.y
@@ -4349,7 +4987,12 @@ class QuadraticBezier(Curve):
         else:
             t = 0.5
         if 0 < t < 1:
-            y_values = [self.start.y, self.end.y, self.point(t).y]
+            n = 1 - t
+            y_values = [
+                self.start.y,
+                self.end.y,
+                n * n * self.start.y + 2 * (n * t) * self.control.y + t * t * self.end.y,
+            ]
         else:
             y_values = [self.start.y, self.end.y]
         return min(x_values), min(y_values), max(x_values), max(y_values)
@@ -4517,14 +5160,12 @@ class CubicBezier(Curve):
                 n_pos_3 * y0 + 3 * (n_pos_2_pos * y1 + pos_2_n_pos * y2) + pos_3 * y3,
             )
 
-        try:
-            import numpy as np
-
-            xy = np.empty(shape=(len(positions), 2))
-            xy[:, 0], xy[:, 1] = _compute_point(np.array(positions))
-            return xy
-        except ImportError:
+        np = numeric_backend("numpy")
+        if np is None:
             return [Point(*_compute_point(position)) for position in positions]
+        xy = np.empty(shape=(len(positions), 2))
+        xy[:, 0], xy[:, 1] = _compute_point(np.array(positions))
+        return xy
 
     def bbox(self):
         """returns the tight fitting bounding box of the bezier curve.
@@ -4558,11 +5199,17 @@ class CubicBezier(Curve):
                     local_extremizers.append(r2)
         else:
             local_extremizers.append(0.5)
-        local_extrema = [self.point(t)[v] for t in local_extremizers]
+        # Evaluated on plain floats, npoint() for a single position is dominated by array overhead.
+        local_extrema = []
+        for t in local_extremizers:
+            n = 1 - t
+            local_extrema.append(
+                n * n * n * a[0] + 3 * (n * n * t * a[1] + t * t * n * a[2]) + t * t * t * a[3]
+            )
         return min(local_extrema), max(local_extrema)
 
     def _length_scipy(self, error=ERROR):
-        from scipy.integrate import quad
+        quad = numeric_backend("scipy.integrate").quad
 
         p0 = complex(*self.start)
         p1 = complex(*self.control1)
@@ -4579,14 +5226,16 @@ class CubicBezier(Curve):
         return quad(_abs_derivative, 0.0, 1.0, epsabs=error, limit=1000)[0]
 
     def _length_default(self, error=ERROR, min_depth=MIN_DEPTH):
-        return self._line_length(0, 1, error, min_depth)
+        return bezier_length(self, error=error)[0]
 
     def length(self, error=ERROR, min_depth=MIN_DEPTH):
         """Calculate the length of the path up to a certain position"""
-        try:
-            return self._length_scipy(error)
-        except:  # Fallback on any failure
-            return self._length_default(error, min_depth)
+        if numeric_backend("scipy.integrate") is not None:
+            try:
+                return self._length_scipy(error)
+            except:  # Fallback on any failure
+                pass
+        return self._length_default(error, min_depth)
 
     def is_smooth_from(self, previous):
         """Checks if this segment would be a smooth segment following the previous"""
@@ -4660,15 +5309,30 @@ class Arc(Curve):
         We can denote these arc events but not as a single command.
 
         start_t + sweep = end_t
+
+        The derived ellipse parameters, rx, ry, rotation, start_t and end_t are cached. Assigning any of the points or
+        the sweep, or multiplying by a matrix, clears them. Points modified in place require a call to invalidate().
         """
+        self._ellipse = None
+        self._start_t = None
+        self._end_t = None
         Curve.__init__(self, **kwargs)
-        self.center = None
-        self.prx = None
-        self.pry = None
-        self.sweep = None
+        self._center = None
+        self._prx = None
+        self._pry = None
+        self._sweep = None
         if len(args) == 6 and isinstance(args[1], complex):
             self._svg_complex_parameterize(*args)
             return
+        elif len(args) == 6 and all(arg is not None for arg in args[:5]):
+            # Native parameterization, start, end, center, prx, pry and sweep.
+            self._start = Point(args[0])
+            self._end = Point(args[1])
+            self._center = Point(args[2])
+            self._prx = Point(args[3])
+            self._pry = Point(args[4])
+            self._sweep = args[5]
+            return
         elif len(kwargs) == 6 and "rotation" in kwargs:
             self._svg_complex_parameterize(**kwargs)
             return
@@ -4932,6 +5596,85 @@ class Arc(Curve):
     def __len__(self):
         return 5
 
+    @property
+    def start(self):
+        return self._start
+
+    @start.setter
+    def start(self, value):
+        self._start = value
+        self.invalidate()
+
+    @property
+    def end(self):
+        return self._end
+
+    @end.setter
+    def end(self, value):
+        self._end = value
+        self.invalidate()
+
+    @property
+    def center(self):
+        return self._center
+
+    @center.setter
+    def center(self, value):
+        self._center = value
+        self.invalidate()
+
+    @property
+    def prx(self):
+        return self._prx
+
+    @prx.setter
+    def prx(self, value):
+        self._prx = value
+        self.invalidate()
+
+    @property
+    def pry(self):
+        return self._pry
+
+    @pry.setter
+    def pry(self, value):
+        self._pry = value
+        self.invalidate()
+
+    @property
+    def sweep(self):
+        return self._sweep
+
+    @sweep.setter
+    def sweep(self, value):
+        self._sweep = value
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Clears the cached ellipse parameters. This is needed after the points of the arc are modified in place.
+        """
+        self._ellipse = None
+        self._start_t = None
+        self._end_t = None
+
+    def _ellipse_parameters(self):
+        """
+        rx, ry, rotation and the cosine and sine of rotation, derived from center, prx and pry and cached.
+        """
+        ellipse = self._ellipse
+        if ellipse is None:
+            rotation = Point.angle(self.center, self.prx)
+            ellipse = (
+                Point.distance(self.center, self.prx),
+                Point.distance(self.center, self.pry),
+                rotation,
+                cos(rotation),
+                sin(rotation),
+            )
+            self._ellipse = ellipse
+        return ellipse
+
     def __getitem__(self, item):
         if item == 0:
             return self.start
@@ -4960,24 +5703,22 @@ class Arc(Curve):
         self.sweep = -self.sweep
 
     def npoint(self, positions):
-        try:
-            import numpy as np
-
+        np = numeric_backend("numpy")
+        if np is not None:
             return self._points_numpy(np.array(positions))
-        except ImportError:
-            if self.start == self.end and self.sweep == 0:
-                # This is equivalent of omitting the segment
-                return [self.start] * len(positions)
-
-            start_t = self.get_start_t()
-            return [
-                self.start
-                if pos == 0
-                else self.end
-                if pos == 1
-                else self.point_at_t(start_t + self.sweep * pos)
-                for pos in positions
-            ]
+        if self.start == self.end and self.sweep == 0:
+            # This is equivalent of omitting the segment
+            return [self.start] * len(positions)
+
+        start_t = self.get_start_t()
+        return [
+            self.start
+            if pos == 0
+            else self.end
+            if pos == 1
+            else self.point_at_t(start_t + self.sweep * pos)
+            for pos in positions
+        ]
 
     def _points_numpy(self, positions):
         """Vectorized version of `point()`.
@@ -4985,7 +5726,7 @@ class Arc(Curve):
         :param positions: 1D numpy array of float in [0, 1]
         :return: 1D numpy array of complex
         """
-        import numpy as np
+        np = numeric_backend("numpy")
 
         xy = np.empty((len(positions), 2), dtype=float)
 
@@ -4994,13 +5735,9 @@ class Arc(Curve):
         else:
             t = self.get_start_t() + self.sweep * positions
 
-            rotation = self.get_rotation()
-            a = self.rx
-            b = self.ry
+            a, b, rotation, cos_rot, sin_rot = self._ellipse_parameters()
             cx = self.center.x
             cy = self.center.y
-            cos_rot = cos(rotation)
-            sin_rot = sin(rotation)
             cos_t = np.cos(t)
             sin_t = np.sin(t)
             xy[:, 0] = cx + a * cos_t * cos_rot - b * sin_t * sin_rot
@@ -5013,25 +5750,14 @@ class Arc(Curve):
         return xy
 
     def _integral_length(self):
-        def ellipse_part_integral(t1, t2, a, b, n=100000):
-            # function to integrate
-            def f(t):
-                sint = sin(t)
-                return sqrt(1 - (1 - (a * a) / (b * b)) * sint * sint)
-
-            start = min(t1, t2)
-            seg_len = abs(t1 - t2) / n
-            return b * sum(f(start + seg_len * i) * seg_len for i in range(1, n + 1))
-
-        start_angle = self.get_start_t()
-        end_angle = start_angle + self.sweep
-        return ellipse_part_integral(start_angle, end_angle, self.rx, self.ry)
+        """The arc length from the elliptic integral of the second kind, computed without scipy."""
+        return elliptic_arc_length(self.rx, self.ry, self.get_start_t(), self.sweep)
 
     def _exact_length(self):
         """scipy is not a dependency. However, if scipy exists this function will find the
         exact arc length. By default .length() delegates to here and on failure uses the
         fallback method."""
-        from scipy.special import ellipeinc
+        ellipeinc = numeric_backend("scipy.special").ellipeinc
 
         a = self.rx
         b = self.ry
@@ -5059,10 +5785,12 @@ class Arc(Curve):
 
         if d < ERROR:  # This is a circle.
             return abs(self.rx * self.sweep)
-        try:
-            return self._exact_length()
-        except:  # Fallback on any failure
-            return self._line_length(error=error, min_depth=min_depth)
+        if numeric_backend("scipy.special") is not None:
+            try:
+                return self._exact_length()
+            except:  # Fallback on any failure
+                pass
+        return self._integral_length()
 
     def _svg_complex_parameterize(
         self, start, radius, rotation, arc_flag, sweep_flag, end
@@ -5084,94 +5812,20 @@ class Arc(Curve):
         """Conversion from svg parameterization, our chosen native native form.
         http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes"""
 
-        large_arc_flag = bool(large_arc_flag)
-        sweep_flag = bool(sweep_flag)
         start = Point(start)
-        self.start = start
         end = Point(end)
-        self.end = end
-        if start == end or rx == 0 or ry == 0:
-            # If start is equal to end, there are infinite number of circles so these void out.
-            # We still permit this kind of arc, but SVG parameterization cannot be used to achieve it.
-            self.sweep = 0
-            self.prx = Point(start)
-            self.pry = Point(start)
-            self.center = Point(start)
-            return
-        cosr = cos(radians(rotation))
-        sinr = sin(radians(rotation))
-        dx = (start.real - end.real) / 2
-        dy = (start.imag - end.imag) / 2
-        x1prim = cosr * dx + sinr * dy
-        x1prim_sq = x1prim * x1prim
-        y1prim = -sinr * dx + cosr * dy
-        y1prim_sq = y1prim * y1prim
-
-        rx_sq = rx * rx
-        ry_sq = ry * ry
-
-        # Correct out of range radii
-        radius_check = (x1prim_sq / rx_sq) + (y1prim_sq / ry_sq)
-        if radius_check > 1:
-            rx *= sqrt(radius_check)
-            ry *= sqrt(radius_check)
-            rx_sq = rx * rx
-            ry_sq = ry * ry
-
-        t1 = rx_sq * y1prim_sq
-        t2 = ry_sq * x1prim_sq
-        c = sqrt(abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
-
-        if large_arc_flag == sweep_flag:
-            c = -c
-        cxprim = c * rx * y1prim / ry
-        cyprim = -c * ry * x1prim / rx
-
-        center = Point(
-            (cosr * cxprim - sinr * cyprim) + ((start.real + end.real) / 2),
-            (sinr * cxprim + cosr * cyprim) + ((start.imag + end.imag) / 2),
-        )
-
-        ux = (x1prim - cxprim) / rx
-        uy = (y1prim - cyprim) / ry
-        vx = (-x1prim - cxprim) / rx
-        vy = (-y1prim - cyprim) / ry
-        n = sqrt(ux * ux + uy * uy)
-        p = ux
-        # theta = degrees(acos(p / n))
-        # if uy < 0:
-        #     theta = -theta
-        # theta = theta % 360
-
-        n = sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
-        p = ux * vx + uy * vy
-        d = p / n
-        # In certain cases the above calculation can through inaccuracies
-        # become just slightly out of range, f ex -1.0000000000000002.
-        if d > 1.0:
-            d = 1.0
-        elif d < -1.0:
-            d = -1.0
-        delta = degrees(acos(d))
-        if (ux * vy - uy * vx) < 0:
-            delta = -delta
-        delta = delta % 360
-        if not sweep_flag:
-            delta -= 360
-        # built parameters, delta, theta, center
-
-        rotate_matrix = Matrix()
-        rotate_matrix.post_rotate(
-            Angle.degrees(rotation).as_radians, center.x, center.y
+        # If start is equal to end, there are infinite number of circles so these void out.
+        # We still permit this kind of arc, but SVG parameterization cannot be used to achieve it.
+        cx, cy, px, py, qx, qy, sweep = svg_arc_parameters(
+            start.x, start.y, rx, ry, rotation, large_arc_flag, sweep_flag, end.x, end.y
         )
-
-        self.center = center
-        self.prx = Point(center.x + rx, center.y)
-        self.pry = Point(center.x, center.y + ry)
-
-        self.prx.matrix_transform(rotate_matrix)
-        self.pry.matrix_transform(rotate_matrix)
-        self.sweep = Angle.degrees(delta).as_radians
+        self._start = start
+        self._end = end
+        self._center = Point(cx, cy)
+        self._prx = Point(px, py)
+        self._pry = Point(qx, qy)
+        self._sweep = sweep
+        self.invalidate()
 
     def as_quad_curves(self, arc_required=None):
         if arc_required is None:
@@ -5184,12 +5838,7 @@ class Arc(Curve):
         current_t = self.get_start_t()
         p_start = self.start
 
-        theta = self.get_rotation()
-        cos_theta = cos(theta)
-        sin_theta = sin(theta)
-
-        a = self.rx
-        b = self.ry
+        a, b, theta, cos_theta, sin_theta = self._ellipse_parameters()
         cx = self.center.x
         cy = self.center.y
 
@@ -5216,15 +5865,11 @@ class Arc(Curve):
             return
         t_slice = self.sweep / float(arc_required)
 
-        theta = self.get_rotation()
-        rx = self.rx
-        ry = self.ry
+        rx, ry, theta, cos_theta, sin_theta = self._ellipse_parameters()
         p_start = self.start
         current_t = self.get_start_t()
         x0 = self.center.x
         y0 = self.center.y
-        cos_theta = cos(theta)
-        sin_theta = sin(theta)
 
         for i in range(0, arc_required):
             next_t = current_t + t_slice
@@ -5256,6 +5901,29 @@ class Arc(Curve):
             p_start = Point(p_end)
             current_t = next_t
 
+    def bezier_deviation(self, curves, samples=16):
+        """
+        Upper bound of the distance between this arc and the given curves approximating it.
+
+        The curves are sampled and mapped back onto the unit circle of the ellipse, the radial error found there is
+        scaled by the larger radius.
+        """
+        rx, ry, theta, cos_theta, sin_theta = self._ellipse_parameters()
+        if rx == 0 or ry == 0:
+            return 0.0
+        cx = self.center.x
+        cy = self.center.y
+        deviation = 0.0
+        for curve in curves:
+            for i in range(samples):
+                p = curve.point((i + 0.5) / samples)
+                x = p[0] - cx
+                y = p[1] - cy
+                u = (x * cos_theta + y * sin_theta) / rx
+                v = (y * cos_theta - x * sin_theta) / ry
+                deviation = max(deviation, abs(sqrt(u * u + v * v) - 1.0))
+        return deviation * max(rx, ry)
+
     def is_circular(self):
         a = self.rx
         b = self.ry
@@ -5271,14 +5939,14 @@ class Arc(Curve):
 
     @property
     def rx(self):
-        return Point.distance(self.center, self.prx)
+        return self._ellipse_parameters()[0]
 
     @property
     def ry(self):
-        return Point.distance(self.center, self.pry)
+        return self._ellipse_parameters()[1]
 
     def get_rotation(self):
-        return Point.angle(self.center, self.prx)
+        return self._ellipse_parameters()[2]
 
     def get_start_angle(self):
         """
@@ -5298,7 +5966,11 @@ class Arc(Curve):
 
         :return: t parameter of start point.
         """
-        return self.t_at_point(self.point_at_angle(self.get_start_angle()))
+        if self._start_t is None:
+            self._start_t = self.t_at_point(
+                self.point_at_angle(self.get_start_angle())
+            )
+        return self._start_t
 
     def get_end_t(self):
         """
@@ -5306,7 +5978,9 @@ class Arc(Curve):
 
         :return: t parameter of start point.
         """
-        return self.t_at_point(self.point_at_angle(self.get_end_angle()))
+        if self._end_t is None:
+            self._end_t = self.t_at_point(self.point_at_angle(self.get_end_angle()))
+        return self._end_t
 
     def point_at_angle(self, angle):
         """
@@ -5365,13 +6039,9 @@ class Arc(Curve):
         :param t:
         :return:
         """
-        rotation = self.get_rotation()
-        a = self.rx
-        b = self.ry
+        a, b, rotation, cos_rot, sin_rot = self._ellipse_parameters()
         cx = self.center.x
         cy = self.center.y
-        cos_rot = cos(rotation)
-        sin_rot = sin(rotation)
         cos_t = cos(t)
         sin_t = sin(t)
         px = cx + a * cos_t * cos_rot - b * sin_t * sin_rot
@@ -5440,6 +6110,265 @@ class Arc(Curve):
             )
 
 
+def _segments_npoint(segments, index, t):
+    """
+    Points at the t values within the segments at index, with numpy. Returns an array of shape (N, 2).
+
+    Positions are grouped by segment with a stable sort, lines and bezier curves are then computed together for each
+    kind of segment and any other segment computes its own points.
+    """
+    np = numeric_backend("numpy")
+    xy = np.empty((len(index), 2), dtype=float)
+    order = np.argsort(index, kind="stable")
+    used, first = np.unique(index[order], return_index=True)
+    bounds = list(zip(used.tolist(), first.tolist(), first[1:].tolist() + [len(order)]))
+
+    handled = set()
+
+    def gather(kinds, names):
+        # Positions on segments of these kinds, with their local t and the segments' control points.
+        subset = [b for b in bounds if type(segments[b[0]]) in kinds]
+        if not subset:
+            return None
+        handled.update(i for i, _, _ in subset)
+        where = np.concatenate([order[start:end] for _, start, end in subset])
+        rows = np.repeat(
+            np.arange(len(subset)), [end - start for _, start, end in subset]
+        )
+        points = np.array(
+            [[list(getattr(segments[i], n)) for n in names] for i, _, _ in subset],
+            dtype=float,
+        )[rows]
+        return where, t[where][:, None], points
+
+    found = gather((Line, Close), ("start", "end"))
+    if found is not None:
+        where, pos, p = found
+        xy[where] = p[:, 0] + (p[:, 1] - p[:, 0]) * pos
+    found = gather((QuadraticBezier,), ("start", "control", "end"))
+    if found is not None:
+        where, pos, p = found
+        n_pos = 1 - pos
+        xy[where] = (
+            n_pos * n_pos * p[:, 0] + 2 * n_pos * pos * p[:, 1] + pos * pos * p[:, 2]
+        )
+    found = gather((CubicBezier,), ("start", "control1", "control2", "end"))
+    if found is not None:
+        where, pos, p = found
+        n_pos = 1 - pos
+        xy[where] = (
+            n_pos * n_pos * n_pos * p[:, 0]
+            + 3 * (n_pos * n_pos * pos * p[:, 1] + pos * pos * n_pos * p[:, 2])
+            + pos * pos * pos * p[:, 3]
+        )
+    for i, start, end in bounds:
+        if i not in handled:
+            where = order[start:end]
+            xy[where] = segments[i].npoint(t[where])
+    return xy
+
+
+class _ArcLengthTable:
+    """
+    Arc length lookup table for a list of segments.
+
+    The length of each segment comes from bezier_length() or elliptic_arc_length(), or their numpy batch versions,
+    and the cumulative lengths are kept. A distance along the segments is found with a binary search of those, then
+    the t value within the segment is solved with the Illinois method on the length from the segment's start, so
+    the points are equidistant along the curves and not just along t.
+    """
+
+    ITERATIONS = 100
+
+    def __init__(self, segments, error=ERROR):
+        self.segments = segments
+        self.error = error
+        # Bezier curves as cubic control points, lines and quadratic curves are raised to cubics.
+        self.control = list()
+        # Arcs as their rx, ry, start t and sweep.
+        self.arcs = list()
+        for segment in segments:
+            control = None
+            arc = None
+            if isinstance(segment, CubicBezier):
+                control = (
+                    segment.start,
+                    segment.control1,
+                    segment.control2,
+                    segment.end,
+                )
+            elif isinstance(segment, QuadraticBezier):
+                s, c, e = segment.start, segment.control, segment.end
+                control = (s, s + (c - s) * (2.0 / 3.0), e + (c - e) * (2.0 / 3.0), e)
+            elif isinstance(segment, Arc) and segment.sweep:
+                arc = (segment.rx, segment.ry, segment.get_start_t(), segment.sweep)
+            elif isinstance(segment, Linear) and segment.start is not None:
+                s, e = segment.start, segment.end
+                control = (
+                    s,
+                    Point.towards(s, e, 1.0 / 3.0),
+                    Point.towards(s, e, 2.0 / 3.0),
+                    e,
+                )
+            if control is not None:
+                control = [complex(p.x, p.y) for p in control]
+            self.control.append(control)
+            self.arcs.append(arc)
+        np = numeric_backend("numpy")
+        if np is not None:
+            self.lengths = self._partial_numpy(
+                np, np.arange(len(segments)), np.ones(len(segments))
+            )
+            self.ends = np.cumsum(self.lengths)
+            self.length = float(self.ends[-1]) if len(self.ends) else 0.0
+        else:
+            self.lengths = [self._partial(i, 1.0) for i in range(len(segments))]
+            self.ends = list()
+            total = 0.0
+            for length in self.lengths:
+                total += length
+                self.ends.append(total)
+            self.length = total
+        # The end of the segments is the last segment with any length, not on trailing moves.
+        self.end_segment = 0
+        for index in range(len(self.lengths) - 1, -1, -1):
+            if self.lengths[index] > 0:
+                self.end_segment = index
+                break
+
+    def _partial(self, index, t):
+        """Length of the segment at index from its start to t."""
+        control = self.control[index]
+        if control is not None:
+            if isinstance(self.segments[index], Linear):
+                return abs(control[3] - control[0]) * t
+            return bezier_length(self.segments[index], 0.0, t, self.error)[0]
+        arc = self.arcs[index]
+        if arc is not None:
+            rx, ry, start_t, sweep = arc
+            return elliptic_arc_length(rx, ry, start_t, sweep * t)
+        return 0.0
+
+    def _partial_numpy(self, np, index, t):
+        """Lengths of the segments at index from their starts to t, with numpy."""
+        lengths = np.zeros(len(index))
+        curve = np.array([self.control[i] is not None for i in index], dtype=bool)
+        if np.any(curve):
+            c = np.array([self.control[i] for i in index[curve]], dtype=complex)
+            u = t[curve]
+            # The part of each curve up to t, from de Casteljau's algorithm.
+            a = c[:, 0] + (c[:, 1] - c[:, 0]) * u
+            b = c[:, 1] + (c[:, 2] - c[:, 1]) * u
+            d = a + (b - a) * u
+            e = b + (c[:, 2] + (c[:, 3] - c[:, 2]) * u - b) * u
+            part = np.stack((c[:, 0], a, d, d + (e - d) * u), axis=1)
+            lengths[curve] = bezier_lengths(
+                np.stack((part.real, part.imag), axis=2), self.error
+            )[0]
+        arc = np.array([self.arcs[i] is not None for i in index], dtype=bool)
+        if np.any(arc):
+            arcs = np.array([self.arcs[i] for i in index[arc]], dtype=float)
+            arcs[:, 3] *= t[arc]
+            lengths[arc] = elliptic_arc_lengths(arcs)
+        return lengths
+
+    def _locate(self, distance):
+        """The segment index and the distance from the start of that segment."""
+        if distance >= self.length:
+            index = self.end_segment
+        else:
+            index = min(bisect_left(self.ends, distance), len(self.lengths) - 1)
+        return index, distance - (self.ends[index] - self.lengths[index])
+
+    def point(self, distance):
+        """
+        Returns the Point at the distance along the segments.
+        """
+        if not len(self.lengths):
+            return None
+        distance = min(max(distance, 0.0), self.length)
+        index, remainder = self._locate(distance)
+        length = self.lengths[index]
+        segment = self.segments[index]
+        if length <= 0:
+            return Point(segment.end)
+        if remainder >= length:
+            return Point(segment.end)
+        lo, hi = 0.0, 1.0
+        f_lo, f_hi = -remainder, length - remainder
+        side = 0
+        for _ in range(self.ITERATIONS):
+            t = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+            f = self._partial(index, t) - remainder
+            if abs(f) <= self.error or hi - lo <= 1e-15:
+                break
+            if f < 0:
+                lo, f_lo = t, f
+                if side < 0:
+                    f_hi /= 2.0
+                side = -1
+            else:
+                hi, f_hi = t, f
+                if side > 0:
+                    f_lo /= 2.0
+                side = 1
+        return Point(segment.point(t))
+
+    def npoint(self, distances):
+        """
+        Returns the points at the distances along the segments, an array of shape (N, 2) with numpy.
+        """
+        np = numeric_backend("numpy")
+        if np is None:
+            return [self.point(distance) for distance in distances]
+        distances = np.clip(np.asarray(distances, dtype=float), 0.0, self.length)
+        xy = np.empty((len(distances), 2), dtype=float)
+        if not len(self.lengths):
+            xy[:] = np.nan
+            return xy
+        index = np.minimum(
+            np.searchsorted(self.ends, distances, side="left"), len(self.lengths) - 1
+        )
+        index[distances >= self.length] = self.end_segment
+        length = self.lengths[index]
+        remainder = distances - (self.ends[index] - length)
+        t = np.ones(len(distances))
+        active = np.flatnonzero((length > 0) & (remainder < length))
+        lo = np.zeros(len(active))
+        hi = np.ones(len(active))
+        f_lo = -remainder[active]
+        f_hi = length[active] - remainder[active]
+        side = np.zeros(len(active))
+        for _ in range(self.ITERATIONS):
+            if not len(active):
+                break
+            guess = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+            t[active] = guess
+            f = self._partial_numpy(np, index[active], guess) - remainder[active]
+            keep = (np.abs(f) > self.error) & (hi - lo > 1e-15)
+            below = f < 0
+            f_hi = np.where(below & (side < 0), f_hi / 2.0, f_hi)
+            f_lo = np.where(~below & (side > 0), f_lo / 2.0, f_lo)
+            lo = np.where(below, guess, lo)
+            f_lo = np.where(below, f, f_lo)
+            hi = np.where(below, hi, guess)
+            f_hi = np.where(below, f_hi, f)
+            side = np.where(below, -1, 1)
+            active, lo, hi, f_lo, f_hi, side = (
+                active[keep],
+                lo[keep],
+                hi[keep],
+                f_lo[keep],
+                f_hi[keep],
+                side[keep],
+            )
+        moving = length > 0
+        xy[moving] = _segments_npoint(self.segments, index[moving], t[moving])
+        for i in np.flatnonzero(~moving):
+            xy[i] = list(self.segments[index[i]].end)
+        return xy
+
+
 class Path(Shape, MutableSequence):
     """
     A Path is a Mutable sequence of path segments
@@ -5462,13 +6391,20 @@ class Path(Shape, MutableSequence):
     Path("d-string", keywords)
     Path(pathsegment1,...)
     Path(d="d-string", other keywords)
+
+    With lazy=True a "d" value is scanned and checked, but its segments are built on first access.
     """
 
     def __init__(self, *args, **kwargs):
+        lazy = kwargs.pop("lazy", False)
         Shape.__init__(self, *args, **kwargs)
         self._length = None
         self._lengths = None
         self._segments = list()
+        self._segments_transformed = None
+        self._segments_transformed_key = None
+        self._length_table = None
+        self._length_table_key = None
         if len(args) != 1:
             for segment in args:
                 if not isinstance(segment, PathSegment):
@@ -5501,9 +6437,30 @@ class Path(Shape, MutableSequence):
             # Not sure what the purpose of pathd_loaded is.
             # It is only set and checked here and you cannot have "d" attribute more than once anyway
             if not self.values.get("pathd_loaded", False):
-                self.parse(self.values[SVG_ATTR_DATA])
+                if lazy and len(self._segments) == 0:
+                    # The d string is scanned and checked now, so malformed data fails here as it does when not
+                    # lazy. Building the segments waits, along with the matrices of any reify before then.
+                    commands = SVGLexicalParser.tokenize(self.values[SVG_ATTR_DATA])
+                    Path._check_commands(commands)
+                    del self._segments
+                    self._pending = (commands, [])
+                else:
+                    self.parse(self.values[SVG_ATTR_DATA])
                 self.values["pathd_loaded"] = True
 
+    def __getattr__(self, name):
+        # Only called when the attribute is missing, the segments of a lazy path are parsed on first access.
+        if name == "_segments":
+            pending = self.__dict__.pop("_pending", None)
+            if pending is not None:
+                commands, matrices = pending
+                self._segments = list()
+                self.append_commands(commands)
+                for matrix in matrices:
+                    Path._transform_segments(self._segments, matrix)
+                return self._segments
+        raise AttributeError(name)
+
     def __copy__(self):
         path = Path(self)
         segs = path._segments
@@ -5589,6 +6546,8 @@ class Path(Shape, MutableSequence):
         self._segments[index] = new_element
         self._length = None
         self._lengths = None
+        self._length_table = None
+        self.invalidate()
         if isinstance(index, slice):
             self.validate_connections()
         else:
@@ -5603,6 +6562,8 @@ class Path(Shape, MutableSequence):
         original_element = self._segments[index]
         del self._segments[index]
         self._length = None
+        self._length_table = None
+        self.invalidate()
         if isinstance(index, slice):
             self.validate_connections()
         else:
@@ -5679,8 +6640,220 @@ class Path(Shape, MutableSequence):
 
     def parse(self, pathdef):
         """Parses the SVG path."""
-        tokens = SVGLexicalParser()
-        tokens.parse(self, pathdef)
+        self.append_commands(SVGLexicalParser.tokenize(pathdef))
+
+    @classmethod
+    def from_commands(cls, commands, **kwargs):
+        """
+        Builds a path from (command, values) tuples as given by SVGLexicalParser.tokenize().
+
+        Path.from_commands([("M", [0, 0]), ("l", [10, 0, 0, 10]), ("z", [])])
+        """
+        path = cls(**kwargs)
+        path.append_commands(commands)
+        return path
+
+    @staticmethod
+    def _command_extent(cmd, count, inline_close):
+        """
+        Returns the number of values in each group of an upper case command other than Z, H or V, and how many of
+        its count values are grouped, -1 for a lone group with no values. Raises ValueError if the values do not fit
+        the command.
+        """
+        if cmd == "M" or cmd == "L" or cmd == "T":
+            step = 2
+            if cmd == "M" and not count:
+                raise ValueError
+        elif cmd == "C":
+            step = 6
+        elif cmd == "Q" or cmd == "S":
+            step = 4
+        else:  # "A"
+            step = 7
+        full = count - count % step
+        if cmd == "A":
+            if count - full == 5 and inline_close:
+                full = count  # The last arc ends at an inline close.
+            elif count != full:
+                raise ValueError
+        elif count != full or not count:
+            if cmd == "M" or count % 2 or not inline_close:
+                raise ValueError
+            # The last group ends at an inline close, -1 marks a lone group with no values.
+            full = count if count else -1
+        return step, full
+
+    @staticmethod
+    def _check_commands(commands):
+        """
+        Raises ValueError for the (command, values) tuples which append_commands() would reject, without building
+        any segments.
+        """
+        segments = 0
+        unknown = None
+        last = len(commands) - 1
+        for index, (cmd, values) in enumerate(commands):
+            count = len(values)
+            relative = cmd.islower()
+            cmd = cmd.upper()
+            if cmd == "Z":
+                if count:
+                    raise ValueError
+                segments += 1
+            elif cmd == "H" or cmd == "V":
+                if not count and relative:
+                    raise ValueError
+                if not count and cmd == "H":
+                    if unknown is None:
+                        unknown = segments
+                    segments += 1
+                segments += count
+            else:
+                next_cmd = commands[index + 1][0] if index < last else None
+                step, full = Path._command_extent(
+                    cmd, count, next_cmd == "z" or next_cmd == "Z"
+                )
+                segments += 1 if full < 0 else (full + step - 1) // step
+        if unknown is not None and unknown + 1 < segments:
+            raise ValueError  # Nothing can follow a point with an unknown x.
+
+    def append_commands(self, commands):
+        """
+        Appends (command, values) tuples to the path in bulk.
+
+        This gives the same segments as calling move(), line(), etc. for each command. But, the current,
+        smooth and z points are tracked as floats rather than found from the segments each time, and the
+        connections are validated once at the end rather than for each appended segment.
+        """
+        segments = list()
+        current = self.current_point
+        cx, cy = (current.x, current.y) if current is not None else (None, None)
+        zx = zy = None
+        moved = False
+        for segment in reversed(self._segments):
+            if isinstance(segment, Move):
+                moved = True
+                if segment.end is not None:
+                    zx, zy = segment.end.x, segment.end.y
+                break
+        if not moved and len(self._segments) and self._segments[0].end is not None:
+            zx, zy = self._segments[0].end.x, self._segments[0].end.y
+        first = len(self._segments) == 0
+        # Smooth commands use the previous curve's control point reflected across the current point.
+        smooth = self.smooth_point
+        kx, ky = (smooth.x, smooth.y) if smooth is not None else (None, None)
+        unknown = None
+
+        for index, (cmd, values) in enumerate(commands):
+            inline_close = False
+            if index + 1 < len(commands):
+                next_cmd = commands[index + 1][0]
+                inline_close = next_cmd == "z" or next_cmd == "Z"
+            count = len(values)
+            relative = cmd.islower()
+            cmd = cmd.upper()
+            if cmd == "Z":
+                if count:
+                    raise ValueError
+                segment = Close(None, None, relative=relative)
+                segment.start = Point(cx, cy) if cx is not None else None
+                segment.end = Point(zx, zy) if zx is not None else None
+                segments.append(segment)
+                cx, cy = kx, ky = zx, zy
+                continue
+            if cmd == "H" or cmd == "V":
+                if not count and relative:
+                    raise ValueError
+                if not count and cmd == "H":
+                    # A trailing H with no value has always given a line to an unknown x.
+                    values = [None]
+                    if unknown is None:
+                        unknown = len(segments)
+                for value in values:
+                    segment = Line(None, None, relative=relative)
+                    segment.start = Point(cx, cy)
+                    if cmd == "H":
+                        cx = cx + value if relative else value
+                    else:
+                        cy = cy + value if relative else value
+                    segment.end = Point(cx, cy)
+                    segments.append(segment)
+                kx, ky = cx, cy
+                continue
+            step, full = Path._command_extent(cmd, count, inline_close)
+            pos = 0
+            while pos < full or full < 0:
+                # Each group is a run of coordinates, any missing ones are the inline close.
+                points = list()
+                end_index = (pos + 7) if cmd == "A" else (pos + step)
+                for i in range(pos + 5 if cmd == "A" else pos, end_index, 2):
+                    if i < count:
+                        x, y = values[i], values[i + 1]
+                        if relative and cx is not None:
+                            x += cx
+                            y += cy
+                        points.append(Point(x, y))
+                    else:
+                        points.append(Point(zx, zy) if zx is not None else None)
+                start = Point(cx, cy) if cx is not None else None
+                end = points[-1]
+                control = None
+                if cmd == "M" and pos == 0:
+                    segment = Move(None, None, relative=relative)
+                    segment.start = start
+                    segment.end = end
+                    moved = True
+                    zx, zy = (end.x, end.y)
+                elif cmd == "M" or cmd == "L":
+                    segment = Line(None, None, relative=relative)
+                    segment.start = start
+                    segment.end = end
+                elif cmd == "T" or cmd == "Q":
+                    segment = QuadraticBezier(
+                        None, None, None, relative=relative, smooth=cmd == "T"
+                    )
+                    segment.start = start
+                    if cmd == "T":
+                        segment.control = Point(kx, ky) if kx is not None else None
+                    else:
+                        segment.control = points[0]
+                    segment.end = end
+                    control = segment.control
+                elif cmd == "C" or cmd == "S":
+                    segment = CubicBezier(
+                        None, None, None, None, relative=relative, smooth=cmd == "S"
+                    )
+                    segment.start = start
+                    if cmd == "S":
+                        segment.control1 = Point(kx, ky) if kx is not None else None
+                    else:
+                        segment.control1 = points[0]
+                    if segment.control1 is not None:
+                        segment.control2 = points[-2]
+                    segment.end = end
+                    control = segment.control2
+                else:
+                    rx, ry, rotation, arc, sweep = values[pos : pos + 5]
+                    segment = Arc(
+                        start, abs(rx), abs(ry), rotation, arc, sweep, end,
+                        relative=relative,
+                    )
+                    end = segment.end
+                segments.append(segment)
+                if first and not moved and len(segments) == 1:
+                    zx, zy = (end.x, end.y) if end is not None else (None, None)
+                cx, cy = (end.x, end.y) if end is not None else (None, None)
+                if control is not None and cx is not None:
+                    kx, ky = cx + (cx - control.x), cy + (cy - control.y)
+                else:
+                    kx, ky = cx, cy
+                pos += step
+                if full < 0:
+                    break
+        if unknown is not None and unknown + 1 < len(segments):
+            raise ValueError  # Nothing can follow a point with an unknown x.
+        self.extend(segments)
+        return self
 
     def validate_connections(self):
         """
@@ -5980,8 +7153,10 @@ class Path(Shape, MutableSequence):
                 return
             value = value[0]
         self._length = None
+        self._length_table = None
         index = len(self._segments) - 1
         self._segments.append(value)
+        self.invalidate()
         self._validate_connection(index)
         if isinstance(value, Close):
             self._validate_close(index + 1)
@@ -5993,7 +7168,9 @@ class Path(Shape, MutableSequence):
                 return
             value = value[0]
         self._length = None
+        self._length_table = None
         self._segments.insert(index, value)
+        self.invalidate()
         self._validate_connection(index - 1)
         self._validate_connection(index)
         if isinstance(value, Move):
@@ -6005,8 +7182,10 @@ class Path(Shape, MutableSequence):
         if isinstance(iterable, str):
             iterable = Path(iterable)
         self._length = None
+        self._length_table = None
         index = len(self._segments) - 1
         self._segments.extend(iterable)
+        self.invalidate()
         self._validate_connection(index)
         self._validate_subpath(index)
 
@@ -6047,6 +7226,8 @@ class Path(Shape, MutableSequence):
             p += subpath
         self._segments = p._segments
         self._segments[0].start = prepoint
+        self._length_table = None
+        self.invalidate()
         return self
 
     def _subpath_indices(self):
@@ -6099,17 +7280,73 @@ class Path(Shape, MutableSequence):
 
     def reify(self):
         """
-        Realizes the transform to the shape properties.
+        Realizes the transform to the shape properties.
+
+        Path objects reify perfectly.
+        """
+        GraphicObject.reify(self)
+        Transformable.reify(self)
+        if isinstance(self.transform, Matrix):
+            if "_pending" in self.__dict__:
+                self._pending[1].append(Matrix(self.transform))
+            else:
+                Path._transform_segments(self._segments, self.transform)
+        self.transform.reset()
+        self._length_table = None
+        return self
+
+    @staticmethod
+    def _segment_points(segment):
+        """
+        The points of a segment of the known kinds, some may be None. Returns None for any other kind of segment.
+        """
+        if isinstance(segment, CubicBezier):
+            return segment.start, segment.control1, segment.control2, segment.end
+        elif isinstance(segment, QuadraticBezier):
+            return segment.start, segment.control, segment.end
+        elif isinstance(segment, Arc):
+            return segment.start, segment.center, segment.end, segment.prx, segment.pry
+        elif isinstance(segment, (Move, Linear)):
+            return segment.start, segment.end
+        return None
+
+    @staticmethod
+    def _transform_segments(segments, matrix):
+        """
+        Applies the matrix to the segments in place, the same as `segment *= matrix` for each of them.
 
-        Path objects reify perfectly.
+        The points of all the segments are gathered and transformed together, with numpy when it's available,
+        and the results are written back into the existing Point objects.
         """
-        GraphicObject.reify(self)
-        Transformable.reify(self)
-        if isinstance(self.transform, Matrix):
-            for e in self._segments:
-                e *= self.transform
-        self.transform.reset()
-        return self
+        points = list()
+        flip = (matrix.value_scale_x() < 0) != (matrix.value_scale_y() < 0)
+        for segment in segments:
+            candidates = Path._segment_points(segment)
+            if candidates is None:
+                segment *= matrix
+                continue
+            if isinstance(segment, Arc):
+                if flip and segment.sweep is not None:
+                    segment.sweep = -segment.sweep
+                segment.invalidate()
+            points.extend([p for p in candidates if p is not None])
+        a, b, c, d, e, f = matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f
+        np = numeric_backend("numpy")
+        if np is None:
+            for p in points:
+                x = p.x
+                y = p.y
+                p.x = x * a + y * c + 1 * e
+                p.y = x * b + y * d + 1 * f
+            return
+        count = len(points)
+        x = np.fromiter((p.x for p in points), dtype=float, count=count)
+        y = np.fromiter((p.y for p in points), dtype=float, count=count)
+        for p, px, py in zip(
+            points, (x * a + y * c + e).tolist(), (x * b + y * d + f).tolist()
+        ):
+            p.x = px
+            p.y = py
 
     @staticmethod
     def svg_d(segments, relative=None, smooth=None):
@@ -6167,40 +7404,592 @@ class Path(Shape, MutableSequence):
         return " ".join(parts)
 
     def d(self, relative=None, transformed=True, smooth=None):
-        path = self
+        return Path.svg_d(
+            self._shared_segments(transformed), relative=relative, smooth=smooth
+        )
+
+    def _geometry_key(self, transformed=True):
+        """
+        The values of every point of the path, and of the transform if transformed. This is unchanged as long as the
+        geometry is, including when segments or their points are altered in place.
+        """
+        key = list()
         if transformed:
-            path = abs(path)
-        return Path.svg_d(path._segments, relative=relative, smooth=smooth)
+            matrix = self.transform
+            key.extend((matrix.a, matrix.b, matrix.c, matrix.d, matrix.e, matrix.f))
+        for segment in self._segments:
+            key.append(segment.__class__)
+            points = Path._segment_points(segment)
+            if points is None:
+                points = list(segment)
+            for p in points:
+                if p is None:
+                    key.append(None)
+                else:
+                    key.append(p.x)
+                    key.append(p.y)
+            if isinstance(segment, Arc):
+                key.append(segment.sweep)
+        return key
+
+    def _arc_length_table(self, transformed=True):
+        key = self._geometry_key(transformed)
+        if self._length_table is None or self._length_table_key != key:
+            self._length_table = _ArcLengthTable(self._shared_segments(transformed, key))
+            self._length_table_key = key
+        return self._length_table
+
+    def point_at_length(self, length, transformed=True):
+        """
+        Returns the Point at the given distance along the path.
+
+        The distance is measured along the curves. The lookup table is kept while the geometry of the path is
+        unchanged, checking that is a pass over its points so sample_uniform() is preferred for many points.
+        """
+        return self._arc_length_table(transformed).point(length)
+
+    def sample_uniform(self, n, transformed=True):
+        """
+        Returns n points equally spaced along the path, from its start to its end.
+
+        With numpy these are an array of shape (n, 2), otherwise a list of Points.
+        """
+        table = self._arc_length_table(transformed)
+        if n <= 1:
+            return table.npoint([0.0] * n)
+        step = table.length / (n - 1)
+        return table.npoint([i * step for i in range(n)])
+
+    def _shared_segments(self, transformed=True, key=None):
+        """
+        Returns the segments of the path without copying them. These must not be altered.
+
+        The transformed segments are transformed together in one batch and cached with the geometry key, so edits to
+        the transform, the segment list or the points of a segment are all seen.
+        """
+        if not transformed or self.transform.is_identity():
+            return self._segments
+        if key is None:
+            key = self._geometry_key(True)
+        if self._segments_transformed is None or self._segments_transformed_key != key:
+            segments = [copy(s) for s in self._segments]
+            Path._transform_segments(segments, self.transform)
+            self._segments_transformed = segments
+            self._segments_transformed_key = key
+        return self._segments_transformed
 
     def segments(self, transformed=True):
+        """
+        Returns the segments of the path.
+
+        The transformed segments are copies of the cached transformed segments, so altering them does not alter the
+        path or the cache.
+        """
         if transformed and not self.transform.is_identity():
-            return [s * self.transform for s in self._segments]
+            return [copy(s) for s in self._shared_segments(True)]
         return self._segments
 
-    def approximate_arcs_with_cubics(self, error=0.1):
+    def approximate_arcs_with_cubics(self, error=0.1, tolerance=None):
         """
         Iterates through this path and replaces any Arcs with cubic bezier curves.
+
+        Each arc is split into slices of at most tau * error radians. If a tolerance is given the slices are instead
+        chosen so each curve stays within that distance of its arc, and the maximum deviation found is returned.
         """
-        sweep_limit = tau * error
-        for s in range(len(self) - 1, -1, -1):
-            segment = self[s]
-            if isinstance(segment, Arc):
-                arc_required = int(ceil(abs(segment.sweep) / sweep_limit))
-                self[s : s + 1] = list(segment.as_cubic_curves(arc_required))
+        return self._approximate_arcs(3, error, tolerance)
 
-    def approximate_arcs_with_quads(self, error=0.1):
+    def approximate_arcs_with_quads(self, error=0.1, tolerance=None):
         """
         Iterates through this path and replaces any Arcs with quadratic bezier curves.
+
+        Each arc is split into slices of at most tau * error radians. If a tolerance is given the slices are instead
+        chosen so each curve stays within that distance of its arc, and the maximum deviation found is returned.
+        """
+        return self._approximate_arcs(2, error, tolerance)
+
+    def _approximate_arcs(self, degree, error, tolerance):
+        """
+        Rebuilds the segment list in one pass, replacing arcs with bezier curves of the given degree, and validates the
+        connections once.
         """
-        sweep_limit = tau * error
-        for s in range(len(self) - 1, -1, -1):
-            segment = self[s]
+        arcs = [segment for segment in self._segments if isinstance(segment, Arc)]
+        if not arcs:
+            return None if tolerance is None else 0.0
+        if tolerance is None:
+            sweep_limit = tau * error
+        else:
+            # Slices beyond a quarter turn are poorly approximated, start from there.
+            sweep_limit = tau / 4.0
+        counts = [int(ceil(abs(arc.sweep) / sweep_limit)) for arc in arcs]
+        np = numeric_backend("numpy")
+        if np is not None:
+            points = arc_beziers(arcs, counts, degree)
+            if tolerance is not None:
+                # Bezier errors shrink with the slice angle to the power of 2 * degree.
+                counts = np.asarray(counts)
+                while True:
+                    deviations = arc_bezier_deviations(arcs, counts, points)
+                    over = deviations > tolerance
+                    if not np.any(over):
+                        break
+                    scale = (deviations[over] / tolerance) ** (1.0 / (2 * degree))
+                    counts[over] = np.maximum(
+                        counts[over] + 1, np.ceil(counts[over] * scale).astype(int)
+                    )
+                    points = arc_beziers(arcs, counts, degree)
+            points = points.tolist()
+            curve_type = CubicBezier if degree == 3 else QuadraticBezier
+            curves = []
+            p = 0
+            for count in counts:
+                curves.append([curve_type(*q) for q in points[p : p + int(count)]])
+                p += int(count)
+        else:
+            curves = []
+            deviations = []
+            for arc, count in zip(arcs, counts):
+                while True:
+                    if degree == 3:
+                        approximation = list(arc.as_cubic_curves(count))
+                    else:
+                        approximation = list(arc.as_quad_curves(count))
+                    if tolerance is None:
+                        break
+                    deviation = arc.bezier_deviation(approximation)
+                    if deviation <= tolerance:
+                        deviations.append(deviation)
+                        break
+                    scale = (deviation / tolerance) ** (1.0 / (2 * degree))
+                    count = max(count + 1, int(ceil(count * scale)))
+                curves.append(approximation)
+        segments = []
+        arc_index = 0
+        for segment in self._segments:
             if isinstance(segment, Arc):
-                arc_required = int(ceil(abs(segment.sweep) / sweep_limit))
-                self[s : s + 1] = list(segment.as_quad_curves(arc_required))
+                segments.extend(curves[arc_index])
+                arc_index += 1
+            else:
+                segments.append(segment)
+        self._segments = segments
+        self._length = None
+        self._lengths = None
+        self._length_table = None
+        self.validate_connections()
+        if tolerance is None:
+            return None
+        return float(max(deviations)) if len(deviations) else 0.0
+
+
+class PathArray:
+    """
+    PathArray is a compact NumPy backed form of a Path, meant for very large paths.
+
+    Rather than a PathSegment object with its own Points for every segment, the segment kinds are stored in
+    a uint8 array and the points in one float64 (N, 8) array of start, control1, control2 and end. Arcs
+    keep their center and prx in the control columns, their pry and sweep are in a small (A, 3) array with
+    one row for each arc. Missing points, like the start of the first Move, are NaN.
+
+    Segments are only built when they are indexed. d(), bbox() and npoint() work on the arrays directly, and
+    multiplying by a Matrix is one operation over all the points.
+
+    The arrays are those of numeric_backend("numpy"), and an ImportError is raised if it is not available.
+
+    PathArray("d-string")
+    PathArray(path)
+    PathArray(segment1, ...)
+    PathArray(kinds, points, arcs)
+    """
+
+    MOVE = 0
+    LINE = 1
+    CLOSE = 2
+    QUAD = 3
+    CUBIC = 4
+    ARC = 5
+
+    FLAG_RELATIVE = 1
+    FLAG_SMOOTH = 2
+
+    @staticmethod
+    def _numpy():
+        np = numeric_backend("numpy")
+        if np is None:
+            raise ImportError("PathArray requires numpy.")
+        return np
+
+    def __init__(self, *args):
+        np = PathArray._numpy()
+
+        self._lengths = None
+        self._arc_rows = None
+        if len(args) == 3 and not isinstance(args[0], (str, PathSegment)):
+            kinds, points, arcs = args
+            self.kinds = np.asarray(kinds, dtype=np.uint8)
+            self.points = np.asarray(points, dtype=float).reshape((-1, 8))
+            self.arcs = np.asarray(arcs, dtype=float).reshape((-1, 3))
+            self.flags = np.zeros(len(self.kinds), dtype=np.uint8)
+            return
+        if len(args) == 1 and isinstance(args[0], PathArray):
+            s = args[0]
+            self.kinds = s.kinds.copy()
+            self.flags = s.flags.copy()
+            self.points = s.points.copy()
+            self.arcs = s.arcs.copy()
+            return
+        if len(args) == 1 and isinstance(args[0], str):
+            segments = Path(args[0])
+        elif len(args) == 1 and isinstance(args[0], Shape):
+            segments = args[0].segments(transformed=True)
+        else:
+            segments = args
+        self._from_segments(segments)
+
+    def _from_segments(self, segments):
+        np = PathArray._numpy()
+
+        count = len(segments)
+        self.kinds = np.empty(count, dtype=np.uint8)
+        self.flags = np.zeros(count, dtype=np.uint8)
+        self.points = np.full((count, 8), np.nan)
+        arcs = list()
+        for i, segment in enumerate(segments):
+            if isinstance(segment, Move):
+                kind = PathArray.MOVE
+                row = (segment.start, None, None, segment.end)
+            elif isinstance(segment, Close):
+                kind = PathArray.CLOSE
+                row = (segment.start, None, None, segment.end)
+            elif isinstance(segment, Line):
+                kind = PathArray.LINE
+                row = (segment.start, None, None, segment.end)
+            elif isinstance(segment, QuadraticBezier):
+                kind = PathArray.QUAD
+                row = (segment.start, segment.control, None, segment.end)
+            elif isinstance(segment, CubicBezier):
+                kind = PathArray.CUBIC
+                row = (segment.start, segment.control1, segment.control2, segment.end)
+            elif isinstance(segment, Arc):
+                kind = PathArray.ARC
+                row = (segment.start, segment.center, segment.prx, segment.end)
+                arcs.append((segment.pry.x, segment.pry.y, segment.sweep))
+            else:
+                raise ValueError(
+                    "Object not PathSegment when instantiating a PathArray: %s"
+                    % segment.__class__.__name__
+                )
+            self.kinds[i] = kind
+            if segment.relative:
+                self.flags[i] |= PathArray.FLAG_RELATIVE
+            if segment.smooth:
+                self.flags[i] |= PathArray.FLAG_SMOOTH
+            for j, point in enumerate(row):
+                if point is not None:
+                    self.points[i, 2 * j] = point[0]
+                    self.points[i, 2 * j + 1] = point[1]
+        self.arcs = np.array(arcs, dtype=float).reshape((-1, 3))
+
+    def __copy__(self):
+        return PathArray(self)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self._segment(i)
+
+    def __getitem__(self, index):
+        np = PathArray._numpy()
+
+        if isinstance(index, slice):
+            arc_ids = np.cumsum(self.kinds == PathArray.ARC) - 1
+            kinds = self.kinds[index]
+            path = PathArray(
+                kinds,
+                self.points[index],
+                self.arcs[arc_ids[index][kinds == PathArray.ARC]],
+            )
+            path.flags = self.flags[index].copy()
+            return path
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError
+        return self._segment(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (Path, str)):
+            return Path(list(self)) == other
+        if not isinstance(other, PathArray):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __str__(self):
+        return self.d()
+
+    def __repr__(self):
+        return "PathArray('%s')" % self.d()
+
+    def __imul__(self, other):
+        np = PathArray._numpy()
+
+        if isinstance(other, str):
+            other = Matrix(other)
+        if isinstance(other, Matrix):
+            affine = np.array(
+                [[other.a, other.b], [other.c, other.d]], dtype=float
+            )
+            offset = np.array([other.e, other.f], dtype=float)
+            points = self.points.reshape((-1, 2))
+            points[:] = points @ affine + offset
+            if len(self.arcs):
+                self.arcs[:, 0:2] = self.arcs[:, 0:2] @ affine + offset
+                if other.value_scale_x() < 0:
+                    self.arcs[:, 2] = -self.arcs[:, 2]
+                if other.value_scale_y() < 0:
+                    self.arcs[:, 2] = -self.arcs[:, 2]
+            self._lengths = None
+        return self
+
+    def __mul__(self, other):
+        if isinstance(other, (Matrix, str)):
+            n = copy(self)
+            n *= other
+            return n
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def _arc_index(self, index):
+        np = PathArray._numpy()
+
+        if self._arc_rows is None:
+            self._arc_rows = np.flatnonzero(self.kinds == PathArray.ARC)
+        return int(np.searchsorted(self._arc_rows, index))
+
+    def _segment(self, index):
+        kind = self.kinds[index]
+        row = self.points[index].tolist()
+        points = [
+            Point(row[j], row[j + 1]) if row[j] == row[j] else None
+            for j in range(0, 8, 2)
+        ]
+        start, control1, control2, end = points
+        flags = int(self.flags[index])
+        relative = bool(flags & PathArray.FLAG_RELATIVE)
+        smooth = bool(flags & PathArray.FLAG_SMOOTH)
+        if kind == PathArray.MOVE:
+            segment = Move(start, end, relative=relative)
+        elif kind == PathArray.LINE:
+            segment = Line(start, end, relative=relative)
+        elif kind == PathArray.CLOSE:
+            segment = Close(start, end, relative=relative)
+        elif kind == PathArray.QUAD:
+            segment = QuadraticBezier(
+                start, control1, end, relative=relative, smooth=smooth
+            )
+        elif kind == PathArray.CUBIC:
+            segment = CubicBezier(
+                start, control1, control2, end, relative=relative, smooth=smooth
+            )
+        else:
+            pry_x, pry_y, sweep = self.arcs[self._arc_index(index)].tolist()
+            segment = Arc(
+                start, end, control1, control2, Point(pry_x, pry_y), sweep,
+                relative=relative,
+            )
+        return segment
+
+    def as_path(self):
+        """Returns a regular Path of PathSegment objects."""
+        return Path(list(self))
+
+    def d(self, relative=None, smooth=None):
+        return Path.svg_d(self, relative=relative, smooth=smooth)
+
+    def bbox(self):
+        """
+        Get the bounding box of the path. Lines and beziers are bounded over the arrays, arcs are bounded one
+        at a time.
+        """
+        np = PathArray._numpy()
+
+        if len(self.kinds) == 0:
+            return None
+        kinds = self.kinds
+        points = self.points
+        # Every end point is within the bounds, and the start points of everything but moves.
+        xs = [points[:, 6], points[kinds != PathArray.MOVE, 0]]
+        ys = [points[:, 7], points[kinds != PathArray.MOVE, 1]]
+
+        curves = points[(kinds == PathArray.QUAD) | (kinds == PathArray.CUBIC)]
+        if len(curves):
+            cubics = curves.copy()
+            is_quad = kinds[(kinds == PathArray.QUAD) | (kinds == PathArray.CUBIC)] == PathArray.QUAD
+            # Degree elevate the quads so all curves are solved as cubics.
+            quads = cubics[is_quad]
+            control1 = quads[:, 0:2] + 2.0 / 3.0 * (quads[:, 2:4] - quads[:, 0:2])
+            control2 = quads[:, 6:8] + 2.0 / 3.0 * (quads[:, 2:4] - quads[:, 6:8])
+            cubics[is_quad, 2:4] = control1
+            cubics[is_quad, 4:6] = control2
+            for axis, values in ((0, xs), (1, ys)):
+                p0 = cubics[:, axis]
+                p1 = cubics[:, 2 + axis]
+                p2 = cubics[:, 4 + axis]
+                p3 = cubics[:, 6 + axis]
+                # Derivative roots of the cubic, a*t^2 + b*t + c = 0.
+                a = -p0 + 3 * p1 - 3 * p2 + p3
+                b = 2 * (p0 - 2 * p1 + p2)
+                c = p1 - p0
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    disc = np.sqrt(b * b - 4 * a * c)
+                    linear = np.abs(a) < 1e-12
+                    roots = [
+                        np.where(linear, -c / b, (-b + disc) / (2 * a)),
+                        np.where(linear, np.nan, (-b - disc) / (2 * a)),
+                    ]
+                for t in roots:
+                    valid = (t > 0) & (t < 1)
+                    t = t[valid]
+                    n = 1 - t
+                    values.append(
+                        n * n * n * p0[valid]
+                        + 3 * n * n * t * p1[valid]
+                        + 3 * n * t * t * p2[valid]
+                        + t * t * t * p3[valid]
+                    )
+        for index in np.flatnonzero(kinds == PathArray.ARC):
+            xmin, ymin, xmax, ymax = self._segment(index).bbox()
+            xs.append(np.array([xmin, xmax]))
+            ys.append(np.array([ymin, ymax]))
+        xs = np.concatenate(xs)
+        ys = np.concatenate(ys)
+        return (
+            float(np.nanmin(xs)),
+            float(np.nanmin(ys)),
+            float(np.nanmax(xs)),
+            float(np.nanmax(ys)),
+        )
+
+    def _calc_lengths(self, error=ERROR, min_depth=MIN_DEPTH):
+        np = PathArray._numpy()
+
+        if self._lengths is not None:
+            return
+        kinds = self.kinds
+        points = self.points
+        lengths = np.hypot(points[:, 6] - points[:, 0], points[:, 7] - points[:, 1])
+        lengths[kinds == PathArray.MOVE] = 0.0
+        lengths[np.isnan(lengths)] = 0.0
+        cubics = np.flatnonzero(kinds == PathArray.CUBIC)
+        if len(cubics):
+            lengths[cubics] = bezier_lengths(
+                points[cubics].reshape((-1, 4, 2)), error=error
+            )[0]
+        arc_rows = np.flatnonzero(kinds == PathArray.ARC)
+        if len(arc_rows):
+            start = points[arc_rows, 0:2]
+            center = points[arc_rows, 2:4]
+            prx = points[arc_rows, 4:6] - center
+            pry = self.arcs[:, 0:2] - center
+            sweep = self.arcs[:, 2]
+            rx = np.hypot(prx[:, 0], prx[:, 1])
+            ry = np.hypot(pry[:, 0], pry[:, 1])
+            rotation = np.arctan2(prx[:, 1], prx[:, 0])
+            cos_r = np.cos(rotation)
+            sin_r = np.sin(rotation)
+            dx = start[:, 0] - center[:, 0]
+            dy = start[:, 1] - center[:, 1]
+            start_t = np.arctan2(
+                (dy * cos_r - dx * sin_r) * rx, (dx * cos_r + dy * sin_r) * ry
+            )
+            arc_lengths = np.asarray(
+                elliptic_arc_lengths(np.column_stack((rx, ry, start_t, sweep)))
+            )
+            circle = np.abs(rx - ry) < ERROR
+            arc_lengths[circle] = np.abs(rx[circle] * sweep[circle])
+            arc_lengths[sweep == 0] = 0.0
+            lengths[arc_rows] = arc_lengths
+        for index in np.flatnonzero(kinds == PathArray.QUAD):
+            lengths[index] = self._segment(index).length(
+                error=error, min_depth=min_depth
+            )
+        self._lengths = lengths
+
+    def length(self, error=ERROR, min_depth=MIN_DEPTH):
+        self._calc_lengths(error, min_depth)
+        return float(self._lengths.sum())
+
+    def npoint(self, positions, error=ERROR):
+        """
+        Find points between 0 and 1 within the path, as Shape.npoint() does.
+        """
+        np = PathArray._numpy()
+
+        if len(self.kinds) == 0:
+            return None
+        self._calc_lengths(error=error)
+        positions = np.asarray(positions, dtype=float)
+        xy = np.empty((len(positions), 2), dtype=float)
+        total = self._lengths.sum()
+        if total == 0:
+            index = np.round(positions * (len(self.kinds) - 1)).astype(int)
+            starts = self.points[index, 0:2]
+            xy[:] = np.where(np.isnan(starts), self.points[index, 6:8], starts)
+            return xy
+        ends = np.cumsum(self._lengths) / total
+        starts = ends - self._lengths / total
+        # Each position is on the first segment which ends after it.
+        index = np.minimum(
+            np.searchsorted(ends, positions, side="right"), len(self.kinds) - 1
+        )
+        span = ends[index] - starts[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(span > 0, (positions - starts[index]) / span, 0.0)
+        kinds = self.kinds[index]
+        rows = self.points[index]
+        p0 = rows[:, 0:2]
+        p3 = rows[:, 6:8]
+        tt = t[:, None]
+        n = 1 - tt
+        xy[:] = p0 + (p3 - p0) * tt
+        quad = kinds == PathArray.QUAD
+        if np.any(quad):
+            p1 = rows[quad, 2:4]
+            xy[quad] = (
+                n[quad] * n[quad] * p0[quad]
+                + 2 * n[quad] * tt[quad] * p1
+                + tt[quad] * tt[quad] * p3[quad]
+            )
+        cubic = kinds == PathArray.CUBIC
+        if np.any(cubic):
+            p1 = rows[cubic, 2:4]
+            p2 = rows[cubic, 4:6]
+            nc = n[cubic]
+            tc = tt[cubic]
+            xy[cubic] = (
+                nc * nc * nc * p0[cubic]
+                + 3 * nc * nc * tc * p1
+                + 3 * nc * tc * tc * p2
+                + tc * tc * tc * p3[cubic]
+            )
+        arc = kinds == PathArray.ARC
+        for segment_index in np.unique(index[arc]):
+            subset = index == segment_index
+            xy[subset] = self._segment(segment_index).npoint(t[subset])
+        # Positions at the very end, or on moves, sit on the segment end point.
+        at_end = (positions >= 1) | (kinds == PathArray.MOVE)
+        xy[at_end] = self.points[index[at_end], 6:8]
+        return xy
 
 
-class Rect(Shape):
+class Rect(_CachedShape):
     """
     SVG Rect shapes are defined in SVG2 10.2
     https://www.w3.org/TR/SVG2/shapes.html#RectElement
@@ -6217,6 +8006,13 @@ class Rect(Shape):
 
     """
 
+    x = _geometry_property("x")
+    y = _geometry_property("y")
+    width = _geometry_property("width")
+    height = _geometry_property("height")
+    rx = _geometry_property("rx")
+    ry = _geometry_property("ry")
+
     def __init__(self, *args, **kwargs):
         self.x = None
         self.y = None
@@ -6224,7 +8020,7 @@ class Rect(Shape):
         self.height = None
         self.rx = None
         self.ry = None
-        Shape.__init__(self, *args, **kwargs)
+        _CachedShape.__init__(self, *args, **kwargs)
         self._validate_rect()
 
     def property_by_object(self, s):
@@ -6380,7 +8176,7 @@ class Rect(Shape):
         origin *= self.transform
         return origin.distance_to(p)
 
-    def segments(self, transformed=True):
+    def _make_segments(self, transformed=True):
         """
         Rect decomposition is given in SVG 2.0 10.2
 
@@ -6535,13 +8331,18 @@ class Rect(Shape):
         )
 
 
-class _RoundShape(Shape):
+class _RoundShape(_CachedShape):
+    cx = _geometry_property("cx")
+    cy = _geometry_property("cy")
+    rx = _geometry_property("rx")
+    ry = _geometry_property("ry")
+
     def __init__(self, *args, **kwargs):
         self.cx = None
         self.cy = None
         self.rx = None
         self.ry = None
-        Shape.__init__(self, *args, **kwargs)
+        _CachedShape.__init__(self, *args, **kwargs)
 
     def property_by_object(self, s):
         Shape.property_by_object(self, s)
@@ -6644,7 +8445,7 @@ class _RoundShape(Shape):
         center *= self.transform
         return center
 
-    def segments(self, transformed=True):
+    def _make_segments(self, transformed=True):
         """
         SVG path decomposition is given in SVG 2.0 10.3, 10.4.
 
@@ -6658,38 +8459,45 @@ class _RoundShape(Shape):
         Path object d-attribute"""
         original = self.apply
         self.apply = transformed
-        path = Path()
-        steps = 4
-        step_size = tau / steps
-        if (
-            transformed
-            and self.transform.value_scale_x() * self.transform.value_scale_y() < 0
-        ):
-            step_size = -step_size
-        t_start = 0
-        t_end = step_size
-        # zero for either dimension, or a computed value of auto for both dimensions, disables rendering of the element.
-        rx = self.implicit_rx
-        ry = self.implicit_ry
-        if self.is_degenerate():
-            return ()
-        center = self.implicit_center
-        path.move((self.point_at_t(0)))
-        for i in range(steps):
-            path += Arc(
-                self.point_at_t(t_start),
-                self.point_at_t(t_end),
-                center,
-                rx=rx,
-                ry=ry,
-                rotation=self.rotation,
-                sweep=step_size,
-            )
-            t_start = t_end
-            t_end += step_size
-        path.closed()
-        self.apply = original
-        return path.segments(transformed)
+        try:
+            steps = 4
+            step_size = tau / steps
+            if (
+                transformed
+                and self.transform.value_scale_x() * self.transform.value_scale_y()
+                < 0
+            ):
+                step_size = -step_size
+            t_start = 0
+            t_end = step_size
+            # zero for either dimension, or a computed value of auto for both dimensions, disables rendering of the
+            # element.
+            rx = self.implicit_rx
+            ry = self.implicit_ry
+            if self.is_degenerate():
+                return ()
+            center = self.implicit_center
+            rotation = self.rotation
+            start = self.point_at_t(0)
+            segments = [Move(None, start)]
+            for i in range(steps):
+                segments.append(
+                    Arc(
+                        self.point_at_t(t_start),
+                        self.point_at_t(t_end),
+                        center,
+                        rx=rx,
+                        ry=ry,
+                        rotation=rotation,
+                        sweep=step_size,
+                    )
+                )
+                t_start = t_end
+                t_end += step_size
+            segments.append(Close(segments[-1].end, start))
+            return segments
+        finally:
+            self.apply = original
 
     def reify(self):
         """
@@ -7082,12 +8890,18 @@ class SimpleLine(Shape):
         return self
 
 
-class _Polyshape(Shape):
-    """Base form of Polygon and Polyline since the objects are nearly the same."""
+class _Polyshape(_CachedShape):
+    """
+    Base form of Polygon and Polyline since the objects are nearly the same.
+
+    Call invalidate() after changing the points list or its points in place.
+    """
+
+    points = _geometry_property("points")
 
     def __init__(self, *args, **kwargs):
         self.points = list()
-        Shape.__init__(self, *args, **kwargs)
+        _CachedShape.__init__(self, *args, **kwargs)
 
     def property_by_object(self, s):
         Shape.property_by_object(self, s)
@@ -7106,7 +8920,7 @@ class _Polyshape(Shape):
         if points is None:
             self.points = list()
             return
-        if isinstance(points, dict):
+        if isinstance(points, Mapping):
             if SVG_ATTR_POINTS in points:
                 points = points[SVG_ATTR_POINTS]
             else:
@@ -7156,7 +8970,7 @@ class _Polyshape(Shape):
     def __getitem__(self, item):
         return self.points[item]
 
-    def segments(self, transformed=True):
+    def _make_segments(self, transformed=True):
         """
         Polyline and Polygon decomposition is given in SVG2. 10.6 and 10.7
 
@@ -7195,6 +9009,7 @@ class _Polyshape(Shape):
         for p in self:
             p *= matrix
         matrix.reset()
+        self.invalidate()
         return self
 
     def is_degenerate(self):
@@ -7300,6 +9115,9 @@ class Subpath:
         if isinstance(other, Matrix):
             for e in self:
                 e *= other
+            self._path._length = None
+            self._path._lengths = None
+            self._path._length_table = None
         return self
 
     def __mul__(self, other):
@@ -7359,9 +9177,9 @@ class Subpath:
     def segments(self, transformed=True):
         path = self._path
         if transformed:
-            return [
-                s * path.transform for s in path._segments[self._start : self._end + 1]
-            ]
+            segments = [copy(s) for s in path._segments[self._start : self._end + 1]]
+            Path._transform_segments(segments, path.transform)
+            return segments
         return path._segments[self._start : self._end + 1]
 
     def _numeric_index(self, index):
@@ -7431,6 +9249,7 @@ class Subpath:
                 segments[e] = start_segment
             s += 1
             e -= 1
+        self._path._length_table = None
         start = self.index_to_path_index(start)
         end = self.index_to_path_index(end)
         self._path._validate_connection(start - 1, prefer_second=True)
@@ -7469,6 +9288,10 @@ class Group(SVGElement, Transformable, list):
     5.2. Grouping: the g element
     """
 
+    _bbox_cache = None
+    _bbox_entries = None
+    _flat = None
+
     def __init__(self, *args, **kwargs):
         Transformable.__init__(self, *args, **kwargs)
         list.__init__(self)
@@ -7485,8 +9308,89 @@ class Group(SVGElement, Transformable, list):
             self.transform *= other
             for e in self:
                 e *= other
+            self.invalidate()
+        return self
+
+    def _adopt(self, values):
+        for value in values:
+            if isinstance(value, Transformable):
+                value._parent = self
+        self.invalidate()
+        if self._flat is not None:
+            self._restructure()
+
+    def _release(self, values):
+        for value in values:
+            if isinstance(value, Transformable) and value._parent is self:
+                value._parent = None
+        self.invalidate()
+        if self._flat is not None:
+            self._restructure()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            removed = self[index]
+            list.__setitem__(self, index, value)
+            self._release(removed)
+            self._adopt(value)
+        else:
+            removed = self[index]
+            list.__setitem__(self, index, value)
+            self._release((removed,))
+            self._adopt((value,))
+
+    def __delitem__(self, index):
+        removed = self[index]
+        list.__delitem__(self, index)
+        self._release(removed if isinstance(index, slice) else (removed,))
+
+    def __iadd__(self, other):
+        other = list(other)
+        list.__iadd__(self, other)
+        self._adopt(other)
         return self
 
+    def append(self, value):
+        list.append(self, value)
+        if isinstance(value, Transformable):
+            value._parent = self
+        self.invalidate()
+        if self._flat is not None:
+            self._restructure()
+
+    def extend(self, values):
+        values = list(values)
+        list.extend(self, values)
+        self._adopt(values)
+
+    def insert(self, index, value):
+        list.insert(self, index, value)
+        self._adopt((value,))
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        self._release((value,))
+        return value
+
+    def clear(self):
+        removed = list(self)
+        list.clear(self)
+        self._release(removed)
+
+    def reverse(self):
+        list.reverse(self)
+        if self._flat is not None:
+            self._restructure()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        if self._flat is not None:
+            self._restructure()
+
     def render(self, **kwargs):
         Transformable.render(self, **kwargs)
 
@@ -7508,59 +9412,225 @@ class Group(SVGElement, Transformable, list):
 
         :param conditional: function taking element and returns True to include or False if exclude
         """
-        if conditional is None:
-            for subitem in self:
-                yield subitem
-                if isinstance(subitem, Group):
-                    for s in subitem.select(conditional):
-                        yield s
-        else:
-            for subitem in self:
-                if conditional(subitem):
+        return self._select(conditional)
+
+    def _select(self, conditional=None, include_self=False):
+        """
+        Yields the elements within this group in document order, walking nested groups with an explicit stack of
+        iterators rather than a generator for each level.
+        """
+        if include_self and (conditional is None or conditional(self)):
+            yield self
+        stack = [iter(self)]
+        while stack:
+            for subitem in stack[-1]:
+                if conditional is None or conditional(subitem):
                     yield subitem
                 if isinstance(subitem, Group):
-                    for s in subitem.select(conditional):
-                        yield s
+                    stack.append(iter(subitem))
+                    break
+            else:
+                stack.pop()
+
+    def flatten(self):
+        """
+        Returns the FlatElements of the elements within this group, cached until elements are added to or removed
+        from any group within it.
+        """
+        flat = self._flat
+        if flat is None or flat.group is not self:
+            flat = self._flat = FlatElements(self)
+            # Groups within share the arrays as a marker, their own are built when asked for.
+            for group in flat.of_type(Group):
+                if group._flat is None:
+                    group._flat = flat
+        return flat
+
+    def _restructure(self):
+        """
+        Drops the flat element arrays of this group and of the groups containing it.
+
+        Every group within a flattened group is marked, so the walk stops at the first group which is not.
+        """
+        group = self
+        while group is not None and group._flat is not None:
+            group._flat = None
+            group = group._parent
 
     def reify(self):
         Transformable.reify(self)
 
     @staticmethod
-    def union_bbox(elements, transformed=True, with_stroke=False):
+    def union_bbox(elements, transformed=True, with_stroke=False):
+        """
+        Returns the union of the bounding boxes for the elements within the iterator.
+
+        The untransformed boxes and the matrix of each element are collected first, the corners of all boxes are then
+        transformed and bounded together.
+
+        :param transformed: Should the children of this object be properly transformed.
+        :param with_stroke: should the stroke-width be included in the bounds of the elements
+        :return: union of all bounding boxes of elements within the iterable.
+        """
+        boxes = []
+        matrices = []
+        for e in elements:
+            if not hasattr(e, "bbox"):
+                continue
+            box = e.bbox(transformed=False, with_stroke=with_stroke)
+            if box is None:
+                continue
+            boxes.append(box)
+            if transformed:
+                m = e.transform
+                matrices.append((m.a, m.b, m.c, m.d, m.e, m.f))
+        return Group._union_boxes(boxes, matrices if transformed else None)
+
+    @staticmethod
+    def _union_boxes(boxes, matrices=None):
+        """
+        Returns the union of the boxes, each transformed by the matrix components at the same index if given.
+        """
+        if len(boxes) == 0:
+            return None
+        np = numeric_backend("numpy")
+        if np is not None:
+            boxes = np.array(boxes, dtype=float)
+            if matrices is None:
+                return (
+                    float(boxes[:, 0].min()),
+                    float(boxes[:, 1].min()),
+                    float(boxes[:, 2].max()),
+                    float(boxes[:, 3].max()),
+                )
+            matrices = np.array(matrices, dtype=float)
+            xs = boxes[:, [0, 2, 0, 2]]
+            ys = boxes[:, [1, 1, 3, 3]]
+            px = xs * matrices[:, 0:1] + ys * matrices[:, 2:3] + matrices[:, 4:5]
+            py = xs * matrices[:, 1:2] + ys * matrices[:, 3:4] + matrices[:, 5:6]
+            return float(px.min()), float(py.min()), float(px.max()), float(py.max())
+        if matrices is None:
+            return (
+                min([box[0] for box in boxes]),
+                min([box[1] for box in boxes]),
+                max([box[2] for box in boxes]),
+                max([box[3] for box in boxes]),
+            )
+        xmin = ymin = float("inf")
+        xmax = ymax = -float("inf")
+        for (x0, y0, x1, y1), (a, b, c, d, e, f) in zip(boxes, matrices):
+            # The corners combine both x bounds with both y bounds, so each term is bounded apart.
+            ax0 = x0 * a
+            ax1 = x1 * a
+            cy0 = y0 * c
+            cy1 = y1 * c
+            bx0 = x0 * b
+            bx1 = x1 * b
+            dy0 = y0 * d
+            dy1 = y1 * d
+            v = min(ax0, ax1) + min(cy0, cy1) + e
+            if v < xmin:
+                xmin = v
+            v = max(ax0, ax1) + max(cy0, cy1) + e
+            if v > xmax:
+                xmax = v
+            v = min(bx0, bx1) + min(dy0, dy1) + f
+            if v < ymin:
+                ymin = v
+            v = max(bx0, bx1) + max(dy0, dy1) + f
+            if v > ymax:
+                ymax = v
+        return xmin, ymin, xmax, ymax
+
+    def invalidate(self):
+        """
+        Drops the cached bounding boxes of this group and of the groups containing it, so every child is bounded
+        again the next time.
+        """
+        if self._bbox_cache is None and self._bbox_entries is None:
+            return
+        self._bbox_cache = None
+        self._bbox_entries = None
+        Transformable.invalidate(self)
+
+    @staticmethod
+    def _bbox_stamp(e, with_stroke):
         """
-        Returns the union of the bounding boxes for the elements within the iterator.
-
-        :param transformed: Should the children of this object be properly transformed.
-        :param with_stroke: should the stroke-width be included in the bounds of the elements
-        :return: union of all bounding boxes of elements within the iterable.
+        Returns a key which is unchanged as long as the untransformed bounding box of the element is, or None if no
+        such key can be made and the element is to be bounded again every time.
         """
-        boundary_points = []
-        for e in elements:
-            if not hasattr(e, "bbox"):
+        if isinstance(e, _CachedShape):
+            key = e._geometry_key(False)
+        elif isinstance(e, Path):
+            key = tuple(e._geometry_key(False))
+        else:
+            return None
+        if with_stroke:
+            stroke = e.stroke
+            return key, e.stroke_width, None if stroke is None else stroke.value
+        return key
+
+    def _union_children(self, with_stroke):
+        """
+        Brings the cached untransformed and transformed bounds of this group up to date. The groups within it must
+        already be.
+
+        The untransformed box of every child is kept with its matrix components and its stamp, only the children
+        whose stamp changed are bounded again and the union is only made again if any entry changed.
+        """
+        untransformed_key = (False, with_stroke)
+        transformed_key = (True, with_stroke)
+        entries = self._bbox_entries
+        if entries is None:
+            entries = self._bbox_entries = {}
+        previous = entries.get(with_stroke)
+        if previous is not None and len(previous) != len(self):
+            previous = None
+        changed = previous is None
+        current = []
+        for i, e in enumerate(self):
+            old = previous[i] if previous is not None else None
+            if old is not None and old[0] is not e:
+                old = None
+            if isinstance(e, Group):
+                bounds = e._bbox_cache
+                stamp = (bounds[untransformed_key], bounds[transformed_key])
+                box = stamp[0]
+            elif hasattr(e, "bbox"):
+                stamp = Group._bbox_stamp(e, with_stroke)
+                if stamp is not None and old is not None and old[1] == stamp:
+                    box = old[3]
+                else:
+                    box = e.bbox(transformed=False, with_stroke=with_stroke)
+            else:
+                current.append((e, (), None, None))
                 continue
-            box = e.bbox(transformed=False, with_stroke=with_stroke)
+            m = e.transform
+            matrix = (m.a, m.b, m.c, m.d, m.e, m.f)
+            if old is None or stamp is None or old[1] != stamp or old[2] != matrix:
+                changed = True
+            current.append((e, stamp, matrix, box))
+        entries[with_stroke] = current
+        bounds = self._bbox_cache
+        if bounds is None:
+            bounds = self._bbox_cache = {}
+        elif not changed and untransformed_key in bounds:
+            return
+        boxes = []
+        matrices = []
+        inner = []
+        for e, stamp, matrix, box in current:
             if box is None:
                 continue
-            top_left = (box[0], box[1])
-            top_right = (box[2], box[1])
-            bottom_left = (box[0], box[3])
-            bottom_right = (box[2], box[3])
-            if transformed:
-                top_left = e.transform.point_in_matrix_space(top_left)
-                top_right = e.transform.point_in_matrix_space(top_right)
-                bottom_left = e.transform.point_in_matrix_space(bottom_left)
-                bottom_right = e.transform.point_in_matrix_space(bottom_right)
-            boundary_points.append(top_left)
-            boundary_points.append(top_right)
-            boundary_points.append(bottom_left)
-            boundary_points.append(bottom_right)
-        if len(boundary_points) == 0:
-            return None
-        xmin = min([e[0] for e in boundary_points])
-        ymin = min([e[1] for e in boundary_points])
-        xmax = max([e[0] for e in boundary_points])
-        ymax = max([e[1] for e in boundary_points])
-        return xmin, ymin, xmax, ymax
+            boxes.append(box)
+            matrices.append(matrix)
+            if isinstance(e, Group):
+                inner.append(stamp[1])
+        bounds[untransformed_key] = Group._union_boxes(boxes)
+        # The descendants of inner groups are bounded by the transformed bounds of those groups.
+        bounds[transformed_key] = Group._union_boxes(
+            boxes + inner, matrices + [(1.0, 0.0, 0.0, 1.0, 0.0, 0.0)] * len(inner)
+        )
 
     def bbox(self, transformed=True, with_stroke=False):
         """
@@ -7571,15 +9641,111 @@ class Group(SVGElement, Transformable, list):
         Setting transformed to false, may yield unexpected results if subitems are transformed in non-uniform
         ways.
 
+        The bounds of this group and of every group within it are brought up to date in one pass, innermost first.
+        Each child is only bounded again if its transform or geometry changed, including in place, or if it is
+        neither a path nor a shape.
+
         :param transformed: bounding box of the properly transformed children.
         :param with_stroke: should the stroke-width be included in the bounds.
         :return: bounding box of the given element
         """
-        return Group.union_bbox(
-            self.select(),
-            transformed=transformed,
-            with_stroke=with_stroke,
-        )
+        groups = []
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            groups.append(group)
+            for e in group:
+                if isinstance(e, Group):
+                    stack.append(e)
+        for group in reversed(groups):
+            group._union_children(with_stroke)
+        return self._bbox_cache[(transformed, with_stroke)]
+
+
+class FlatElements:
+    """
+    The elements within a group in document order, as given by Group.select(), kept in flat arrays.
+
+    depths holds how far below the group each element is, 0 for its children, and parents the index of the group each
+    element is in, -1 for its children. The indices of each element type are kept so all elements of a type are
+    looked up rather than tested one by one. The elements of the subtree of a group are those following it which are
+    deeper than it.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.elements = []
+        self.depths = []
+        self.parents = []
+        self._types = {}
+        self._kinds = {}
+        elements = self.elements
+        depths = self.depths
+        parents = self.parents
+        types = self._types
+        stack = [(iter(group), -1, 0)]
+        while stack:
+            iterator, parent, depth = stack[-1]
+            for element in iterator:
+                index = len(elements)
+                elements.append(element)
+                depths.append(depth)
+                parents.append(parent)
+                try:
+                    types[type(element)].append(index)
+                except KeyError:
+                    types[type(element)] = [index]
+                if isinstance(element, Group):
+                    stack.append((iter(element), index, depth + 1))
+                    break
+            else:
+                stack.pop()
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+    def indices(self, kind):
+        """
+        Returns the sorted indices of the elements which are instances of kind, a type or a tuple of types.
+        """
+        try:
+            return self._kinds[kind]
+        except KeyError:
+            pass
+        found = [
+            indices for cls, indices in self._types.items() if issubclass(cls, kind)
+        ]
+        if len(found) == 1:
+            indices = found[0]
+        else:
+            indices = sorted([index for indices in found for index in indices])
+        self._kinds[kind] = indices
+        return indices
+
+    def of_type(self, kind):
+        """
+        Returns the elements which are instances of kind, a type or a tuple of types, in document order.
+        """
+        elements = self.elements
+        return [elements[index] for index in self.indices(kind)]
+
+    def subtree(self, index):
+        """
+        Returns the slice of the arrays holding the elements within the group at index.
+        """
+        depths = self.depths
+        depth = depths[index]
+        end = index + 1
+        count = len(depths)
+        while end < count and depths[end] > depth:
+            end += 1
+        return slice(index + 1, end)
 
 
 class ClipPath(SVGElement, list):
@@ -8312,6 +10478,522 @@ class Title(SVGElement):
             self.title = values[SVG_TAG_TITLE]
 
 
+class StyleSheet:
+    """
+    The css rules of <style> elements, parsed once into declarations and indexed by selector.
+
+    Universal, type, #id, .class and type.class selectors are looked up directly and their merged declarations are
+    cached per tag, id and class attribute. Other selectors, with descendant or child combinators, attribute
+    conditions or compound parts, are compiled and indexed by their rightmost part so only the rules which could
+    match an element are tested. Selectors with other syntax never match.
+    """
+
+    def __init__(self, css=None):
+        self.universal = {}
+        self.types = {}
+        self.ids = {}
+        self.classes = {}
+        self.type_classes = {}
+        self.rules = {}
+        self._count = 0
+        self._resolved = {}
+        if css is not None:
+            self.parse(css)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def parse_declarations(style):
+        """
+        Parses a declaration block, such as a style attribute, into a tuple of (property, value) pairs.
+        """
+        declarations = []
+        for declaration in style.split(";"):
+            equal_item = declaration.split(":")
+            if len(equal_item) == 2:
+                declarations.append((equal_item[0].strip(), equal_item[1].strip()))
+        return tuple(declarations)
+
+    @staticmethod
+    def compile_selector(selector):
+        """
+        Compiles a selector into its compound parts from right to left and the combinators between them.
+
+        Each part is (type, id, classes, attribute conditions). Returns None if the selector has unsupported syntax.
+        """
+        parts = []
+        combinators = []
+        part = [None, None, [], []]
+        empty = True
+        pos = 0
+        selector = selector.strip()
+        while pos < len(selector):
+            match = REGEX_CSS_SELECTOR_TOKEN.match(selector, pos)
+            if match is None:
+                return None
+            pos = match.end()
+            combinator, svg_type, svg_id, svg_class, name, op, v1, v2, v3 = match.groups()
+            if combinator is not None:
+                if empty:
+                    return None
+                parts.append(part)
+                combinators.append(combinator.strip() or " ")
+                part = [None, None, [], []]
+                empty = True
+                continue
+            empty = False
+            if svg_type is not None:
+                if svg_type != "*":
+                    part[0] = svg_type
+            elif svg_id is not None:
+                part[1] = svg_id
+            elif svg_class is not None:
+                part[2].append(svg_class)
+            else:
+                value = v1 if v1 is not None else v2 if v2 is not None else v3
+                part[3].append((name, op, value))
+        if empty:
+            return None
+        parts.append(part)
+        parts = [(p[0], p[1], tuple(p[2]), tuple(p[3])) for p in reversed(parts)]
+        return parts, tuple(reversed(combinators))
+
+    def parse(self, css):
+        """
+        Adds the rules of a css stylesheet.
+        """
+        for key, value in REGEX_CSS_STYLE.findall(css):
+            declarations = StyleSheet.parse_declarations(value.strip())
+            for selector in key.strip().split(","):  # Can comma select subitems.
+                self.add_rule(selector.strip(), declarations)
+
+    def add_rule(self, selector, declarations):
+        """
+        Adds the (property, value) declarations for the selector. Later rules override earlier ones.
+        """
+        self._resolved.clear()
+        if selector == "*":
+            self.universal.update(declarations)
+            return
+        match = REGEX_CSS_SIMPLE_SELECTOR.match(selector)
+        if match is not None:
+            svg_type, kind, name = match.groups()
+            if kind is None:
+                if svg_type:
+                    self.types.setdefault(svg_type, {}).update(declarations)
+                return
+            if kind == "." and svg_type:
+                self.type_classes.setdefault((svg_type, name), {}).update(declarations)
+                return
+            if kind == ".":
+                self.classes.setdefault(name, {}).update(declarations)
+                return
+            if not svg_type:
+                self.ids.setdefault(name, {}).update(declarations)
+                return
+        compiled = StyleSheet.compile_selector(selector)
+        if compiled is None:
+            return
+        parts, combinators = compiled
+        specificity = (0, 0, 0)
+        for svg_type, svg_id, svg_classes, conditions in parts:
+            specificity = (
+                specificity[0] + (svg_id is not None),
+                specificity[1] + len(svg_classes) + len(conditions),
+                specificity[2] + (svg_type is not None),
+            )
+        svg_type, svg_id, svg_classes, conditions = parts[0]
+        if svg_id is not None:
+            key = "#" + svg_id
+        elif svg_classes:
+            key = "." + svg_classes[0]
+        elif svg_type is not None:
+            key = svg_type
+        else:
+            key = "*"
+        self._count += 1
+        self.rules.setdefault(key, []).append(
+            (specificity, self._count, parts, combinators, dict(declarations))
+        )
+
+    @staticmethod
+    def _match_part(part, tag, attributes):
+        svg_type, svg_id, svg_classes, conditions = part
+        if svg_type is not None and svg_type != tag:
+            return False
+        if svg_id is not None and attributes.get(SVG_ATTR_ID) != svg_id:
+            return False
+        if svg_classes:
+            classes = attributes.get(SVG_ATTR_CLASS, "").split()
+            for svg_class in svg_classes:
+                if svg_class not in classes:
+                    return False
+        for name, op, value in conditions:
+            actual = attributes.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == "=":
+                matched = actual == value
+            elif op == "~=":
+                matched = value in actual.split()
+            elif op == "|=":
+                matched = actual == value or actual.startswith(value + "-")
+            elif op == "^=":
+                matched = value != "" and actual.startswith(value)
+            elif op == "$=":
+                matched = value != "" and actual.endswith(value)
+            else:  # op == "*="
+                matched = value != "" and value in actual
+            if not matched:
+                return False
+        return True
+
+    @staticmethod
+    def _match_ancestors(parts, combinators, position, ancestors, index):
+        if position == len(parts):
+            return True
+        part = parts[position]
+        if combinators[position - 1] == ">":
+            index -= 1
+            return (
+                index >= 0
+                and StyleSheet._match_part(part, *ancestors[index])
+                and StyleSheet._match_ancestors(
+                    parts, combinators, position + 1, ancestors, index
+                )
+            )
+        for i in range(index - 1, -1, -1):
+            if StyleSheet._match_part(part, *ancestors[i]) and StyleSheet._match_ancestors(
+                parts, combinators, position + 1, ancestors, i
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def match_selector(compiled, tag, attributes, ancestors=()):
+        """
+        Tests a selector from compile_selector() against the element.
+
+        :param compiled: (parts, combinators) of the selector.
+        :param tag: tag of the element.
+        :param attributes: attributes of the element.
+        :param ancestors: (tag, attributes) of each ancestor of the element, starting with the root.
+        """
+        parts, combinators = compiled
+        return StyleSheet._match_part(
+            parts[0], tag, attributes
+        ) and StyleSheet._match_ancestors(
+            parts, combinators, 1, ancestors, len(ancestors)
+        )
+
+    def match(self, tag, attributes, ancestors=()):
+        """
+        Returns the declarations of all rules matching the element as a dict. The result may be shared and must not
+        be modified.
+
+        :param tag: tag of the element.
+        :param attributes: attributes of the element.
+        :param ancestors: (tag, attributes) of each ancestor of the element, starting with the root.
+        """
+        svg_id = attributes.get(SVG_ATTR_ID)
+        svg_class = attributes.get(SVG_ATTR_CLASS)
+        key = (tag, svg_id if svg_id in self.ids else None, svg_class)
+        try:
+            declarations = self._resolved[key]
+        except KeyError:
+            declarations = dict(self.universal)
+            if tag in self.types:
+                declarations.update(self.types[tag])
+            if key[1] is not None:
+                declarations.update(self.ids[svg_id])
+            if svg_class is not None:
+                for name in svg_class.split():
+                    if name in self.classes:
+                        declarations.update(self.classes[name])
+                    if (tag, name) in self.type_classes:
+                        declarations.update(self.type_classes[(tag, name)])
+            self._resolved[key] = declarations
+        if not self.rules:
+            return declarations
+        candidates = []
+        for rule_key in ("*", tag, None if svg_id is None else "#" + svg_id):
+            if rule_key in self.rules:
+                candidates.extend(self.rules[rule_key])
+        if svg_class is not None:
+            for name in set(svg_class.split()):
+                if "." + name in self.rules:
+                    candidates.extend(self.rules["." + name])
+        matched = [
+            rule
+            for rule in candidates
+            if StyleSheet.match_selector(rule[2:4], tag, attributes, ancestors)
+        ]
+        if not matched:
+            return declarations
+        matched.sort(key=lambda rule: (rule[0], rule[1]))
+        declarations = dict(declarations)
+        for rule in matched:
+            declarations.update(rule[4])
+        return declarations
+
+
+class SpatialIndex:
+    """
+    R-tree of the bounding boxes of svg elements, bulk loaded with sort-tile-recursive packing.
+
+    Each entry is the transformed bounding box of an element at the time it was added. Elements which change after
+    that should be passed to update(), or removed and inserted again. Nodes are lists of [xmin, ymin, xmax, ymax,
+    children, leaf] and leaf entries are tuples of (xmin, ymin, xmax, ymax, element).
+    """
+
+    def __init__(self, elements=None, node_capacity=16, with_stroke=False):
+        self.node_capacity = max(node_capacity, 2)
+        self.with_stroke = with_stroke
+        self._boxes = {}
+        self._root = None
+        if elements is not None:
+            self.load(elements)
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __iter__(self):
+        for element, box in self._boxes.values():
+            yield element
+
+    def __contains__(self, element):
+        entry = self._boxes.get(id(element))
+        return entry is not None and entry[0] is element
+
+    def _bbox(self, element):
+        box = element.bbox(transformed=True, with_stroke=self.with_stroke)
+        if box is None:
+            return None
+        return tuple(box)
+
+    @staticmethod
+    def _node(children, leaf):
+        return [
+            min([c[0] for c in children]),
+            min([c[1] for c in children]),
+            max([c[2] for c in children]),
+            max([c[3] for c in children]),
+            children,
+            leaf,
+        ]
+
+    def _pack(self, items, leaf=True):
+        capacity = self.node_capacity
+        while True:
+            count = len(items)
+            slices = int(ceil(sqrt(ceil(count / capacity))))
+            slice_size = slices * capacity
+            items.sort(key=lambda c: c[0] + c[2])
+            nodes = []
+            for i in range(0, count, slice_size):
+                tile = items[i : i + slice_size]
+                tile.sort(key=lambda c: c[1] + c[3])
+                for j in range(0, len(tile), capacity):
+                    nodes.append(SpatialIndex._node(tile[j : j + capacity], leaf))
+            if len(nodes) == 1:
+                return nodes[0]
+            items = nodes
+            leaf = False
+
+    def load(self, elements):
+        """
+        Replaces the contents of the index with the given elements, packing the tree in bulk.
+
+        Elements without a bounding box are skipped.
+        """
+        boxes = {}
+        entries = []
+        for element in elements:
+            box = self._bbox(element)
+            if box is None:
+                continue
+            boxes[id(element)] = (element, box)
+        for element, box in boxes.values():
+            entries.append(box + (element,))
+        self._boxes = boxes
+        self._root = self._pack(entries) if entries else None
+
+    def bbox(self):
+        """Returns the union of the bounding boxes within the index, or None if it is empty."""
+        if self._root is None:
+            return None
+        return tuple(self._root[:4])
+
+    def insert(self, element, bbox=None):
+        """
+        Adds an element to the index. An element already in the index is moved to its new bounding box.
+
+        :param element: element to add.
+        :param bbox: bounding box to index the element by, by default the element's transformed bbox.
+        :return: False if the element has no bounding box, otherwise True.
+        """
+        box = tuple(bbox) if bbox is not None else self._bbox(element)
+        if box is None:
+            return False
+        if id(element) in self._boxes:
+            self.remove(element)
+        self._boxes[id(element)] = (element, box)
+        entry = box + (element,)
+        if self._root is None:
+            self._root = SpatialIndex._node([entry], True)
+            return True
+        x0, y0, x1, y1 = box
+        node = self._root
+        path = [node]
+        while not node[5]:
+            best = None
+            for child in node[4]:
+                width = child[2] - child[0]
+                height = child[3] - child[1]
+                area = width * height
+                grown = (max(child[2], x1) - min(child[0], x0)) * (
+                    max(child[3], y1) - min(child[1], y0)
+                )
+                key = (grown - area, area)
+                if best is None or key < best:
+                    best = key
+                    node = child
+            path.append(node)
+        node[4].append(entry)
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if x0 < node[0]:
+                node[0] = x0
+            if y0 < node[1]:
+                node[1] = y0
+            if x1 > node[2]:
+                node[2] = x1
+            if y1 > node[3]:
+                node[3] = y1
+            if len(node[4]) > self.node_capacity:
+                sibling = SpatialIndex._split(node)
+                if i == 0:
+                    self._root = SpatialIndex._node([node, sibling], False)
+                else:
+                    path[i - 1][4].append(sibling)
+        return True
+
+    @staticmethod
+    def _split(node):
+        """Splits the children of an overfull node in half along its longer side, returning the new sibling."""
+        children = node[4]
+        if node[2] - node[0] >= node[3] - node[1]:
+            children.sort(key=lambda c: c[0] + c[2])
+        else:
+            children.sort(key=lambda c: c[1] + c[3])
+        half = len(children) // 2
+        sibling = SpatialIndex._node(children[half:], node[5])
+        node[:] = SpatialIndex._node(children[:half], node[5])
+        return sibling
+
+    def remove(self, element):
+        """
+        Removes an element from the index.
+
+        :return: False if the element was not in the index, otherwise True.
+        """
+        entry = self._boxes.get(id(element))
+        if entry is None or entry[0] is not element:
+            return False
+        del self._boxes[id(element)]
+        x0, y0, x1, y1 = entry[1]
+        stack = [(self._root, [self._root])]
+        while stack:
+            node, path = stack.pop()
+            if node[5]:
+                children = node[4]
+                for i in range(len(children)):
+                    if children[i][4] is element:
+                        del children[i]
+                        self._condense(path)
+                        return True
+                continue
+            for child in node[4]:
+                if child[0] <= x0 and child[1] <= y0 and child[2] >= x1 and child[3] >= y1:
+                    stack.append((child, path + [child]))
+        return True
+
+    def _condense(self, path):
+        for i in range(len(path) - 1, 0, -1):
+            node = path[i]
+            if node[4]:
+                node[:4] = SpatialIndex._node(node[4], node[5])[:4]
+            else:
+                path[i - 1][4].remove(node)
+        root = self._root
+        while not root[5] and len(root[4]) == 1:
+            root = root[4][0]
+        if not root[4]:
+            root = None
+        else:
+            root[:4] = SpatialIndex._node(root[4], root[5])[:4]
+        self._root = root
+
+    def update(self, element):
+        """Re-indexes an element by its current bounding box."""
+        self.remove(element)
+        return self.insert(element)
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Returns the elements whose bounding boxes intersect the given rectangle."""
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        found = []
+        root = self._root
+        if root is None or root[0] > x1 or root[2] < x0 or root[1] > y1 or root[3] < y0:
+            return found
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node[5]:
+                for c in node[4]:
+                    if c[0] <= x1 and c[2] >= x0 and c[1] <= y1 and c[3] >= y0:
+                        found.append(c[4])
+            else:
+                for c in node[4]:
+                    if c[0] <= x1 and c[2] >= x0 and c[1] <= y1 and c[3] >= y0:
+                        stack.append(c)
+        return found
+
+    def query_point(self, x, y):
+        """Returns the elements whose bounding boxes contain the given point."""
+        return self.query_rect(x, y, x, y)
+
+    def nearest(self, x, y, k=1):
+        """
+        Returns up to k elements ordered by the distance from the given point to their bounding boxes.
+
+        Elements whose bounding boxes contain the point are at distance 0.
+        """
+        found = []
+        if self._root is None or k <= 0:
+            return found
+        heap = [(0.0, 0, self._root, False)]
+        count = 1
+        while heap:
+            distance, _, item, is_element = heappop(heap)
+            if is_element:
+                found.append(item)
+                if len(found) >= k:
+                    break
+                continue
+            leaf = item[5]
+            for c in item[4]:
+                dx = max(c[0] - x, 0.0, x - c[2])
+                dy = max(c[1] - y, 0.0, y - c[3])
+                count += 1
+                heappush(heap, (dx * dx + dy * dy, count, c[4] if leaf else c, leaf))
+        return found
+
+
 class SVG(Group):
     """
     SVG Document and Parsing.
@@ -8408,10 +11090,17 @@ class SVG(Group):
         self.y = Length(self.y).value(relative_length=height, **kwargs)
 
     def elements(self, conditional=None):
-        if conditional is None or conditional(self):
-            yield self
-        for q in self.select(conditional):
-            yield q
+        return self._select(conditional, include_self=True)
+
+    def build_index(self, node_capacity=16, with_stroke=False):
+        """
+        Returns a SpatialIndex of the transformed bounding boxes of the shapes, text and images within this svg.
+        """
+        return SpatialIndex(
+            self.elements(lambda e: isinstance(e, (Shape, SVGText, SVGImage))),
+            node_capacity=node_capacity,
+            with_stroke=with_stroke,
+        )
 
     @property
     def viewbox_transform(self):
@@ -8435,15 +11124,57 @@ class SVG(Group):
         yield tag, "end", elem
 
     @staticmethod
-    def _use_structure_parse(source):
+    def _referenced_ids(source):
+        """
+        Reads the svg once to find the ids referenced by <use> hrefs or by url() values, releasing every element
+        as it is read.
+        """
+        referenced = set()
+        parents = list()
+        for event, elem in iterparse(source, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                for key, value in elem.attrib.items():
+                    if key in (XLINK_HREF, SVG_HREF):
+                        if value.startswith("#"):
+                            referenced.add(value[1:])
+                    elif "url(" in value:
+                        referenced.update(REGEX_IRI_ID.findall(value))
+            else:
+                if elem.text is not None and "url(" in elem.text:
+                    referenced.update(REGEX_IRI_ID.findall(elem.text))  # <style> blocks.
+                parents.pop()
+                elem.clear()
+                if parents:
+                    SVG._detach(parents[-1], elem)
+        return referenced
+
+    @staticmethod
+    def _detach(parent, elem):
+        """
+        Removes the finished xml element from its parent. The parser reads ahead, so later siblings may already be
+        in the parent and the element is searched for from the end.
+        """
+        for i in range(len(parent) - 1, -1, -1):
+            if parent[i] is elem:
+                del parent[i]
+                return
+
+    @staticmethod
+    def _use_structure_parse(source, streaming=False, referenced=None):
         """
         SVG structure pass: parses the svg file such that it creates the structure implied by reused objects in a
         generalized context. Objects ids are read and put into an unparsed shadow tree. <use> objects seamlessly contain
         their definitions.
+
+        When streaming, every xml element is detached from the tree once it has ended and only the nodes with
+        referenced ids (all nodes with ids if referenced is None) and their subtrees are kept in the shadow tree.
         """
         defs = {}
         parent = None  # Define Root Node.
         children = list()
+        keep = not streaming
+        parents = list()
 
         for event, elem in iterparse(source, events=("start", "end", "start-ns")):
             try:
@@ -8456,12 +11187,21 @@ class SVG(Group):
 
             if event == "start":
                 attributes = elem.attrib
+                if not keep and SVG_ATTR_ID in attributes:
+                    node_id = attributes[SVG_ATTR_ID]
+                    kept = referenced is None or node_id in referenced
+                else:
+                    kept = keep
                 # Create new node.
                 siblings = children  # Parent's children are now my siblings.
-                parent = (parent, children)  # parent is now previous node context
+                parent = (parent, children, keep)  # parent is now previous node context
                 children = list()  # new node has no children.
                 node = (tag, elem, children)  # define this node.
-                siblings.append(node)  # siblings now includes this node.
+                if keep:
+                    siblings.append(node)  # siblings now includes this node.
+                keep = kept
+                if streaming:
+                    parents.append(elem)
 
                 if SVG_TAG_USE == tag:
                     url = None
@@ -8509,12 +11249,18 @@ class SVG(Group):
                             pass  # Failed to find link.
                 else:
                     yield tag, event, elem
-                if SVG_ATTR_ID in attributes:  # If we have an ID, we save the node.
+                if SVG_ATTR_ID in attributes and keep:
+                    # If we have an ID, we save the node.
                     defs[attributes[SVG_ATTR_ID]] = node  # store node value in defs.
             elif event == "end":
                 yield tag, event, elem
                 # event is 'end', pop values.
-                parent, children = parent  # Parent is now node.
+                parent, children, keep = parent  # Parent is now node.
+                if streaming:
+                    # The xml element is finished, release it from the tree.
+                    parents.pop()
+                    if parents:
+                        SVG._detach(parents[-1], elem)
 
     @staticmethod
     def parse(
@@ -8526,11 +11272,19 @@ class SVG(Group):
         color="black",
         transform=None,
         context=None,
+        select=None,
+        lazy=False,
+        flat=False,
     ):
         """
         Parses the SVG file. All attributes are things which the SVG document itself could not be aware of, such as
         the real size of pixels and the size of the viewport (as opposed to the viewbox).
 
+        Only the shapes, images and text matching select are built, other rendered ones are skipped without being
+        constructed. Structural elements and everything inside defs, clipPath and pattern are always built. With lazy,
+        paths keep their d string and parse it on first access to their segments. With flat, the flat element arrays
+        of the document are built along with it, see Group.flatten().
+
         :param source: Source svg file or stream.
         :param reify: Should the Geometry sized or have lazy matrices.
         :param ppi: How many physical pixels per inch are there in this view.
@@ -8539,89 +11293,210 @@ class SVG(Group):
         :param color: the `currentColor` value from outside the current scope.
         :param transform: Any required transformations to be pre-applied to this document
         :param context: Any existing document context.
+        :param select: css selector string, or function of (tag, attributes), for the elements to build.
+        :param lazy: Should paths defer parsing their d string.
+        :param flat: Should the flat element arrays be built.
         :return:
         """
+        for root in SVG._parse(
+            source,
+            reify,
+            ppi,
+            width,
+            height,
+            color,
+            transform,
+            context,
+            select=select,
+            lazy=lazy,
+        ):
+            if flat and root is not None:
+                root.flatten()
+            return root
+
+    @staticmethod
+    def iterparse(
+        source,
+        reify=True,
+        ppi=DEFAULT_PPI,
+        width=None,
+        height=None,
+        color="black",
+        transform=None,
+        select=None,
+        lazy=False,
+    ):
+        """
+        Parses the SVG file as a stream, yielding each element as soon as it is complete rather than building the
+        document tree. The parameters are the same as for SVG.parse().
+
+        Shapes and SVGElements are yielded when they start, text, desc and title elements when they end. SVG and
+        Group elements are yielded when they start and do not get their children appended. Elements within defs,
+        clipPath and pattern are not rendered and are not yielded.
+
+        Xml elements are released as soon as they are parsed. If the source is a filename or a seekable stream it is
+        read twice, first to find the ids referenced by <use> and url() values, then only those subtrees and
+        elements are kept. Otherwise all elements with ids are kept.
+        """
+        referenced = None
+        if isinstance(source, str):
+            referenced = SVG._referenced_ids(source)
+        else:
+            try:
+                position = source.tell()
+                referenced = SVG._referenced_ids(source)
+                source.seek(position)
+            except (AttributeError, IOError, ValueError):
+                referenced = None
+        return SVG._parse(
+            source,
+            reify,
+            ppi,
+            width,
+            height,
+            color,
+            transform,
+            streaming=True,
+            referenced=referenced,
+            select=select,
+            lazy=lazy,
+        )
+
+    @staticmethod
+    def _compose_transform(own, inherited, transform_str):
+        """
+        Sets the transform of the own values to the inherited transform followed by the transform string.
+
+        The transform value is the joined transform string, as before. The composed matrix is kept beside it so only
+        the new transform string is parsed, applied to a copy of the inherited matrix.
+        """
+        parent = inherited.get(SVG_ATTR_TRANSFORM)
+        matrix = inherited.get(SVG_STRUCT_MATRIX)
+        if parent is None:
+            own[SVG_ATTR_TRANSFORM] = transform_str
+        else:
+            own[SVG_ATTR_TRANSFORM] = parent + " " + transform_str
+        if matrix is None:
+            matrix = Matrix(own[SVG_ATTR_TRANSFORM])
+        else:
+            matrix = Matrix(matrix)
+            matrix.parse(transform_str)
+        own[SVG_STRUCT_MATRIX] = matrix
+
+    @staticmethod
+    def _inherited_values(values):
+        """
+        Flattens the layered values of an element into the values its children inherit, without the values that do
+        not propagate. This is done once per parent and shared by all its children.
+        """
+        inherited = {}
+        for layer in reversed(values.maps):
+            inherited.update(layer)
+        for key in (
+            SVG_ATTR_PRESERVEASPECTRATIO,
+            SVG_ATTR_VIEWBOX,
+            SVG_ATTR_ID,
+            SVG_ATTR_CLIP_PATH,
+        ):
+            inherited.pop(key, None)
+        return inherited
+
+    @staticmethod
+    def _compile_select(select):
+        """
+        Compiles a css selector string, which may be a comma separated list, into the selectors to match against.
+        Functions and None are returned as they are.
+        """
+        if select is None or callable(select):
+            return select
+        selectors = []
+        for selector in select.split(","):
+            compiled = StyleSheet.compile_selector(selector)
+            if compiled is None:
+                raise ValueError("Unsupported selector: %s" % selector.strip())
+            selectors.append(compiled)
+        return selectors
+
+    @staticmethod
+    def _selected(select, tag, attributes, ancestors):
+        if select is None:
+            return True
+        if callable(select):
+            return select(tag, attributes)
+        for compiled in select:
+            if StyleSheet.match_selector(compiled, tag, attributes, ancestors):
+                return True
+        return False
+
+    @staticmethod
+    def _parse(
+        source,
+        reify=True,
+        ppi=DEFAULT_PPI,
+        width=None,
+        height=None,
+        color="black",
+        transform=None,
+        context=None,
+        streaming=False,
+        referenced=None,
+        select=None,
+        lazy=False,
+    ):
+        """
+        Parsing of the SVG file. This yields the root when done, or with streaming each element as it is complete.
+        """
+        select = SVG._compile_select(select)
+        hidden = 0  # Depth of non-rendered containers.
         clip = 0
         root = context
-        styles = {}
+        styles = StyleSheet()
         stack = []
-
-        values = {
-            SVG_ATTR_COLOR: color,
-            SVG_ATTR_FILL: "black",
-            SVG_ATTR_STROKE: "none",
-        }
+        ancestors = []  # (tag, attributes) of the open elements.
+
+        values = Values(
+            {
+                SVG_ATTR_COLOR: color,
+                SVG_ATTR_FILL: "black",
+                SVG_ATTR_STROKE: "none",
+            }
+        )
+        inherited = None  # Values the children of the current element inherit, flattened when first needed.
 
         if transform is not None:
             values[SVG_ATTR_TRANSFORM] = transform
+            values[SVG_STRUCT_MATRIX] = Matrix(transform)
 
-        for tag, event, elem in SVG._use_structure_parse(source):
+        for tag, event, elem in SVG._use_structure_parse(
+            source, streaming, referenced
+        ):
             """
             SVG element parsing parses the job compiling any parsed elements into their compiled object forms.
             """
             if event == "start":
-                stack.append((context, values))
+                stack.append((context, values, inherited))
+                ancestors.append((tag, elem.attrib))
                 if (
                     SVG_ATTR_DISPLAY in values
                     and values[SVG_ATTR_DISPLAY].lower() == SVG_VALUE_NONE
                 ):
                     continue  # Values has a display=none. Do not render anything. No Shadow Dom.
                 current_values = values
-                values = {}
-                values.update(current_values)  # copy of dictionary
-
-                # Non-propagating values.
-                if SVG_ATTR_PRESERVEASPECTRATIO in values:
-                    del values[SVG_ATTR_PRESERVEASPECTRATIO]
-                if SVG_ATTR_VIEWBOX in values:
-                    del values[SVG_ATTR_VIEWBOX]
-                if SVG_ATTR_ID in values:
-                    del values[SVG_ATTR_ID]
-                if SVG_ATTR_CLIP_PATH in values:
-                    del values[SVG_ATTR_CLIP_PATH]
+                if inherited is None:
+                    # Non-propagating values are dropped, siblings share the result.
+                    inherited = SVG._inherited_values(current_values)
+                    stack[-1] = (context, current_values, inherited)
 
                 attributes = elem.attrib  # priority; lowest
                 attributes[SVG_ATTR_TAG] = tag
 
-                # Split any Style block elements into parts; priority medium
-                style = ""
-                if "*" in styles:  # Select all.
-                    style += styles["*"]
-                if tag in styles:  # selector type
-                    style += styles[tag]
-                if SVG_ATTR_ID in attributes:  # Selector id #id
-                    svg_id = attributes[SVG_ATTR_ID]
-                    css_tag = "#%s" % svg_id
-                    if css_tag in styles:
-                        if len(style) != 0:
-                            style += ";"
-                        style += styles[css_tag]
-                if SVG_ATTR_CLASS in attributes:  # Selector class .class
-                    for svg_class in attributes[SVG_ATTR_CLASS].split(" "):
-                        css_tag = ".%s" % svg_class
-                        if css_tag in styles:
-                            if len(style) != 0:
-                                style += ";"
-                            style += styles[css_tag]
-                        css_tag = "%s.%s" % (
-                            tag,
-                            svg_class,
-                        )  # Selector type/class type.class
-                        if css_tag in styles:
-                            if len(style) != 0:
-                                style += ";"
-                            style += styles[css_tag]
-                # Split style element into parts; priority highest
+                # Style block rules matching the element; priority medium
+                attributes.update(styles.match(tag, attributes, ancestors[:-1]))
+                # Style attribute; priority highest
                 if SVG_ATTR_STYLE in attributes:
-                    style += attributes[SVG_ATTR_STYLE]
-
-                # Process style tag left to right.
-                for equate in style.split(";"):
-                    equal_item = equate.split(":")
-                    if len(equal_item) == 2:
-                        key = str(equal_item[0]).strip()
-                        value = str(equal_item[1]).strip()
-                        attributes[key] = value
+                    attributes.update(
+                        StyleSheet.parse_declarations(attributes[SVG_ATTR_STYLE])
+                    )
                 if (
                     SVG_ATTR_FILL in attributes
                     and attributes[SVG_ATTR_FILL] == SVG_VALUE_CURRENT_COLOR
@@ -8629,7 +11504,7 @@ class SVG(Group):
                     if SVG_ATTR_COLOR in attributes:
                         attributes[SVG_ATTR_FILL] = attributes[SVG_ATTR_COLOR]
                     else:
-                        attributes[SVG_ATTR_FILL] = values[SVG_ATTR_COLOR]
+                        attributes[SVG_ATTR_FILL] = inherited[SVG_ATTR_COLOR]
 
                 if (
                     SVG_ATTR_STROKE in attributes
@@ -8638,23 +11513,19 @@ class SVG(Group):
                     if SVG_ATTR_COLOR in attributes:
                         attributes[SVG_ATTR_STROKE] = attributes[SVG_ATTR_COLOR]
                     else:
-                        attributes[SVG_ATTR_STROKE] = values[SVG_ATTR_COLOR]
-
-                if SVG_ATTR_TRANSFORM in attributes:
-                    # If transform is already in values, append the new value.
-                    if SVG_ATTR_TRANSFORM in values:
-                        attributes[SVG_ATTR_TRANSFORM] = (
-                            values[SVG_ATTR_TRANSFORM]
-                            + " "
-                            + attributes[SVG_ATTR_TRANSFORM]
-                        )
-                    else:
-                        attributes[SVG_ATTR_TRANSFORM] = attributes[SVG_ATTR_TRANSFORM]
+                        attributes[SVG_ATTR_STROKE] = inherited[SVG_ATTR_COLOR]
 
                 # All class and attribute properties are compiled.
 
-                values.update(attributes)
-                values[SVG_STRUCT_ATTRIB] = attributes
+                # The element only stores its own values, lookups fall back to the inherited values.
+                own = dict(attributes)
+                own[SVG_STRUCT_ATTRIB] = attributes
+                if SVG_ATTR_TRANSFORM in attributes:
+                    # The inherited matrix is composed with this transform, the attribute keeps its own string.
+                    SVG._compose_transform(own, inherited, attributes[SVG_ATTR_TRANSFORM])
+                values = Values(own, inherited)
+                inherited = None
+                emit = False
                 if (
                     SVG_ATTR_DISPLAY in values
                     and values[SVG_ATTR_DISPLAY].lower() == SVG_VALUE_NONE
@@ -8678,45 +11549,56 @@ class SVG(Group):
                     if s.viewbox is not None:
                         try:
                             if s.height == 0 or s.width == 0:
-                                return s
+                                if not streaming:
+                                    yield s
+                                return
                             viewport_transform = s.viewbox_transform
                         except ZeroDivisionError:
                             # The width or height was zero.
                             # https://www.w3.org/TR/SVG11/struct.html#SVGElementWidthAttribute
                             # "A value of zero disables rendering of the element."
-                            return s  # No more parsing will be done.
-
-                        if SVG_ATTR_TRANSFORM in values:
-                            # transform on SVG element applied as if svg had parent with transform.
-                            values[SVG_ATTR_TRANSFORM] += " " + viewport_transform
-                        else:
-                            values[SVG_ATTR_TRANSFORM] = viewport_transform
+                            if not streaming:
+                                yield s
+                            return  # No more parsing will be done.
+
+                        # transform on SVG element applied as if svg had parent with transform.
+                        own = {}
+                        SVG._compose_transform(own, values, viewport_transform)
+                        values = values.new_child(own)
                         width, height = s.viewbox.width, s.viewbox.height
                     if context is None:
-                        stack[-1] = (context, values)
-                    if context is not None:
+                        stack[-1] = (context, values, None)
+                    if streaming and not hidden:
+                        emit = True
+                    elif context is not None:
                         context.append(s)
                     context = s
                     if root is None:
                         root = s
                 elif SVG_TAG_GROUP == tag:
                     s = Group(values)
-                    context.append(s)
+                    if streaming and not hidden:
+                        emit = True
+                    else:
+                        context.append(s)
                     context = s
                     s.render(ppi=ppi, width=width, height=height)
                 elif SVG_TAG_DEFS == tag:
                     s = Group(values)
                     context = s  # Non-Rendered
                     s.render(ppi=ppi, width=width, height=height)
+                    hidden += 1
                 elif SVG_TAG_CLIPPATH == tag:
                     s = ClipPath(values)
                     context = s  # Non-Rendered
                     s.render(ppi=ppi, width=width, height=height)
                     clip += 1
+                    hidden += 1
                 elif SVG_TAG_PATTERN == tag:
                     s = Pattern(values)
                     context = s  # Non-rendered
                     s.render(ppi=ppi, width=width, height=height)
+                    hidden += 1
                 elif tag in (
                     SVG_TAG_PATH,
                     SVG_TAG_CIRCLE,
@@ -8727,9 +11609,13 @@ class SVG(Group):
                     SVG_TAG_RECT,
                     SVG_TAG_IMAGE,
                 ):
+                    if not hidden and not SVG._selected(
+                        select, tag, attributes, ancestors[:-1]
+                    ):
+                        continue  # Not selected, the element is not built.
                     try:
                         if SVG_TAG_PATH == tag:
-                            s = Path(values)
+                            s = Path(values, lazy=lazy)
                         elif SVG_TAG_CIRCLE == tag:
                             s = Circle(values)
                         elif SVG_TAG_ELLIPSE == tag:
@@ -8751,7 +11637,10 @@ class SVG(Group):
                         s.reify()
                     if s.is_degenerate():
                         continue
-                    context.append(s)
+                    if streaming and not hidden:
+                        emit = True
+                    else:
+                        context.append(s)
                 elif tag in (
                     SVG_TAG_STYLE,
                     SVG_TAG_TEXT,
@@ -8763,7 +11652,10 @@ class SVG(Group):
                     continue
                 else:
                     s = SVGElement(values)  # SVG Unknown object return as element.
-                    context.append(s)
+                    if streaming and not hidden:
+                        emit = True
+                    else:
+                        context.append(s)
 
                 # Assign optional linked properties.
                 try:
@@ -8781,7 +11673,15 @@ class SVG(Group):
                     except AttributeError:
                         pass
                 if SVG_ATTR_ID in attributes and root is not None:
-                    root.objects[attributes[SVG_ATTR_ID]] = s
+                    if (
+                        not streaming
+                        or referenced is None
+                        or attributes[SVG_ATTR_ID] in referenced
+                    ):
+                        root.objects[attributes[SVG_ATTR_ID]] = s
+                if emit:
+                    # Streamed elements are yielded only once they are rendered and linked.
+                    yield s
             elif event == "end":  # End event.
                 # The iterparse spec makes it clear that internal text data is undefined except at the end.
                 if (
@@ -8789,7 +11689,8 @@ class SVG(Group):
                     and values[SVG_ATTR_DISPLAY].lower() == SVG_VALUE_NONE
                 ):
                     # We are in a display=none, do not render this. Pop values and continue.
-                    context, values = stack.pop()
+                    context, values, inherited = stack.pop()
+                    ancestors.pop()
                     continue
                 s = None
                 if tag in (
@@ -8802,33 +11703,25 @@ class SVG(Group):
                     attributes = elem.attrib
                     if SVG_ATTR_ID in attributes and root is not None:
                         root.objects[attributes[SVG_ATTR_ID]] = s
-                if tag in (SVG_TAG_TEXT, SVG_TAG_TSPAN):
+                if tag in (SVG_TAG_TEXT, SVG_TAG_TSPAN) and (
+                    hidden
+                    or SVG._selected(select, tag, elem.attrib, ancestors[:-1])
+                ):
                     s = Text(values, text=elem.text)
                     s.render(ppi=ppi, width=width, height=height)
                     if reify:
                         s.reify()
-                    context.append(s)
                 elif SVG_TAG_DESC == tag:
                     s = Desc(values, desc=elem.text)
-                    context.append(s)
                 elif SVG_TAG_TITLE == tag:
                     s = Title(values, title=elem.text)
-                    context.append(s)
                 elif SVG_TAG_STYLE == tag:
-                    assignments = list(re.findall(REGEX_CSS_STYLE, elem.text))
-                    for key, value in assignments:
-                        key = key.strip()
-                        value = value.strip()
-                        for selector in key.split(","):  # Can comma select subitems.
-                            sel = selector.strip()
-                            if sel not in styles:
-                                styles[sel] = value
-                            else:
-                                if not styles[sel].endswith(";"):
-                                    styles[sel] += ";"
-                                styles[sel] += value
+                    if elem.text is not None:
+                        styles.parse(elem.text)
                 elif SVG_TAG_CLIPPATH == tag:
                     clip -= 1
+                if tag in (SVG_TAG_DEFS, SVG_TAG_CLIPPATH, SVG_TAG_PATTERN):
+                    hidden -= 1
                 if s is not None:
                     # Assign optional linked properties.
                     try:
@@ -8847,10 +11740,17 @@ class SVG(Group):
                                 s.clip_rule = clip_rule
                         except AttributeError:
                             pass
+                    if streaming and not hidden:
+                        yield s
+                    else:
+                        context.append(s)
 
-                context, values = stack.pop()
+                context, values, inherited = stack.pop()
+                ancestors.pop()
             elif event == "start-ns":
                 if elem[0] != SVG_ATTR_DATA:
                     # Rare wc3 test uses a 'd' namespace.
-                    values[elem[0]] = elem[1]
-        return root
+                    values = values.new_child({elem[0]: elem[1]})
+                    inherited = None
+        if not streaming:
+            yield root
@@ -21,6 +21,14 @@ def get_random_circle_arc():
                (random() * 50, random() * 50))
 
 
+def get_random_arc_path(n):
+    path = Path(Move((random() * 50, random() * 50)))
+    for i in range(n):
+        path.arc(random() * 48 + 2, random() * 48 + 2, int(random() * 180),
+                 int(random() * 2), int(random() * 2), (random() * 50, random() * 50))
+    return path
+
+
 class TestElementArcLength(unittest.TestCase):
 
     def test_arc_angle_point(self):
@@ -350,6 +358,27 @@ class TestElementArcLength(unittest.TestCase):
             self.assertAlmostEqual(exact, length, places=1)
         print("Average arc-integral error: %g" % (error / n))
 
+    def test_arc_len_random_int_parity(self):
+        """Test integral vs. exact to full precision"""
+        for i in range(1000):
+            arc = get_random_arc()
+            self.assertAlmostEqual(arc._exact_length(), arc._integral_length(), places=10)
+
+    def test_arc_len_random_batch(self):
+        """Test batched lengths vs. exact"""
+        arcs = [get_random_arc() for i in range(1000)]
+        arcs.append(Arc(0, 1, 1e-10, 0, 1, 0, (0, 2e-10)))
+        lengths = elliptic_arc_lengths(arcs)
+        for arc, length in zip(arcs, lengths):
+            self.assertAlmostEqual(arc._exact_length(), length, places=10)
+
+    def test_elliptic_e(self):
+        from scipy.special import ellipeinc
+        for i in range(1000):
+            phi = random() * 40 - 20
+            m = choice([1 - random() * 50, random(), 0.0, 1.0, 1 - 1e-12])
+            self.assertAlmostEqual(ellipeinc(phi, m), elliptic_e(phi, m), places=10)
+
     def test_arc_len_random_lines(self):
         """Test error vs. random arc"""
         n = 2
@@ -403,6 +432,55 @@ class TestElementArcPoint(unittest.TestCase):
                 self.assertEqual(Point(p1), Point(p2))
 
 
+class TestElementArcCache(unittest.TestCase):
+
+    def assertParametersFresh(self, arc):
+        fresh = Arc(arc.start, arc.end, arc.center, arc.prx, arc.pry, arc.sweep)
+        self.assertEqual(arc.rx, fresh.rx)
+        self.assertEqual(arc.ry, fresh.ry)
+        self.assertEqual(arc.get_rotation(), fresh.get_rotation())
+        self.assertEqual(arc.get_start_t(), fresh.get_start_t())
+        self.assertEqual(arc.get_end_t(), fresh.get_end_t())
+        self.assertEqual(arc.point(0.25), fresh.point(0.25))
+
+    def test_arc_cache_matrix(self):
+        for _ in range(100):
+            arc = get_random_arc()
+            self.assertParametersFresh(arc)
+            arc *= "rotate(30) scale(2, 0.5) translate(20, 5)"
+            self.assertParametersFresh(arc)
+            arc *= "scale(-1, 1)"
+            self.assertParametersFresh(arc)
+
+    def test_arc_cache_assignment(self):
+        arc = Arc(start=(10, 0), end=(0, 10), center=(0, 0), prx=(10, 0), pry=(0, 10), sweep=tau / 4)
+        self.assertAlmostEqual(arc.rx, 10)
+        self.assertEqual(arc.point(0.5), Point(10 * sqrt(0.5), 10 * sqrt(0.5)))
+        arc.prx = Point(20, 0)
+        arc.start = Point(20, 0)
+        self.assertAlmostEqual(arc.rx, 20)
+        self.assertParametersFresh(arc)
+        arc.reverse()
+        self.assertEqual(arc.point(0), Point(0, 10))
+        self.assertParametersFresh(arc)
+
+    def test_arc_cache_in_place(self):
+        arc = Arc(start=(10, 0), end=(0, 10), center=(0, 0), prx=(10, 0), pry=(0, 10), sweep=tau / 4)
+        self.assertAlmostEqual(arc.ry, 10)
+        arc.pry.y = 5
+        arc.end.y = 5
+        arc.invalidate()
+        self.assertAlmostEqual(arc.ry, 5)
+        self.assertParametersFresh(arc)
+
+    def test_arc_cache_path_transform(self):
+        path = Path(Move((0, 0)), get_random_arc(), transform="rotate(45) scale(3, 1)")
+        arc = path[1]
+        arc.bbox()
+        path.reify()
+        self.assertParametersFresh(path[1])
+
+
 class TestElementArcApproximation(unittest.TestCase):
 
     def test_approx_quad(self):
@@ -451,4 +529,88 @@ class TestElementArcApproximation(unittest.TestCase):
         # Error less than 0.1% typically less than 0.001%
         if d > 1:
             print(arc)
-        self.assertAlmostEqual(d, 0.0, delta=2)
\ No newline at end of file
+        self.assertAlmostEqual(d, 0.0, delta=2)
+
+    def test_approx_cubic_many_arcs(self):
+        path1 = get_random_arc_path(50)
+        path2 = Path(path1)
+        path2.approximate_arcs_with_cubics(error=0.1)
+        self.assertFalse(any(isinstance(segment, Arc) for segment in path2))
+        self.assertTrue(path2._is_valid())
+        self.assertAlmostEqual(path1.length(), path2.length(), delta=2)
+        self.assertEqual(path1.current_point, path2.current_point)
+
+    def test_approx_tolerance(self):
+        for tolerance in (1e-1, 1e-3, 1e-6):
+            path1 = get_random_arc_path(20)
+            path2 = Path(path1)
+            deviation = path2.approximate_arcs_with_cubics(tolerance=tolerance)
+            self.assertLessEqual(deviation, tolerance)
+            self.assertGreater(deviation, 0)
+            path3 = Path(path1)
+            self.assertLessEqual(path3.approximate_arcs_with_quads(tolerance=tolerance * 100), tolerance * 100)
+            self.assertAlmostEqual(path1.length(), path2.length(), delta=tolerance * 100)
+
+    def test_approx_without_numpy(self):
+        path1 = get_random_arc_path(20)
+        for method in ("approximate_arcs_with_cubics", "approximate_arcs_with_quads"):
+            path2 = Path(path1)
+            path3 = Path(path1)
+            deviation2 = getattr(path2, method)(tolerance=0.01)
+            set_numeric_backend("numpy", None)
+            try:
+                deviation3 = getattr(path3, method)(tolerance=0.01)
+            finally:
+                reset_numeric_backends()
+            self.assertAlmostEqual(deviation2, deviation3)
+            self.assertEqual(len(path2), len(path3))
+            for s2, s3 in zip(path2, path3):
+                self.assertEqual(type(s2), type(s3))
+                for p2, p3 in zip(s2, s3):
+                    if p2 is not None:
+                        self.assertAlmostEqual(Point.distance(p2, p3), 0.0, delta=1e-9)
+
+
+class TestElementArcParameterize(unittest.TestCase):
+
+    def get_random_rows(self, n):
+        return [(random() * 50, random() * 50, random() * 48 + 2, random() * 48 + 2, random() * 360,
+                 int(random() * 2), int(random() * 2), random() * 50, random() * 50) for _ in range(n)]
+
+    def test_svg_parameterize_endpoints(self):
+        for sx, sy, rx, ry, rotation, large_arc, sweep, ex, ey in self.get_random_rows(500):
+            arc = Arc((sx, sy), rx, ry, rotation, large_arc, sweep, (ex, ey))
+            self.assertEqual(arc.point_at_t(arc.get_start_t()), Point(sx, sy))
+            self.assertEqual(arc.point_at_t(arc.get_end_t()), Point(ex, ey))
+            self.assertEqual(arc.sweep > 0, bool(sweep))
+            if large_arc:
+                self.assertGreaterEqual(abs(arc.sweep), tau / 2 - 1e-9)
+            else:
+                self.assertLessEqual(abs(arc.sweep), tau / 2 + 1e-9)
+
+    def test_svg_parameterize_degenerate(self):
+        arc = Arc((10, 10), 5, 5, 0, 0, 1, (10, 10))
+        self.assertEqual(arc.sweep, 0)
+        self.assertEqual(arc.center, Point(10, 10))
+        arc = Arc((10, 10), 0, 5, 0, 0, 1, (20, 10))
+        self.assertEqual(arc.sweep, 0)
+        self.assertEqual(arc.prx, Point(10, 10))
+
+    def test_svg_parameters_batch(self):
+        rows = self.get_random_rows(500)
+        rows.append((10, 10, 5, 5, 0, 0, 1, 10, 10))
+        rows.append((10, 10, 0, 5, 0, 0, 1, 20, 10))
+        batch = svg_arc_parameters_batch(rows)
+        self.assertEqual(batch.shape, (len(rows), 7))
+        for row, parameters in zip(rows, batch):
+            for a, b in zip(svg_arc_parameters(*row), parameters):
+                self.assertAlmostEqual(a, b, delta=1e-9)
+
+    def test_svg_parameters_batch_without_numpy(self):
+        rows = self.get_random_rows(20)
+        try:
+            set_numeric_backend("numpy", None)
+            batch = svg_arc_parameters_batch(rows)
+        finally:
+            reset_numeric_backends()
+        self.assertEqual(batch, [svg_arc_parameters(*row) for row in rows])
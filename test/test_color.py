@@ -272,3 +272,24 @@ class TestElementColor(unittest.TestCase):
         self.assertEqual(c7, "magenta")
         c8 = Color.distinct(6767890)
         self.assertEqual(c8, "#d85c3d")
+
+    def test_color_keywords(self):
+        self.assertEqual(Color("aliceblue"), Color(240, 248, 255))
+        self.assertEqual(Color("SteelBlue"), Color("#4682b4"))
+        self.assertEqual(Color(" steel blue "), Color("#4682b4"))
+        self.assertEqual(Color("transparent").opacity, 0)
+        self.assertEqual(len(COLOR_KEYWORDS), 148)
+        for name, value in COLOR_KEYWORDS.items():
+            self.assertEqual(Color(name).value, value)
+
+    def test_color_parse_cache(self):
+        Color.parse.cache_clear()
+        for i in range(10):
+            self.assertEqual(Color("steelblue"), Color("#4682b4"))
+        info = Color.parse.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 18)
+        for i in range(2 * info.maxsize):
+            self.assertEqual(Color("#%06x" % i), Color.parse_color_hex("#%06x" % i))
+        self.assertEqual(Color.parse.cache_info().currsize, info.maxsize)
+        self.assertRaises(TypeError, lambda: Color([255, 0, 0]))
@@ -36,3 +36,59 @@ class TestSVGCSS(unittest.TestCase):
 
         self.assertEqual(circ2.fill, "none")
         self.assertEqual(circ2.stroke, "red")
+
+    def test_css_selector_kinds(self):
+        q = io.StringIO(u'''<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+        <style>
+        * {stroke-width:2}
+        rect {fill:red}
+        .a {fill:green}
+        rect.b {fill:blue}
+        #r3 {stroke:yellow}
+        g rect {opacity:0.5}
+        #outer > rect {stroke:purple}
+        g.layer .a {stroke:orange}
+        rect[data-kind="icon"] {stroke-linecap:round}
+        [data-kind^=ic][id$="4"] {stroke-linejoin:bevel}
+        a:hover {fill:black}
+        </style>
+        <rect id="r1" width="1" height="1"/>
+        <g id="outer" class="layer">
+            <rect id="r2" class="a" width="1" height="1"/>
+            <g>
+                <rect id="r3" class="a b" width="1" height="1" style="stroke-width:5"/>
+                <rect id="r4" data-kind="icon" width="1" height="1"/>
+            </g>
+        </g>
+        </svg>''')
+        m = SVG.parse(q)
+        r1 = m.get_element_by_id("r1")
+        r2 = m.get_element_by_id("r2")
+        r3 = m.get_element_by_id("r3")
+        r4 = m.get_element_by_id("r4")
+        self.assertEqual(r1.values["fill"], "red")
+        self.assertEqual(r1.values["stroke-width"], "2")
+        self.assertNotIn("opacity", r1.values)
+        self.assertEqual(r2.values["fill"], "green")
+        self.assertEqual(r2.values["opacity"], "0.5")
+        # The id in the child selector outweighs the classes of the descendant selector.
+        self.assertEqual(r2.values["stroke"], "purple")
+        self.assertEqual(r3.values["fill"], "blue")
+        self.assertEqual(r3.values["stroke"], "orange")
+        self.assertEqual(r3.values["stroke-width"], "5")
+        self.assertEqual(r4.values["stroke"], "none")
+        self.assertEqual(r4.values["stroke-linecap"], "round")
+        self.assertEqual(r4.values["stroke-linejoin"], "bevel")
+
+    def test_css_stylesheet_index(self):
+        sheet = StyleSheet(".a{fill:red;stroke:blue}.a{fill:green}g > .a{opacity:0.5}")
+        self.assertEqual(sheet.classes["a"], {"fill": "green", "stroke": "blue"})
+        self.assertEqual(list(sheet.rules), [".a"])
+        self.assertEqual(sheet.match("rect", {"class": "a"}), {"fill": "green", "stroke": "blue"})
+        self.assertIs(sheet.match("rect", {"class": "a"}), sheet.match("rect", {"class": "a"}))
+        self.assertEqual(
+            sheet.match("rect", {"class": "a"}, [("svg", {}), ("g", {})]),
+            {"fill": "green", "stroke": "blue", "opacity": "0.5"},
+        )
+        self.assertEqual(StyleSheet.parse_declarations(" fill : red ;stroke:blue;junk"), (("fill", "red"), ("stroke", "blue")))
+        self.assertIsNone(StyleSheet.compile_selector("a + b"))
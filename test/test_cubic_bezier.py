@@ -23,6 +23,48 @@ class TestElementCubicBezierLength(unittest.TestCase):
             self.assertAlmostEqual(l1, l2, places=1)
         print("Average cubic-line error: %g" % (error / n))
 
+    def test_cubic_bezier_length_gauss_legendre(self):
+        for _ in range(100):
+            b = get_random_cubic_bezier()
+            length, bound = bezier_length(b)
+            self.assertAlmostEqual(b._length_scipy(), length, places=5)
+            self.assertLessEqual(bound, 1e-10)
+        # Cusps and degenerate curves.
+        length, bound = bezier_length(CubicBezier((0, 0), (100, 100), (0, 100), (100, 0)))
+        self.assertAlmostEqual(length, 100 * (2 * 2 ** 0.5 - 1), places=10)
+        self.assertAlmostEqual(bezier_length(CubicBezier((0, 0), (0, 0), (0, 0), (10, 0)))[0], 10)
+        t = (5 - 5 ** 0.5) / 6  # Turning point of the collinear curve.
+        turn = 30 * t - 45 * t * t + 18 * t * t * t
+        self.assertAlmostEqual(bezier_length(CubicBezier((0, 0), (10, 0), (5, 0), (3, 0)))[0], 2 * turn - 3, places=10)
+        self.assertEqual(bezier_length(CubicBezier((3, 3), (3, 3), (3, 3), (3, 3)))[0], 0)
+
+    def test_cubic_bezier_length_batched(self):
+        curves = [get_random_cubic_bezier() for _ in range(100)]
+        curves.append(CubicBezier((0, 0), (100, 100), (0, 100), (100, 0)))
+        curves.append(QuadraticBezier((0, 0), (50, 100), (100, 0)))
+        lengths, bounds = bezier_lengths(curves)
+        for curve, length in zip(curves, lengths):
+            self.assertAlmostEqual(bezier_length(curve)[0], length, places=9)
+        self.assertAlmostEqual(curves[-1].length(), lengths[-1], places=9)
+        control = [[(p.x, p.y) for p in curve] for curve in curves[:-1]]
+        for a, b in zip(bezier_lengths(control)[0], lengths):
+            self.assertAlmostEqual(a, b, places=9)
+
+    def test_cubic_bezier_length_batched_without_numpy(self):
+        curves = [get_random_cubic_bezier() for _ in range(10)]
+        expected = bezier_lengths(curves)[0]
+        self.assertEqual(len(bezier_lengths([])[0]), 0)
+        path = PathArray(Path(*curves))
+        set_numeric_backend("numpy", None)
+        try:
+            lengths, bounds = bezier_lengths(curves)
+            self.assertEqual(bezier_lengths([]), ([], []))
+            self.assertRaises(ImportError, lambda: PathArray(path).length())
+        finally:
+            reset_numeric_backends()
+        for a, b in zip(lengths, expected):
+            self.assertAlmostEqual(a, b, places=9)
+
 
 class TestElementCubicBezierPoint(unittest.TestCase):
 
@@ -84,3 +84,223 @@ class TestElementGroup(unittest.TestCase):
         </svg>''')
         elements = list(SVG.parse(q).elements())
         self.assertEqual(len(elements), 1)
+
+    def test_group_union_bbox_batch(self):
+        elements = [
+            Rect(0, 0, 10, 20, transform="rotate(30)"),
+            Circle(50, 50, 5, transform="scale(2, 3)"),
+            Path("M0,0 Q10,30 20,0 C25,-10 30,10 40,0", transform="skewX(20) translate(5, 5)"),
+            Path(),
+            Desc("no bounds"),
+        ]
+        expected_points = []
+        for e in elements[:3]:
+            x0, y0, x1, y1 = e.bbox(transformed=False)
+            for corner in ((x0, y0), (x1, y0), (x0, y1), (x1, y1)):
+                expected_points.append(e.transform.point_in_matrix_space(corner))
+        expected = (
+            min(p[0] for p in expected_points),
+            min(p[1] for p in expected_points),
+            max(p[0] for p in expected_points),
+            max(p[1] for p in expected_points),
+        )
+        boxes = [e.bbox(transformed=False) for e in elements[:3]]
+        untransformed = (
+            min(b[0] for b in boxes),
+            min(b[1] for b in boxes),
+            max(b[2] for b in boxes),
+            max(b[3] for b in boxes),
+        )
+        self.assertEqual(Group.union_bbox(elements), expected)
+        self.assertEqual(Group.union_bbox(elements, transformed=False), untransformed)
+        self.assertIsNone(Group.union_bbox(elements[3:]))
+        set_numeric_backend("numpy", None)
+        try:
+            self.assertEqual(Group.union_bbox(elements), expected)
+            self.assertEqual(Group.union_bbox(elements, transformed=False), untransformed)
+        finally:
+            reset_numeric_backends()
+
+    def test_group_bbox_cache(self):
+        group = Group()
+        self.assertIsNone(group.bbox())
+        rect = Rect(0, 0, 10, 10)
+        group.append(rect)
+        bbox = group.bbox()
+        self.assertEqual(bbox, (0, 0, 10, 10))
+        self.assertIs(group.bbox(), bbox)
+        group.append(Rect(20, 20, 10, 10))
+        self.assertEqual(group.bbox(), (0, 0, 30, 30))
+        del group[1]
+        self.assertEqual(group.bbox(), (0, 0, 10, 10))
+        group.extend([Circle(100, 100, 10)])
+        self.assertEqual(group.bbox(), (0, 0, 110, 110))
+        group.pop()
+        self.assertEqual(group.bbox(), (0, 0, 10, 10))
+        group *= "scale(2)"
+        self.assertEqual(group.bbox(), (0, 0, 20, 20))
+        rect.x = 10
+        self.assertEqual(group.bbox(), (20, 0, 40, 20))
+        rect.transform.post_translate(0, 100)  # Changed in place after the group was bounded.
+        self.assertEqual(group.bbox(), (20, 100, 40, 120))
+        rect.transform.reset()
+        self.assertEqual(group.bbox(), (10, 0, 20, 10))
+        group.invalidate()
+        self.assertEqual(group.bbox(), (10, 0, 20, 10))
+
+    def test_group_bbox_hierarchy(self):
+        q = io.StringIO(u'''<?xml version="1.0" encoding="utf-8" ?>
+                        <svg>
+                        <g id="outer" transform="translate(100, 0)">
+                        <rect x="0" y="0" width="10" height="10"/>
+                        <g id="inner" transform="rotate(45)">
+                        <circle id="c" cx="0" cy="0" r="5"/>
+                        <path id="p" d="M0,0 L10,0"/>
+                        </g>
+                        </g>
+                        </svg>''')
+        m = SVG.parse(q, reify=False)
+        outer = m.get_element_by_id("outer")
+        inner = m.get_element_by_id("inner")
+        circle = m.get_element_by_id("c")
+        path = m.get_element_by_id("p")
+        expected = Group.union_bbox(m.select())
+        self.assertEqual(m.bbox(), expected)
+        # The whole tree was bounded in the same pass.
+        self.assertIsNotNone(outer._bbox_cache)
+        self.assertIsNotNone(inner._bbox_cache)
+        self.assertEqual(inner.bbox(), Group.union_bbox(inner.select()))
+        self.assertEqual(outer.bbox(transformed=False), Group.union_bbox(outer.select(), transformed=False))
+
+        circle.rx = 50  # Geometry setters reach every group above.
+        circle.ry = 50
+        self.assertIsNone(m._bbox_cache)
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+        path *= "translate(1000, 0)"
+        self.assertEqual(inner.bbox(), Group.union_bbox(inner.select()))
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+        path.line((1000, 1000))
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+        path.transform.post_scale(2)  # Changed in place.
+        path.invalidate()
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+
+        inner.remove(path)
+        self.assertIsNone(path._parent)
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+        path.line((5000, 5000))
+        self.assertIsNotNone(m._bbox_cache)
+        outer[0] = path
+        self.assertIs(path._parent, outer)
+        self.assertEqual(m.bbox(), Group.union_bbox(m.select()))
+        outer.clear()
+        self.assertIsNone(m.bbox())
+
+    def test_group_bbox_in_place_edits(self):
+        rect = Rect(0, 0, 10, 10)
+        path = Path("M0,0 L10,0 L10,10")
+        inner = Group()
+        inner.append(path)
+        group = Group()
+        group.append(rect)
+        group.append(inner)
+        self.assertEqual(group.bbox(), (0, 0, 10, 10))
+        rect.transform.post_translate(100, 0)  # Matrix changed in place.
+        self.assertEqual(rect.bbox(), (100, 0, 110, 10))
+        self.assertEqual(group.bbox(), (0, 0, 110, 10))
+        path[1].end = Point(10, 50)  # Segment changed in place.
+        path[2].start = Point(10, 50)
+        self.assertEqual(inner.bbox(), (0, 0, 10, 50))
+        self.assertEqual(group.bbox(), (0, 0, 110, 50))
+        path.transform.post_scale(2)
+        self.assertEqual(group.bbox(), (0, 0, 110, 100))
+        path.stroke = Color("black")
+        path.stroke_width = 4
+        self.assertEqual(group.bbox(with_stroke=True), (-4, -4, 110, 104))
+        path.stroke_width = 8
+        self.assertEqual(group.bbox(with_stroke=True), (-8, -8, 110, 108))
+        self.assertEqual(group.bbox(), Group.union_bbox(group.select()))
+
+    def test_group_bbox_shared_element(self):
+        rect = Rect(0, 0, 10, 10)
+        first = Group()
+        second = Group()
+        first.append(rect)
+        second.append(rect)
+        self.assertIs(rect._parent, second)
+        self.assertEqual(first.bbox(), (0, 0, 10, 10))
+        self.assertEqual(second.bbox(), (0, 0, 10, 10))
+        rect.width = 30
+        rect *= "translate(5, 5)"
+        self.assertEqual(first.bbox(), (5, 5, 35, 15))
+        self.assertEqual(second.bbox(), (5, 5, 35, 15))
+
+    def test_group_select_deep(self):
+        root = Group()
+        group = root
+        for i in range(3000):
+            group.append(Rect(i, 0, 1, 1))
+            inner = Group()
+            group.append(inner)
+            group = inner
+        # Deeper than the recursion limit.
+        elements = list(root.select())
+        self.assertEqual(len(elements), 6000)
+        self.assertIsInstance(elements[0], Rect)
+        self.assertIsInstance(elements[1], Group)
+        rects = list(root.select(lambda e: isinstance(e, Rect)))
+        self.assertEqual([r.x for r in rects], list(range(3000)))
+
+    def test_group_flatten(self):
+        q = io.StringIO(u'''<?xml version="1.0" encoding="utf-8" ?>
+                        <svg>
+                        <rect id="r0" x="0" y="0" width="10" height="10"/>
+                        <g id="g1">
+                        <path id="p1" d="M0,0 L10,0"/>
+                        <g id="g2">
+                        <circle id="c2" cx="0" cy="0" r="5"/>
+                        <path id="p2" d="M0,0 L5,5"/>
+                        </g>
+                        <ellipse id="e1" cx="0" cy="0" rx="5" ry="2"/>
+                        </g>
+                        <path id="p0" d="M5,5 L10,0"/>
+                        </svg>''')
+        m = SVG.parse(q, flat=True)
+        flat = m._flat
+        self.assertIs(m.flatten(), flat)
+        self.assertEqual(list(m.elements())[1:], flat.elements)
+        self.assertEqual(
+            [e.id for e in flat], ["r0", "g1", "p1", "g2", "c2", "p2", "e1", "p0"]
+        )
+        self.assertEqual(flat.depths, [0, 0, 1, 1, 2, 2, 1, 0])
+        self.assertEqual(flat.parents, [-1, -1, 1, 1, 3, 3, 1, -1])
+        self.assertEqual([e.id for e in flat.of_type(Path)], ["p1", "p2", "p0"])
+        self.assertEqual(flat.indices((Circle, Rect)), [0, 4])
+        self.assertEqual([e.id for e in flat.of_type(Shape)], ["r0", "p1", "c2", "p2", "e1", "p0"])
+        self.assertEqual(flat.of_type(Text), [])
+        self.assertEqual(flat.subtree(1), slice(2, 7))
+        self.assertEqual(flat.subtree(3), slice(4, 6))
+        self.assertEqual(flat.subtree(0), slice(1, 1))
+
+        g1 = m.get_element_by_id("g1")
+        g2 = m.get_element_by_id("g2")
+        inner = g2.flatten()
+        self.assertIs(inner.group, g2)
+        self.assertEqual([e.id for e in inner], ["c2", "p2"])
+        self.assertIs(m.flatten(), flat)
+
+        # Changing a nested group drops the arrays up to the document.
+        g2.append(Path(id="p3"))
+        self.assertIsNone(g2._flat)
+        self.assertIsNone(g1._flat)
+        self.assertIsNone(m._flat)
+        flat = m.flatten()
+        self.assertEqual([e.id for e in flat.of_type(Path)], ["p1", "p2", "p3", "p0"])
+        g1.reverse()
+        self.assertEqual([e.id for e in m.flatten().of_type(Path)], ["p2", "p3", "p1", "p0"])
+        del g1[:]
+        self.assertEqual([e.id for e in m.flatten()], ["r0", "g1", "p0"])
+        # Geometry changes keep them.
+        flat = m.flatten()
+        m[0].x = 5
+        self.assertIs(m.flatten(), flat)
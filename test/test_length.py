@@ -172,3 +172,26 @@ class TestElementLength(unittest.TestCase):
         q = list(m.elements())
         self.assertEqual(q[0].width, 750)
         self.assertEqual(q[0].height, 950)
+
+    def test_length_parse_cache(self):
+        Length.parse.cache_clear()
+        self.assertEqual(Length.parse("2px"), (2.0, "px"))
+        self.assertEqual(Length.parse(" -1.5e1mm "), (-15.0, "mm"))
+        self.assertEqual(Length.parse("none"), (0.0, ""))
+        length = Length("2px")
+        length += Length("3px")
+        self.assertEqual(Length("2px").amount, 2.0)
+        self.assertEqual(Length.parse.cache_info().hits, 2)
+
+    def test_length_parse_many(self):
+        values = ["1", "100%", "2mm", "2mm", None, 5, "1in", "2em"]
+        lengths = Length.parse_many(values, ppi=96.0, relative_length=200, font_size=12)
+        self.assertEqual(
+            lengths,
+            [Length(v).value(ppi=96.0, relative_length=200, font_size=12) for v in values]
+        )
+        self.assertEqual(lengths[:3], [1.0, 200.0, 2 * 96.0 * 0.0393701])
+        self.assertIsNone(lengths[4])
+        unsolved = Length.parse_many(["50%", "50%"])
+        self.assertIsInstance(unsolved[0], Length)
+        self.assertIsNot(unsolved[0], unsolved[1])
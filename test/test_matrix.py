@@ -310,3 +310,28 @@ class TestPathMatrix(unittest.TestCase):
         m1 = Matrix("scale(2) translate(40,40)")
         m1.inverse()
         self.assertEqual(m1, Matrix("translate(-40,-40) scale(0.5)"))
+
+    def test_matrix_parse_cache(self):
+        Matrix._parse_components.cache_clear()
+        m1 = Matrix("translate(10,20) scale(2) rotate(30)")
+        m2 = Matrix("translate(10,20) scale(2) rotate(30)")
+        self.assertEqual(Matrix._parse_components.cache_info().hits, 1)
+        self.assertIsNot(m1, m2)
+        self.assertEqual(m1, m2)
+        m1.post_scale(3)
+        self.assertEqual(m2, Matrix("translate(10,20) scale(2) rotate(30)"))
+
+    def test_matrix_parse_cache_lengths(self):
+        m1 = Matrix("translate(50%, 1in)")
+        m1.e.amount = 25
+        m2 = Matrix("translate(50%, 1in)")
+        self.assertEqual(str(m2.e), "50%")
+        m2.render(width=200, ppi=96)
+        self.assertEqual(m2.e, 100)
+        self.assertEqual(m2.f, 96)
+        self.assertEqual(str(Matrix("translate(50%, 1in)").e), "50%")
+
+    def test_matrix_parse_onto_matrix(self):
+        m = Matrix("scale(2)")
+        m.parse("translate(5, 5)")
+        self.assertEqual(m, Matrix("scale(2) translate(5, 5)"))
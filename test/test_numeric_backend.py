@@ -0,0 +1,33 @@
+import unittest
+
+from svgelements import *
+
+
+class TestNumericBackend(unittest.TestCase):
+    """Tests of the optional numeric backend registry."""
+
+    def tearDown(self):
+        reset_numeric_backends()
+
+    def test_backend_resolved_once(self):
+        np = numeric_backend("numpy")
+        self.assertIs(numeric_backend("numpy"), np)
+        self.assertIsNone(numeric_backend("svgelements_missing_module"))
+
+    def test_backend_override(self):
+        path = Path("M0,0 C10,20 30,-10 40,10 Q50,50 60,0 A20,10 30 0,1 90,10 L100,0")
+        positions = [i / 20.0 for i in range(21)]
+        expected_points = path.npoint(numeric_backend("numpy").array(positions))
+        expected_length = path.length()
+        set_numeric_backend("numpy", None)
+        set_numeric_backend("scipy.integrate", None)
+        set_numeric_backend("scipy.special", None)
+        self.assertIsNone(numeric_backend("numpy"))
+        points = Path(path).npoint(positions)
+        self.assertIsInstance(points, list)
+        for p, q in zip(points, expected_points):
+            self.assertAlmostEqual(p[0], q[0])
+            self.assertAlmostEqual(p[1], q[1])
+        self.assertAlmostEqual(Path(path).length(), expected_length, delta=1e-3)
+        reset_numeric_backends()
+        self.assertIsNotNone(numeric_backend("numpy"))
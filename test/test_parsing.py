@@ -1,5 +1,7 @@
 import io
+import json
 import unittest
+from copy import copy
 
 from svgelements import *
 
@@ -595,6 +597,126 @@ class TestParser(unittest.TestCase):
                 self.assertEqual(e, "M0,0 H10 V10 H0 z")
                 self.assertEqual(e.fill, "none" )
 
+    def test_svg_parse_nested_transforms(self):
+        s = io.StringIO(u'''<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100" viewBox="0 0 400 200">
+            <g id="a" transform="translate(10, 20) rotate(30)">
+                <g id="b">
+                    <g id="c" transform="scale(2) skewX(10)">
+                        <rect id="r" transform="translate(5, 1)" width="10" height="10"/>
+                    </g>
+                </g>
+            </g>
+        </svg>''')
+        svg = SVG.parse(s, reify=False, transform="scale(3)")
+        viewport = "scale(3) scale(0.5)"
+        self.assertEqual(svg.get_element_by_id("a").transform,
+                         Matrix(viewport + " translate(10, 20) rotate(30)"))
+        self.assertEqual(svg.get_element_by_id("b").transform, svg.get_element_by_id("a").transform)
+        self.assertEqual(svg.get_element_by_id("c").transform,
+                         Matrix(viewport + " translate(10, 20) rotate(30) scale(2) skewX(10)"))
+        rect = svg.get_element_by_id("r")
+        self.assertEqual(rect.transform,
+                         Matrix(viewport + " translate(10, 20) rotate(30) scale(2) skewX(10) translate(5, 1)"))
+        self.assertEqual(
+            rect.values["transform"],
+            "scale(3) scale(0.5, 0.5) translate(10, 20) rotate(30) scale(2) skewX(10) translate(5, 1)",
+        )
+        self.assertEqual(Matrix(rect.values["transform"]), rect.transform)
+        self.assertEqual(rect.values["attributes"]["transform"], "translate(5, 1)")
+
+    def test_svg_parse_layered_values(self):
+        s = io.StringIO(u'''<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+            <g id="g" style="stroke-width:3" stroke="blue" clip-path="url(#c)" transform="scale(2)">
+                <rect id="r1" width="10" height="10" fill="red"/>
+                <rect id="r2" width="10" height="10"/>
+            </g>
+        </svg>''')
+        svg = SVG.parse(s)
+        r1 = svg.get_element_by_id("r1")
+        r2 = svg.get_element_by_id("r2")
+        self.assertIsInstance(r1.values, Values)
+        self.assertEqual(r1.values["stroke-width"], "3")
+        self.assertEqual(r2.values.get("stroke"), "blue")
+        self.assertEqual(r1.values["fill"], "red")
+        self.assertEqual(r2.values["fill"], "black")
+        self.assertEqual(r1.values["id"], "r1")
+        self.assertNotIn("clip-path", r1.values)
+        # Siblings share the inherited values rather than each holding a copy.
+        self.assertIs(r1.values.maps[-1], r2.values.maps[-1])
+        self.assertNotIn("id", r1.values.maps[-1])
+        r1.set("stroke", "green")
+        self.assertEqual(r1.values["stroke"], "green")
+        self.assertEqual(r2.values["stroke"], "blue")
+        self.assertEqual(svg.get_element_by_id("g").values["stroke"], "blue")
+        values = copy(r1.values)
+        self.assertIs(type(values), dict)
+        self.assertEqual(values, r1.values.to_dict())
+        values = json.loads(json.dumps(values))
+        self.assertEqual(values["stroke"], "green")
+        self.assertEqual(values["transform"], "scale(2)")
+        self.assertEqual(values["attributes"]["fill"], "red")
+
+    def test_svg_parse_select(self):
+        document = u'''<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+            <defs><clipPath id="c"><rect id="cr" width="5" height="5"/></clipPath></defs>
+            <g id="layer1"><path id="a1" d="M0,0 L10,10"/><rect id="a2" class="big" width="50" height="50"/></g>
+            <g id="layer2" clip-path="url(#c)"><path id="b1" d="M0,0 L20,20"/><circle id="b2" class="big" r="5"/></g>
+            <text id="t" x="1" y="1">label</text>
+        </svg>'''
+
+        def ids(svg):
+            return [e.id for e in svg.elements() if not isinstance(e, Group)]
+
+        self.assertEqual(ids(SVG.parse(io.StringIO(document), select="#layer2 *")), ["b1", "b2"])
+        self.assertEqual(ids(SVG.parse(io.StringIO(document), select=".big, text")), ["a2", "b2", "t"])
+        self.assertEqual(
+            ids(SVG.parse(io.StringIO(document), select=lambda tag, attributes: tag == "path")), ["a1", "b1"]
+        )
+        svg = SVG.parse(io.StringIO(document), select="path")
+        # Clip paths are built even though their contents are not selected.
+        self.assertEqual(svg.get_element_by_id("layer2").clip_path[0].id, "cr")
+        self.assertIsNone(svg.get_element_by_id("a2"))
+        streamed = [e.id for e in SVG.iterparse(io.StringIO(document), select="#layer1 path")]
+        self.assertEqual(streamed, [None, "layer1", "a1", "layer2"])
+        self.assertRaises(ValueError, lambda: SVG.parse(io.StringIO(document), select="path:hover"))
+
+    def test_svg_parse_lazy(self):
+        document = u'''<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+            <g transform="rotate(30) scale(2)" stroke="red" stroke-width="2">
+                <path id="p" d="M0,0 C10,0 10,10 20,10 A5,10 15 1 0 30,30 z"/>
+            </g>
+        </svg>'''
+        for reify in (True, False):
+            eager = SVG.parse(io.StringIO(document), reify=reify).get_element_by_id("p")
+            lazy = SVG.parse(io.StringIO(document), reify=reify, lazy=True).get_element_by_id("p")
+            self.assertNotIn("_segments", lazy.__dict__)
+            self.assertEqual(lazy.transform, eager.transform)
+            self.assertEqual(lazy.stroke_width, eager.stroke_width)
+            self.assertEqual(lazy.d(), eager.d())
+            self.assertIn("_segments", lazy.__dict__)
+            self.assertEqual(lazy.bbox(), eager.bbox())
+        path = Path(d="M0,0 L10,0", lazy=True)
+        path.transform = Matrix("translate(5, 0)")
+        path.reify()
+        path.transform = Matrix("scale(2)")
+        path.reify()
+        self.assertEqual(path.d(), "M 10,0 L 30,0")
+        self.assertNotIn("lazy", path.values)
+
+    def test_svg_parse_lazy_malformed(self):
+        document = u'''<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+            <path id="good" d="M0,0 L10,10"/>
+            <path id="bad" d="M0,0 L10,10 L 5"/>
+            <path id="word" d="M0,0 X10,10"/>
+        </svg>'''
+        eager = [e.id for e in SVG.parse(io.StringIO(document)).elements()]
+        lazy = [e.id for e in SVG.parse(io.StringIO(document), lazy=True).elements()]
+        self.assertEqual(lazy, eager)
+        self.assertIn("good", lazy)
+        self.assertNotIn("bad", lazy)
+        self.assertRaises(ValueError, lambda: Path(d="M0,0 L10,10 L 5"))
+        self.assertRaises(ValueError, lambda: Path(d="M0,0 L10,10 L 5", lazy=True))
+
 
 class TestParseDisplay(unittest.TestCase):
     """
@@ -853,3 +975,161 @@ class TestParseDefUse(unittest.TestCase):
 
         for s in SVG.parse(svg_str).elements(conditional=lambda el: isinstance(el, Path)):
             self.assertEqual(type(s), Path)
+
+
+class TestPathTokenize(unittest.TestCase):
+
+    def test_tokenize_commands(self):
+        tokens = SVGLexicalParser.tokenize("M0,0 L10-5.5.5 z")
+        self.assertEqual(tokens, [("M", [0.0, 0.0]), ("L", [10.0, -5.5, 0.5]), ("z", [])])
+
+    def test_tokenize_compact_arc_flags(self):
+        tokens = SVGLexicalParser.tokenize("a25,25 0 1125,25")
+        self.assertEqual(tokens, [("a", [25.0, 25.0, 0.0, True, True, 25.0, 25.0])])
+        self.assertRaises(ValueError, SVGLexicalParser.tokenize, "a25,25 0 2 0 25,25")
+
+    def test_tokenize_stops_at_garbage(self):
+        self.assertEqual(Path("M0,0 L10,10 x L20,20"), Path("M0,0 L10,10"))
+        self.assertRaises(ValueError, Path, "M0,0 L10,x")
+
+    def test_tokenize_inline_close(self):
+        path = Path("M0,0 L10,0 L10,10 L z")
+        self.assertEqual(path[-2].end, Point(0, 0))
+        self.assertTrue(isinstance(path[-1], Close))
+
+    def test_large_path_round_trip(self):
+        d = " ".join("l%d,%d c1 2 3 4 5 6 a5 3 30 0 1 2,2" % (i % 7, -(i % 5)) for i in range(500))
+        path = Path("M0,0 " + d)
+        self.assertEqual(len(path), 1501)
+        self.assertEqual(Path(path.d()), path)
+
+    def test_from_commands(self):
+        commands = SVGLexicalParser.tokenize("M0,0 c1,1 2,2 3,3 s5,5 6,6 l1,1 2,2 V5 z")
+        path = Path.from_commands(commands, stroke="blue")
+        self.assertEqual(path, Path("M0,0 c1,1 2,2 3,3 s5,5 6,6 l1,1 2,2 V5 z"))
+        self.assertEqual(path.stroke, "blue")
+        self.assertEqual(path[2].control1, Point(4, 4))
+        self.assertTrue(path[2].smooth)
+        self.assertTrue(path[-1].relative)
+
+    def test_append_commands_continues_path(self):
+        path = Path("M0,0 q1,1 2,2")
+        path.append_commands(SVGLexicalParser.tokenize("t5,5 z"))
+        self.assertEqual(path[2].control, Point(3, 3))
+        self.assertEqual(path[-1].end, Point(0, 0))
+        self.assertEqual(path[-1].start, path[-2].end)
+
+
+class TestSVGIterparse(unittest.TestCase):
+    """Tests of the streaming SVG.iterparse"""
+
+    document = u'''<?xml version="1.0" encoding="utf-8" ?>
+        <svg width="100%" height="100%" viewBox="0 0 480 360" xmlns="http://www.w3.org/2000/svg"
+        xmlns:xlink="http://www.w3.org/1999/xlink">
+        <defs>
+            <clipPath id="clip"><rect width="5" height="5"/></clipPath>
+            <g fill="red" stroke="yellow" stroke-width="3">
+                <rect id="usedRect" width="20" height="20"/>
+                <circle id="unused" cx="10" cy="10" r="10"/>
+                <g id="usedG">
+                    <rect width="10" height="20"/>
+                    <rect x="10" width="10" height="20" fill="rgb(0,128,0)"/>
+                </g>
+                <use id="usedUse" xlink:href="#usedRect"/>
+            </g>
+        </defs>
+        <g id="group" transform="translate(150, 25)">
+            <use xlink:href="#usedRect" fill="#0F0"/>
+            <use x="180" y="0" xlink:href="#usedG" fill="#0F0"/>
+            <use x="180" y="30" xlink:href="#usedUse" fill="#0F0"/>
+            <path id="clipped" d="M0,0 L10,10" clip-path="url(#clip)"/>
+            <text>Text</text>
+        </g>
+        </svg>'''
+
+    def test_iterparse_matches_parse(self):
+        parsed = [e for e in SVG.parse(io.StringIO(self.document)).elements()]
+        streamed = list(SVG.iterparse(io.StringIO(self.document)))
+        self.assertEqual([type(e) for e in parsed], [type(e) for e in streamed])
+        for a, b in zip(parsed, streamed):
+            if isinstance(a, Shape):
+                self.assertEqual(a, b)
+        for group in streamed:
+            if isinstance(group, Group):
+                self.assertEqual(len(group), 0)
+        root = streamed[0]
+        self.assertIsInstance(root, SVG)
+        clipped = [e for e in streamed if e.id == "clipped"][0]
+        self.assertIs(clipped.clip_path, root.get_element_by_id("clip"))
+        self.assertEqual(len(clipped.clip_path), 1)
+        self.assertIsNone(root.get_element_by_id("unused"))
+        self.assertIsNone(root.get_element_by_id("group"))
+
+    def test_iterparse_complete_when_yielded(self):
+        document = u'''<svg width="100" height="100" xmlns="http://www.w3.org/2000/svg">
+            <clipPath id="c"><rect width="5" height="5"/></clipPath>
+            <g id="g" transform="translate(50%, 0)">
+                <rect id="r" width="10" height="10" clip-path="url(#c)"/>
+            </g>
+        </svg>'''
+        seen = []
+        for element in SVG.iterparse(io.StringIO(document)):
+            # Checked inside the loop, the generator is suspended at this element.
+            if element.id == "g":
+                self.assertEqual(element.transform, Matrix("translate(50, 0)"))
+            elif element.id == "r":
+                self.assertIsNotNone(element.clip_path)
+                self.assertEqual(element.clip_path.id, "c")
+            seen.append(element.id)
+        self.assertIn("g", seen)
+        self.assertIn("r", seen)
+
+    def test_iterparse_unseekable(self):
+        class Stream:
+            def __init__(self, text):
+                self.data = io.BytesIO(text.encode("utf-8"))
+
+            def read(self, size=-1):
+                return self.data.read(size)
+
+        parsed = [e for e in SVG.parse(io.StringIO(self.document)).elements()]
+        streamed = list(SVG.iterparse(Stream(self.document)))
+        self.assertEqual([type(e) for e in parsed], [type(e) for e in streamed])
+
+    def test_iterparse_memory(self):
+        import gc
+        import weakref
+
+        document = io.StringIO(
+            u'<svg xmlns="http://www.w3.org/2000/svg">%s</svg>'
+            % (u'<g><path d="M0,0 L10,10 L20,0 Z" stroke="blue"/></g>' * 100)
+        )
+        root = None
+        groups = []
+        shapes = []
+        for element in SVG.iterparse(document):
+            if root is None:
+                root = element
+            elif isinstance(element, Group):
+                groups.append(element)
+            else:
+                shapes.append(weakref.ref(element))
+        del element
+        gc.collect()
+        self.assertIsInstance(root, SVG)
+        self.assertEqual(len(root), 0)
+        self.assertEqual(len(groups), 100)
+        self.assertEqual([len(group) for group in groups], [0] * 100)
+        self.assertEqual(len(shapes), 100)
+        # Nothing held by the parser keeps the yielded elements alive.
+        self.assertEqual([ref() for ref in shapes], [None] * 100)
+
+    def test_append_commands_empty_horizontal(self):
+        path = Path("M1 1 H")
+        self.assertEqual(len(path), 2)
+        self.assertIsNone(path[-1].end.x)
+        self.assertEqual(path[-1].end.y, 1)
+        self.assertEqual(len(Path("M1 1 H V")), 2)
+        self.assertRaises(ValueError, lambda: Path("M1 1 H L2,2"))
+        self.assertRaises(ValueError, lambda: Path("M1 1 H z"))
+        self.assertRaises(ValueError, lambda: Path("M1 1 h"))
@@ -289,3 +289,118 @@ class TestPath(unittest.TestCase):
         def m_assign():
             m[-1] = 'M5,5z'
         self.assertRaises(ValueError, m_assign)
+
+    def test_path_transformed_segments(self):
+        d = "M10,10 L20,15 Q30,30 40,10 C50,0 60,20 70,10 A10,5 30 0,1 90,10 Z"
+        for transform in ("rotate(30) translate(5,7)", "scale(-2,1.5)", "matrix(1,2,-3,1,4,5)"):
+            path = Path(d, transform=transform)
+            expected = [s * path.transform for s in Path(d)]
+            self.assertEqual(path.segments(), expected)
+            self.assertIsNot(path.segments(), path.segments())
+            reified = abs(path)
+            self.assertEqual(list(reified), expected)
+            self.assertEqual(reified.d(), path.d())
+
+    def test_path_transformed_segments_cache(self):
+        path = Path("M0,0 L10,0 L10,10", transform="scale(2)")
+        self.assertEqual(path.segments()[-1].end, (20, 20))
+        path.line((20, 20))
+        self.assertEqual(path.segments()[-1].end, (40, 40))
+        path *= "translate(1,0)"
+        self.assertEqual(path.segments()[-1].end, (41, 40))
+        path[0] = Move((5, 5))
+        self.assertEqual(path.segments()[0].end, (11, 10))
+        path.reify()
+        self.assertEqual(path.segments()[0].end, (11, 10))
+
+    def test_path_transformed_segments_see_edits(self):
+        path = Path("M0,0 L10,0 L10,10 M20,20 L30,30", transform="scale(2)")
+        self.assertEqual(path.d(), "M 0,0 L 20,0 L 20,20 M 40,40 L 60,60")
+        path.segments().append(Line((60, 60), (0, 0)))
+        self.assertEqual(len(path.segments()), 5)
+        path[1].end = Point(5, 5)
+        self.assertEqual(path.segments()[1].end, (10, 10))
+        self.assertEqual(path.bbox(), abs(path).bbox())
+        path[1].end.x = 10
+        self.assertEqual(path.d(), abs(path).d())
+        subpath = list(path.as_subpaths())[1]
+        subpath *= "translate(1, 1)"
+        self.assertEqual(path.d(), abs(path).d())
+        self.assertEqual(path.segments()[-1].end, (62, 62))
+        path.segments()[-1].end.x = 0
+        self.assertEqual(path.segments()[-1].end, (62, 62))
+        path.transform.post_translate(0, 10)
+        self.assertEqual(path.segments()[-1].end, (62, 72))
+        self.assertEqual(path.d(), abs(path).d())
+
+    def test_path_point_at_length_sees_edits(self):
+        path = Path("M0,0 L30,40 L30,100")
+        self.assertEqual(path.point_at_length(50), (30, 40))
+        path[1].end = Point(60, 80)
+        path[2].start = Point(60, 80)
+        self.assertEqual(path.point_at_length(50), (30, 40))
+        self.assertEqual(path.point_at_length(100), (60, 80))
+        path[2].end.x = 60
+        path[2].end.y = 0
+        self.assertEqual(path.point_at_length(180), (60, 0))
+        list(path.as_subpaths())[0].__imul__("scale(2)")
+        self.assertEqual(path.point_at_length(200), (120, 160))
+
+    def test_path_point_at_length(self):
+        path = Path("M0,0 L30,40 M100,100 h10 v20 M0,0")
+        self.assertEqual(path.point_at_length(0), (0, 0))
+        self.assertEqual(path.point_at_length(25), (15, 20))
+        self.assertEqual(path.point_at_length(50), (30, 40))
+        self.assertEqual(path.point_at_length(55), (105, 100))
+        self.assertEqual(path.point_at_length(70), (110, 110))
+        self.assertEqual(path.point_at_length(80), (110, 120))
+        self.assertEqual(path.point_at_length(1000), (110, 120))
+        self.assertEqual(path.point_at_length(-1), (0, 0))
+        path.line((110, 130))
+        self.assertEqual(path.point_at_length(1000), (110, 130))
+        path *= "scale(2)"
+        self.assertEqual(path.point_at_length(50), (30, 40))
+        self.assertEqual(path.point_at_length(50, transformed=False), (30, 40))
+        self.assertEqual(path.point_at_length(100, transformed=True), (60, 80))
+
+    def test_path_sample_uniform(self):
+        path = Path("M0,0 A50,50 0 0,1 100,0 A50,50 0 0,1 0,0 L0,-25 Q100,-100 50,-25")
+        path *= "rotate(20) scale(2,1)"
+        points = path.sample_uniform(201)
+        self.assertEqual(len(points), 201)
+        self.assertEqual(Point(points[0]), Point(0, 0) * path.transform)
+        self.assertEqual(Point(points[-1]), Point(50, -25) * path.transform)
+        step = abs(path).length() / 200
+        for i in range(0, 201, 10):
+            expected = path.point_at_length(i * step)
+            self.assertAlmostEqual(expected.x, points[i][0])
+            self.assertAlmostEqual(expected.y, points[i][1])
+        # Consecutive points on the circle are equally spaced along it, their chords are equal.
+        circle = Path("M0,0 A50,50 0 0,1 100,0 A50,50 0 0,1 0,0")
+        points = [Point(p) for p in circle.sample_uniform(101)]
+        chords = [Point.distance(points[i], points[i + 1]) for i in range(100)]
+        for chord in chords:
+            self.assertAlmostEqual(chord, chords[0])
+
+    def test_path_sample_uniform_pure_python(self):
+        path = Path("M0,0 C10,20 30,-10 40,10 Q50,50 60,0 A20,10 30 0,1 90,10 L100,0")
+        expected = path.sample_uniform(50)
+        set_numeric_backend("numpy", None)
+        try:
+            points = Path(path).sample_uniform(50)
+        finally:
+            reset_numeric_backends()
+        self.assertIsInstance(points[0], Point)
+        for p, q in zip(points, expected):
+            self.assertAlmostEqual(p.x, q[0])
+            self.assertAlmostEqual(p.y, q[1])
+
+    def test_path_npoint_matches_point(self):
+        path = Path("M0,0 L10,0 Q20,20 30,0 M40,40 C50,60 70,20 80,40 A10,20 30 0,1 100,40 Z")
+        positions = [i / 97.0 for i in range(98)]
+        points = path.npoint(positions)
+        self.assertEqual(len(points), len(positions))
+        for position, xy in zip(positions, points):
+            p = path.point(position)
+            self.assertAlmostEqual(p.x, xy[0])
+            self.assertAlmostEqual(p.y, xy[1])
@@ -0,0 +1,58 @@
+import unittest
+
+from svgelements import *
+
+D = "M10,10 L 20,30 q 5 -20 30 0 t 10 10 C 0 0 100 100 50 20 s 10 10 20 -30 " \
+    "A 20 10 30 0 1 60 80 a 5 5 0 1 0 -10 -10 z m 5 5 h 10 v 10 Z"
+
+
+class TestPathArray(unittest.TestCase):
+
+    def test_path_array_segments(self):
+        path = Path(D)
+        path_array = PathArray(D)
+        self.assertEqual(len(path_array), len(path))
+        for s1, s2 in zip(path_array, path):
+            self.assertEqual(s1, s2)
+        self.assertEqual(path_array[-1], path[-1])
+        self.assertEqual(path_array.as_path(), path)
+        self.assertEqual(path_array.d(), path.d())
+        self.assertEqual(path_array[2:8].d(), Path(path[2:8]).d())
+
+    def test_path_array_bbox(self):
+        path = Path(D)
+        path_array = PathArray(path)
+        for v1, v2 in zip(path_array.bbox(), path.bbox()):
+            self.assertAlmostEqual(v1, v2)
+
+    def test_path_array_matrix(self):
+        matrix = Matrix("rotate(30) scale(2,-1) translate(5,5)")
+        path = abs(Path(D) * matrix)
+        path_array = PathArray(D) * matrix
+        for s1, s2 in zip(path_array, path):
+            self.assertEqual(s1, s2)
+        path_array = PathArray(D)
+        path_array *= "scale(-1,1)"
+        self.assertEqual(path_array, abs(Path(D) * "scale(-1,1)"))
+
+    def test_path_array_npoint(self):
+        import numpy as np
+
+        path = Path(D)
+        path_array = PathArray(path)
+        positions = np.linspace(0, 1, 1001)
+        xy1 = path.npoint(positions)
+        xy2 = path_array.npoint(positions)
+        self.assertLess(np.max(np.abs(xy1 - xy2)), 1e-7)
+        self.assertAlmostEqual(path_array.length(), path.length(), delta=1e-5)
+
+    def test_path_array_numeric_backend(self):
+        path_array = PathArray(D)
+        set_numeric_backend("numpy", None)
+        try:
+            self.assertRaises(ImportError, lambda: PathArray(D))
+            self.assertRaises(ImportError, lambda: path_array.bbox())
+            self.assertRaises(ImportError, lambda: path_array * "scale(2)")
+        finally:
+            reset_numeric_backends()
+        self.assertEqual(PathArray(D), path_array)
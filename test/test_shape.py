@@ -595,6 +595,58 @@ class TestElementShape(unittest.TestCase):
                 self.assertEqual(shape.point(p), Point(p1))
                 self.assertEqual(Point(p1), Point(p2))
 
+    def test_shape_geometry_cache(self):
+        rect = Rect(10, 20, 30, 40, transform="rotate(10)")
+        segments = rect._shared_segments()
+        bbox = rect.bbox()
+        self.assertIsInstance(segments, tuple)
+        self.assertIs(rect._shared_segments(), segments)
+        self.assertIs(rect.bbox(), bbox)
+        self.assertIsNot(rect._shared_segments(False), segments)
+        # The segments returned are copies, altering them leaves the shape as it was.
+        self.assertEqual(rect.segments(), list(segments))
+        rect.segments()[1].end.x = 1000
+        self.assertEqual(rect.bbox(), bbox)
+        self.assertEqual(rect.segments(), list(segments))
+        length = rect.length()
+        rect.width = 60
+        self.assertIsNot(rect._shared_segments(), segments)
+        self.assertEqual(rect.bbox(), Rect(10, 20, 60, 40, transform="rotate(10)").bbox())
+        self.assertNotEqual(rect.length(), length)
+        segments = rect._shared_segments()
+        rect.transform.post_translate(5, 0)  # Modified in place.
+        self.assertIsNot(rect._shared_segments(), segments)
+        self.assertEqual(rect.bbox(), Rect(10, 20, 60, 40, transform="translate(5, 0) rotate(10)").bbox())
+
+        circle = Circle(0, 0, 5)
+        segments = circle._shared_segments()
+        self.assertIs(circle._shared_segments(), segments)
+        circle.r = 10
+        circle.rx = 10
+        circle.ry = 10
+        self.assertEqual(circle.bbox(), (-10, -10, 10, 10))
+        self.assertEqual(circle.bbox(with_stroke=True), circle.bbox())
+        circle.stroke = Color("red")
+        circle.stroke_width = 2
+        self.assertEqual(circle.bbox(with_stroke=True), (-11, -11, 11, 11))
+
+        polygon = Polygon((0, 0), (10, 0), (10, 10))
+        segments = polygon._shared_segments()
+        self.assertIs(polygon._shared_segments(), segments)
+        polygon.points[1].x = 20
+        self.assertIs(polygon._shared_segments(), segments)
+        polygon.invalidate()
+        self.assertEqual(polygon.bbox(), (0, 0, 20, 10))
+        polygon *= "scale(2)"
+        polygon.reify()
+        self.assertEqual(polygon.bbox(transformed=False), (0, 0, 40, 20))
+
+        # A path made from a shape does not share its cached segments.
+        path = Path(rect)
+        path *= "scale(3)"
+        path.reify()
+        self.assertEqual(rect.segments(False)[1].start, (10, 20))
+
 
 def reification_checks(test, shape):
     correct_reify(test, shape * "rotate(-90) translate(20,0)")
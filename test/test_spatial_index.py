@@ -0,0 +1,113 @@
+import io
+import random
+import unittest
+
+from svgelements import *
+
+
+def brute_query(boxes, x0, y0, x1, y1):
+    return set(
+        id(e) for e, b in boxes if b[0] <= x1 and b[2] >= x0 and b[1] <= y1 and b[3] >= y0
+    )
+
+
+def box_distance(box, x, y):
+    dx = max(box[0] - x, 0, x - box[2])
+    dy = max(box[1] - y, 0, y - box[3])
+    return dx * dx + dy * dy
+
+
+class TestSpatialIndex(unittest.TestCase):
+    def random_rects(self, count):
+        random.seed(22)
+        rects = []
+        for i in range(count):
+            rects.append(
+                Rect(
+                    random.uniform(0, 1000),
+                    random.uniform(0, 1000),
+                    random.uniform(1, 40),
+                    random.uniform(1, 40),
+                    transform="rotate(%d)" % random.randint(0, 30),
+                )
+            )
+        return rects
+
+    def test_spatial_index_queries(self):
+        rects = self.random_rects(500)
+        index = SpatialIndex(rects, node_capacity=8)
+        self.assertEqual(len(index), 500)
+        self.assertIn(rects[10], index)
+        self.assertNotIn(Rect(0, 0, 1, 1), index)
+        boxes = [(e, e.bbox()) for e in rects]
+        for i in range(50):
+            x, y = random.uniform(-200, 1000), random.uniform(0, 1200)
+            # Reversed corners are accepted.
+            self.assertEqual(
+                set(map(id, index.query_rect(x + 60, y + 40, x, y))),
+                brute_query(boxes, x, y, x + 60, y + 40),
+            )
+            self.assertEqual(
+                set(map(id, index.query_point(x, y))), brute_query(boxes, x, y, x, y)
+            )
+            nearest = index.nearest(x, y, 4)
+            self.assertEqual(
+                [box_distance(e.bbox(), x, y) for e in nearest],
+                sorted(box_distance(b, x, y) for e, b in boxes)[:4],
+            )
+        self.assertEqual(index.query_rect(5000, 5000, 6000, 6000), [])
+        self.assertEqual(len(index.nearest(0, 0, 1000)), 500)
+
+    def test_spatial_index_insert_remove(self):
+        rects = self.random_rects(300)
+        index = SpatialIndex(node_capacity=4)
+        self.assertIsNone(index.bbox())
+        self.assertEqual(index.query_point(0, 0), [])
+        self.assertEqual(index.nearest(0, 0), [])
+        for e in rects:
+            self.assertTrue(index.insert(e))
+        self.assertFalse(index.insert(Path()))
+        for e in rects[::2]:
+            self.assertTrue(index.remove(e))
+        self.assertFalse(index.remove(rects[0]))
+        for e in rects[1::4]:
+            e *= "translate(500, 500)"
+            index.update(e)
+        live = rects[1::2]
+        self.assertEqual(len(index), len(live))
+        self.assertEqual(index.bbox(), Group.union_bbox(live))
+        boxes = [(e, e.bbox()) for e in live]
+        for i in range(50):
+            x, y = random.uniform(0, 1500), random.uniform(0, 1500)
+            self.assertEqual(
+                set(map(id, index.query_rect(x, y, x + 80, y + 80))),
+                brute_query(boxes, x, y, x + 80, y + 80),
+            )
+        for e in live:
+            self.assertTrue(index.remove(e))
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.bbox())
+
+    def test_svg_build_index(self):
+        q = io.StringIO(
+            u"""<?xml version="1.0" encoding="utf-8" ?>
+                <svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
+                <g transform="translate(100, 0)">
+                    <rect id="r" x="0" y="0" width="10" height="10"/>
+                    <circle id="c" cx="50" cy="50" r="5"/>
+                </g>
+                <text id="t" x="0" y="100">Hello</text>
+                <path id="p" d="M0,150 L20,170" stroke="black" stroke-width="4"/>
+                </svg>
+                """
+        )
+        svg = SVG.parse(q)
+        index = svg.build_index()
+        self.assertEqual(len(index), 4)
+        self.assertEqual([e.id for e in index.query_point(105, 5)], ["r"])
+        self.assertEqual([e.id for e in index.query_rect(140, 40, 160, 60)], ["c"])
+        self.assertEqual(index.query_point(5, 5), [])
+        self.assertEqual([e.id for e in index.nearest(10, 155)], ["p"])
+        self.assertEqual(index.query_point(21, 171), [])
+        stroked = svg.build_index(with_stroke=True)
+        self.assertEqual([e.id for e in stroked.query_point(21, 171)], ["p"])